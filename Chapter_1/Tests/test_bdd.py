@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+import itertools
+import random
+import unittest
+
+from Chapter_1 import logic_circuits as lc
+from Chapter_1 import bdd
+from Chapter_1.circuit_compiler import CompiledCircuit
+from Chapter_1.circuit_optimizer import CircuitOptimizer
+from Chapter_1.netlist import parse_netlist
+from Chapter_1.Tests.test_circuit_optimizer import random_netlist
+
+
+def ripple_adder(bits, interleaved=True):
+    """
+    Returns a netlist adding a0..a(n-1) and b0..b(n-1), with the inputs
+    listed interleaved or all a's before all b's.
+    """
+    names = ['a{}'.format(i) for i in range(bits)]
+    names += ['b{}'.format(i) for i in range(bits)]
+    if interleaved:
+        names = [name for pair in zip(names[:bits], names[bits:])
+                 for name in pair]
+    lines = ['.inputs ' + ' '.join(names),
+             '.outputs ' + ' '.join('s{}'.format(i) for i in range(bits))
+             + ' c{}'.format(bits),
+             '.gate CONST0 c0']
+    for i in range(bits):
+        lines += ['.gate XOR h{0} a{0} b{0}'.format(i),
+                  '.gate XOR s{0} h{0} c{0}'.format(i),
+                  '.gate AND g{0} a{0} b{0}'.format(i),
+                  '.gate AND p{0} h{0} c{0}'.format(i),
+                  '.gate OR c{1} g{0} p{0}'.format(i, i + 1)]
+    return parse_netlist('\n'.join(lines))
+
+
+class TestBDD(unittest.TestCase):
+    """
+    Tests BDD construction, counting, satisfiability and reordering.
+    """
+    def assertMatchesCircuit(self, manager, roots, circuit):
+        for bits in itertools.product((0, 1), repeat=len(circuit.inputs)):
+            values = dict(zip(circuit.inputs, bits))
+            self.assertEqual(
+                tuple(manager.evaluate(root, values) for root in roots),
+                circuit.evaluate(values))
+
+    def test_nodes_are_canonical(self):
+        manager = bdd.BDD(['x', 'y'])
+        x, y = manager.variable('x'), manager.variable('y')
+        self.assertEqual(manager.conjoin(x, y), manager.conjoin(y, x))
+        self.assertEqual(manager.negate(manager.negate(x)), x)
+        # De Morgan.
+        self.assertEqual(
+            manager.negate(manager.disjoin(x, y)),
+            manager.conjoin(manager.negate(x), manager.negate(y)))
+        self.assertEqual(manager.exclusive_or(x, x), bdd.BDD.FALSE)
+        self.assertEqual(manager.disjoin(x, manager.negate(x)),
+                         bdd.BDD.TRUE)
+        with self.assertRaises(KeyError):
+            manager.variable('z')
+
+    def test_build_matches_circuit(self):
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                circuit = random_netlist(6, 60, seed)
+                manager, roots = bdd.circuit_bdd(circuit)
+                self.assertMatchesCircuit(manager, roots, circuit)
+
+    def test_satisfy_count(self):
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                circuit = random_netlist(6, 60, seed)
+                manager, roots = bdd.circuit_bdd(circuit)
+                for root, word in zip(roots, circuit.truth_table_words()):
+                    self.assertEqual(manager.satisfy_count(root),
+                                     bin(word).count('1'))
+        manager = bdd.BDD(['x', 'y', 'z'])
+        self.assertEqual(manager.satisfy_count(bdd.BDD.TRUE), 8)
+        self.assertEqual(manager.satisfy_count(bdd.BDD.FALSE), 0)
+        self.assertEqual(manager.satisfy_count(manager.variable('y')), 4)
+
+    def test_any_sat(self):
+        manager = bdd.BDD(['x', 'y', 'z'])
+        x, y, z = (manager.variable(name) for name in 'xyz')
+        f = manager.conjoin(manager.negate(x), manager.exclusive_or(y, z))
+        assignment = manager.any_sat(f)
+        self.assertEqual(set(assignment), {'x', 'y', 'z'})
+        self.assertEqual(manager.evaluate(f, assignment), 1)
+        self.assertIsNone(manager.any_sat(manager.conjoin(x,
+                                                          manager.negate(x))))
+
+    def test_equivalent(self):
+        circuit = random_netlist(8, 120, 3)
+        optimized = CircuitOptimizer(circuit).optimize()
+        self.assertTrue(bdd.equivalent(circuit, optimized))
+
+        broken = CompiledCircuit(
+            circuit.inputs,
+            circuit.instructions + [('NOT', (circuit.outputs[0],))],
+            [len(circuit.inputs) + circuit.gate_count]
+            + circuit.outputs[1:], circuit.output_names)
+        self.assertFalse(bdd.equivalent(circuit, broken))
+        self.assertFalse(bdd.equivalent(circuit, ripple_adder(2)))
+
+    def test_equivalent_gate_networks(self):
+        # NAND(A, B) == OR(NOT A, NOT B)
+        pins = [lc.InputPin("A"), lc.InputPin("B")]
+        nand = lc.NandGate("N")
+        lc.Connector(pins[0], nand)
+        lc.Connector(pins[1], nand)
+        inverters = [lc.NotGate("NA"), lc.NotGate("NB")]
+        or_gate = lc.OrGate("O")
+        for pin, inverter in zip(pins, inverters):
+            lc.Connector(pin, inverter)
+            lc.Connector(inverter, or_gate)
+        self.assertTrue(bdd.equivalent(nand, or_gate))
+        self.assertFalse(bdd.equivalent(nand, inverters[0]))
+
+    def test_swap_preserves_functions(self):
+        circuit = random_netlist(6, 60, 7)
+        manager, roots = bdd.circuit_bdd(circuit)
+        rng = random.Random(0)
+        for _ in range(30):
+            manager.swap(rng.randrange(5))
+        self.assertMatchesCircuit(manager, roots, circuit)
+        # Rebuilding under the new order yields the same nodes.
+        self.assertEqual(manager.build(circuit), roots)
+        with self.assertRaises(ValueError):
+            manager.swap(5)
+
+    def test_sifting_shrinks_bad_order(self):
+        # The adder BDD is linear in the number of bits with the inputs
+        # interleaved, and exponential with all a's before all b's.
+        bits = 6
+        adder = ripple_adder(bits, interleaved=False)
+        manager, roots = bdd.circuit_bdd(adder, order=adder.inputs)
+        before = manager.node_count(roots)
+        after = manager.sift(roots)
+        self.assertEqual(after, manager.node_count(roots))
+        self.assertLess(after, before // 4)
+        self.assertMatchesCircuit(manager, roots, adder)
+
+        _, good_roots = bdd.circuit_bdd(ripple_adder(bits))
+        interleaved, _ = bdd.circuit_bdd(ripple_adder(bits))
+        self.assertLessEqual(after, interleaved.node_count(good_roots) + 4)
+
+    def test_cache_is_bounded(self):
+        circuit = random_netlist(8, 200, 5)
+        manager = bdd.BDD(circuit.inputs, cache_size=16)
+        roots = manager.build(circuit)
+        self.assertLessEqual(len(manager._computed), 16)
+        self.assertMatchesCircuit(manager, roots, circuit)
+
+    def test_deep_ite(self):
+        # Conjoining the even and odd variables descends through every
+        # level, deeper than the recursion limit.
+        names = ['x{}'.format(index) for index in range(5000)]
+        manager = bdd.BDD(names)
+        chains = [manager.TRUE, manager.TRUE]
+        for index in reversed(range(len(names))):
+            chains[index % 2] = manager.conjoin(
+                manager.variable(names[index]), chains[index % 2])
+        both = manager.conjoin(chains[0], chains[1])
+        self.assertEqual(manager.satisfy_count(both), 1)
+        self.assertEqual(manager.any_sat(both), dict.fromkeys(names, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
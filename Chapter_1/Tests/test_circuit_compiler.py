@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+import itertools
+import random
+import re
+import unittest
+from unittest import mock
+
+from Chapter_1 import logic_circuits as lc
+from Chapter_1.circuit_compiler import (CircuitCompiler, CompiledCircuit,
+                                        exhaustive_words, np, random_words)
+from Chapter_1.circuit_inputs import bind_inputs, input_pins
+
+PROMPT = re.compile(r'Pin (A|B)? ?for gate (\w+)')
+
+
+def get_output_with(gate, values):
+    """Runs gate.get_output(), answering each input prompt from values."""
+    def answer(prompt):
+        pin, label = PROMPT.search(prompt).groups()
+        name = {'A': 'pin_a', 'B': 'pin_b', None: 'pin'}[pin]
+        return str(values['{}.{}'.format(label, name)])
+
+    with mock.patch('builtins.input', side_effect=answer):
+        return gate.get_output()
+
+
+class TestCircuitCompiler(unittest.TestCase):
+    """
+    Tests that compiled circuits agree with LogicGate.get_output().
+    """
+    def setUp(self):
+        self.g1 = lc.AndGate("G1")
+        self.g2 = lc.AndGate("G2")
+        self.g3 = lc.OrGate("G3")
+        self.g4 = lc.NotGate("G4")
+        lc.Connector(self.g1, self.g3)
+        lc.Connector(self.g2, self.g3)
+        lc.Connector(self.g3, self.g4)
+
+    def test_inputs_are_unconnected_pins(self):
+        compiled = CircuitCompiler(self.g4).compile()
+        self.assertEqual(sorted(compiled.inputs),
+                         ['G1.pin_a', 'G1.pin_b', 'G2.pin_a', 'G2.pin_b'])
+        self.assertEqual(compiled.gate_count, 4)
+        self.assertEqual(compiled.output_names, ['G4'])
+
+    def test_compiled_matches_get_output(self):
+        compiled = CircuitCompiler(self.g4, self.g3).compile()
+        for bits in itertools.product((0, 1), repeat=4):
+            values = dict(zip(compiled.inputs, bits))
+            self.assertEqual(compiled.evaluate(values),
+                             (get_output_with(self.g4, values),
+                              get_output_with(self.g3, values)))
+            self.assertEqual(compiled.evaluate(list(bits)),
+                             compiled.evaluate(values))
+
+    def test_fan_out_is_evaluated_once(self):
+        top = lc.AndGate("TOP")
+        lc.Connector(self.g4, top)
+        lc.Connector(self.g4, top)
+        compiled = CircuitCompiler(top).compile()
+        self.assertEqual(compiled.gate_count, 5)
+
+    def test_loop_raises(self):
+        loop = lc.AndGate("LOOP")
+        inverter = lc.NotGate("INV")
+        lc.Connector(loop, inverter)
+        lc.Connector(inverter, loop)
+        with self.assertRaises(ValueError):
+            CircuitCompiler(loop).compile()
+
+
+class TestBitParallelSimulation(unittest.TestCase):
+    """
+    Tests that bit-parallel simulation agrees with per-vector evaluation.
+    """
+    def setUp(self):
+        gates = [lc.AndGate("A"), lc.OrGate("B"), lc.AndGate("C")]
+        self.xor_like = lc.OrGate("D")
+        inverter = lc.NotGate("E")
+        lc.Connector(gates[0], gates[2])
+        lc.Connector(gates[1], gates[2])
+        lc.Connector(gates[2], inverter)
+        lc.Connector(inverter, self.xor_like)
+        lc.Connector(gates[0], self.xor_like)
+        self.compiled = CircuitCompiler(self.xor_like, inverter).compile()
+
+    def test_exhaustive_words(self):
+        words = exhaustive_words(3)
+        self.assertEqual(words, [0b10101010, 0b11001100, 0b11110000])
+        self.assertEqual(exhaustive_words(3, start=4, count=4),
+                         [0b1010, 0b1100, 0b1111])
+        with self.assertRaises(ValueError):
+            exhaustive_words(3, start=2, count=4)
+
+    def test_truth_table_matches_evaluate(self):
+        words = self.compiled.truth_table_words()
+        number_of_inputs = len(self.compiled.inputs)
+        for vector in range(1 << number_of_inputs):
+            bits = [(vector >> i) & 1 for i in range(number_of_inputs)]
+            self.assertEqual(self.compiled.evaluate(bits),
+                             tuple((word >> vector) & 1 for word in words))
+
+    def test_random_words(self):
+        rng = random.Random(0)
+        words = random_words(len(self.compiled.inputs), 100, rng)
+        outputs = self.compiled.simulate(words, width=100)
+        for k in range(100):
+            bits = [(word >> k) & 1 for word in words]
+            self.assertEqual(self.compiled.evaluate(bits),
+                             tuple((word >> k) & 1 for word in outputs))
+
+    def test_width_is_required_for_ints(self):
+        with self.assertRaises(ValueError):
+            self.compiled.simulate([0] * len(self.compiled.inputs))
+
+    @unittest.skipIf(np is None, 'NumPy is not installed.')
+    def test_numpy_words(self):
+        rng = random.Random(1)
+        words = random_words(len(self.compiled.inputs), 128, rng)
+        arrays = [np.array([word & (2**64 - 1), word >> 64], dtype=np.uint64)
+                  for word in words]
+        expected = self.compiled.simulate(words, width=128)
+        for array, word in zip(self.compiled.simulate(arrays), expected):
+            self.assertEqual(int(array[0]) | int(array[1]) << 64, word)
+
+
+class TestToGates(unittest.TestCase):
+    """
+    Tests rebuilding compiled circuits from LogicGates.
+    """
+    def test_every_operation(self):
+        operations = [('AND', 3), ('OR', 3), ('NOT', 1), ('NAND', 3),
+                      ('NOR', 3), ('XOR', 3), ('XNOR', 3), ('BUF', 1),
+                      ('CONST0', 0), ('CONST1', 0), ('NAND', 2),
+                      ('XNOR', 1)]
+        instructions = [(operation, tuple(range(arity)))
+                        for operation, arity in operations]
+        compiled = CompiledCircuit(
+            ['a', 'b', 'c'], instructions, list(range(3, 15)) + [0],
+            ['y{}'.format(i) for i in range(13)])
+        outputs = compiled.to_gates()
+        pins = {gate.get_label(): gate
+                for gate in CircuitCompiler(*outputs).topological_order()
+                if gate.operation == 'INPUT'}
+        self.assertIs(outputs[-1], pins['a'])
+        for bits in itertools.product((0, 1), repeat=3):
+            for name, bit in zip('abc', bits):
+                pins[name].set_value(bit)
+            self.assertEqual(tuple(gate.get_output() for gate in outputs),
+                             compiled.evaluate(bits))
+
+    def test_constants_round_trip(self):
+        compiled = CompiledCircuit(
+            ['a'], [('CONST1', ()), ('AND', (0, 1)), ('CONST0', ()),
+                    ('OR', (0, 3))],
+            [2, 4], ['y', 'z'])
+        outputs = compiled.to_gates()
+        self.assertEqual(list(input_pins(*outputs)), ['a'])
+        recompiled = CircuitCompiler(*outputs).compile()
+        self.assertEqual(recompiled.inputs, ['a'])
+        self.assertEqual(sorted(operation for operation, _
+                                in recompiled.instructions),
+                         ['AND', 'CONST0', 'CONST1', 'OR'])
+        for bit in (0, 1):
+            self.assertEqual(recompiled.evaluate([bit]),
+                             compiled.evaluate([bit]))
+            bind_inputs(input_pins(*outputs), {'a': bit})
+            self.assertEqual(tuple(gate.get_output() for gate in outputs),
+                             (bit, bit))
+
+    def test_wrong_arity_raises(self):
+        for operation, operands in (('AND', ()), ('NOR', ()), ('NOT', (0, 1)),
+                                    ('CONST1', (0,)), ('MUX', (0, 1))):
+            compiled = CompiledCircuit(['a', 'b'], [(operation, operands)],
+                                       [2], ['y'])
+            with self.assertRaises(ValueError):
+                compiled.to_gates()
+
+
+if __name__ == "__main__":
+    unittest.main()
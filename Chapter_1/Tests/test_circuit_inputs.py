@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import io
+import itertools
+import os
+import tempfile
+import unittest
+
+from Chapter_1 import logic_circuits as lc
+from Chapter_1 import circuit_inputs
+from Chapter_1.circuit_compiler import CircuitCompiler
+
+
+class TestCircuitInputs(unittest.TestCase):
+    """
+    Tests InputPins, input binding, CSV vectors and truth tables.
+    """
+    def setUp(self):
+        # OUT = NOT((A AND B) OR C)
+        self.pins = {label: lc.InputPin(label) for label in 'ABC'}
+        and_gate = lc.AndGate("G1")
+        or_gate = lc.OrGate("G2")
+        self.output = lc.NotGate("OUT")
+        lc.Connector(self.pins['A'], and_gate)
+        lc.Connector(self.pins['B'], and_gate)
+        lc.Connector(and_gate, or_gate)
+        lc.Connector(self.pins['C'], or_gate)
+        lc.Connector(or_gate, self.output)
+        self.compiled = CircuitCompiler(self.output).compile()
+
+    @staticmethod
+    def expected(a, b, c):
+        return int(not ((a and b) or c))
+
+    def test_input_pins_are_named_inputs(self):
+        self.assertEqual(self.compiled.inputs, ['A', 'B', 'C'])
+        self.assertEqual(circuit_inputs.input_pins(self.output), self.pins)
+
+    def test_bound_inputs_run_get_output_without_prompting(self):
+        pins = circuit_inputs.input_pins(self.output)
+        for a, b, c in itertools.product((0, 1), repeat=3):
+            circuit_inputs.bind_inputs(pins, {'A': a, 'B': b, 'C': c})
+            self.assertEqual(self.output.get_output(), self.expected(a, b, c))
+
+    def test_bind_inputs_rejects_missing_unknown_and_invalid_values(self):
+        pins = circuit_inputs.input_pins(self.output)
+        with self.assertRaises(KeyError):
+            circuit_inputs.bind_inputs(pins, {'A': 1, 'B': 0})
+        with self.assertRaises(KeyError):
+            circuit_inputs.bind_inputs(pins, {'A': 1, 'B': 0, 'C': 0, 'D': 1})
+        with self.assertRaises(ValueError):
+            circuit_inputs.bind_inputs(pins, {'A': 2, 'B': 0, 'C': 0})
+
+    def test_unbound_input_raises(self):
+        with self.assertRaises(RuntimeError):
+            self.output.get_output()
+
+    def test_input_pin_has_no_pins(self):
+        with self.assertRaises(RuntimeError):
+            lc.Connector(lc.AndGate("X"), self.pins['A'])
+
+    def test_drive_from_csv(self):
+        text = "C,A,B\n0,1,1\n1,0,0\n0,0,1\n"
+        outputs = list(circuit_inputs.drive(
+            self.compiled, circuit_inputs.vectors_from_csv(io.StringIO(text))))
+        self.assertEqual(outputs, [(0,), (0,), (1,)])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'vectors.csv')
+            with open(path, 'w') as csv_file:
+                csv_file.write(text)
+            self.assertEqual(list(circuit_inputs.drive(
+                self.compiled, circuit_inputs.vectors_from_csv(path))),
+                outputs)
+
+    def test_drive_from_iterator(self):
+        vectors = iter([[1, 1, 0], {'A': 0, 'B': 0, 'C': 0}])
+        self.assertEqual(list(circuit_inputs.drive(self.compiled, vectors)),
+                         [(0,), (1,)])
+
+    def test_truth_table(self):
+        rows = list(circuit_inputs.truth_table(self.compiled, block_size=2))
+        self.assertEqual(
+            rows,
+            [(bits, (self.expected(*bits),))
+             for bits in itertools.product((0, 1), repeat=3)])
+
+    def test_truth_table_is_lazy(self):
+        gate = lc.AndGate("WIDE")
+        for index in range(30):
+            next_gate = lc.OrGate("W{}".format(index))
+            lc.Connector(gate, next_gate)
+            gate = next_gate
+        compiled = CircuitCompiler(gate).compile()
+        self.assertEqual(len(compiled.inputs), 32)
+        rows = circuit_inputs.truth_table(compiled)
+        self.assertEqual(next(rows), ((0,) * 32, (0,)))
+        self.assertEqual(next(rows), ((0,) * 31 + (1,), (1,)))
+
+
+if __name__ == "__main__":
+    unittest.main()
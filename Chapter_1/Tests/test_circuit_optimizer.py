@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+import itertools
+import random
+import unittest
+
+from Chapter_1 import logic_circuits as lc
+from Chapter_1 import circuit_optimizer as co
+from Chapter_1.circuit_compiler import CircuitCompiler, CompiledCircuit
+from Chapter_1.circuit_inputs import input_pins
+from Chapter_1.netlist import parse_netlist
+
+
+def random_netlist(number_of_inputs, number_of_gates, seed):
+    """Returns a random circuit with plenty of redundancy to optimize."""
+    rng = random.Random(seed)
+    instructions = []
+    for slot in range(number_of_inputs, number_of_inputs + number_of_gates):
+        operation = rng.choice(('AND', 'OR', 'NOT', 'NAND', 'NOR', 'XOR',
+                                'XNOR', 'BUF', 'CONST0', 'CONST1'))
+        if operation in ('NOT', 'BUF'):
+            operands = (rng.randrange(slot),)
+        elif operation in ('CONST0', 'CONST1'):
+            operands = ()
+        else:
+            operands = tuple(rng.randrange(max(0, slot - 8), slot)
+                             for _ in range(rng.randint(2, 4)))
+        instructions.append((operation, operands))
+    total = number_of_inputs + number_of_gates
+    outputs = rng.sample(range(total), 4)
+    return CompiledCircuit(['i{}'.format(i) for i in range(number_of_inputs)],
+                           instructions, outputs,
+                           ['o{}'.format(i) for i in range(4)])
+
+
+class TestCircuitOptimizer(unittest.TestCase):
+    """
+    Tests the optimization passes and CircuitOptimizer.
+    """
+    def assertSameFunction(self, first, second):
+        self.assertEqual(first.inputs, second.inputs)
+        self.assertEqual(first.output_names, second.output_names)
+        self.assertEqual(first.truth_table_words(),
+                         second.truth_table_words())
+
+    def test_fold_constants(self):
+        circuit = parse_netlist("""
+            .inputs a b
+            .outputs y z w v
+            .gate CONST1 one
+            .gate AND t a one b a
+            .gate OR y t b
+            .gate XOR z a a b one
+            .gate NAND w a one
+            .gate NOR v a one
+            """)
+        folded = co.fold_constants(circuit)
+        self.assertSameFunction(folded, circuit)
+        self.assertEqual(co.eliminate_dead_gates(folded).instructions,
+                         [('AND', (0, 1)), ('OR', (2, 1)), ('NOT', (1,)),
+                          ('NOT', (0,)), ('CONST0', ())])
+
+    def test_fold_fixed_inputs(self):
+        circuit = parse_netlist("""
+            .inputs a b c
+            .outputs y
+            .gate AND t a b
+            .gate OR y t c
+            """)
+        folded = co.eliminate_dead_gates(
+            co.fold_constants(circuit, {'a': 1}))
+        self.assertEqual(folded.instructions, [('OR', (1, 2))])
+        for b, c in itertools.product((0, 1), repeat=2):
+            self.assertEqual(folded.evaluate([0, b, c]),
+                             circuit.evaluate([1, b, c]))
+        with self.assertRaises(KeyError):
+            co.fold_constants(circuit, {'d': 0})
+
+    def test_remove_double_negations(self):
+        circuit = parse_netlist("""
+            .inputs a
+            .outputs y z
+            .gate NOT n1 a
+            .gate NOT y n1
+            .gate NOT n3 y
+            .gate NOT z n3
+            """)
+        optimized = co.eliminate_dead_gates(
+            co.remove_double_negations(circuit))
+        self.assertEqual(optimized.instructions, [])
+        self.assertEqual(optimized.outputs, [0, 0])
+
+    def test_merge_common_subexpressions(self):
+        circuit = parse_netlist("""
+            .inputs a b
+            .outputs y
+            .gate AND t1 a b
+            .gate AND t2 b a
+            .gate NOT n1 t1
+            .gate NOT n2 t2
+            .gate OR y n1 n2
+            """)
+        merged = co.merge_common_subexpressions(circuit)
+        self.assertEqual(merged.instructions,
+                         [('AND', (0, 1)), ('NOT', (2,)), ('OR', (3, 3))])
+        self.assertSameFunction(merged, circuit)
+
+    def test_eliminate_dead_gates(self):
+        circuit = parse_netlist("""
+            .inputs a b
+            .outputs y
+            .gate AND dead1 a b
+            .gate NOT dead2 dead1
+            .gate OR y a b
+            """)
+        optimized = co.eliminate_dead_gates(circuit)
+        self.assertEqual(optimized.instructions, [('OR', (0, 1))])
+        self.assertEqual(optimized.outputs, [2])
+
+    def test_optimizer_preserves_function(self):
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                circuit = random_netlist(6, 80, seed)
+                optimizer = co.CircuitOptimizer(circuit)
+                optimized = optimizer.optimize()
+                self.assertSameFunction(optimized, circuit)
+                self.assertLessEqual(optimized.gate_count,
+                                     circuit.gate_count)
+                self.assertEqual(optimizer.history[0].gates_before, 80)
+                self.assertEqual(optimizer.history[-1].gates_after,
+                                 optimized.gate_count)
+                self.assertIn('Total: 80 -> ', optimizer.report())
+
+    def test_reconvergent_gates_collapse(self):
+        # G_k = G_(k-1) AND G_(k-1): get_output takes 2**depth evaluations,
+        # the optimized circuit just one gate.
+        pin_a, pin_b = lc.InputPin("A"), lc.InputPin("B")
+        gate = lc.OrGate("G0")
+        lc.Connector(pin_a, gate)
+        lc.Connector(pin_b, gate)
+        for stage in range(1, 21):
+            next_gate = lc.AndGate("G{}".format(stage))
+            lc.Connector(gate, next_gate)
+            lc.Connector(gate, next_gate)
+            gate = next_gate
+        compiled = CircuitCompiler(gate).compile()
+        optimized = co.CircuitOptimizer(compiled).optimize()
+        self.assertEqual(optimized.instructions, [('OR', (0, 1))])
+
+        output, = optimized.to_gates()
+        pins = input_pins(output)
+        for a, b in itertools.product((0, 1), repeat=2):
+            pins['A'].set_value(a)
+            pins['B'].set_value(b)
+            self.assertEqual(output.get_output(), a | b)
+
+
+if __name__ == "__main__":
+    unittest.main()
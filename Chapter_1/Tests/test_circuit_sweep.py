@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+import itertools
+import pickle
+import unittest
+
+from Chapter_1 import circuit_sweep
+from Chapter_1.circuit_compiler import CompiledCircuit
+from Chapter_1.netlist import parse_netlist
+
+
+def adder(bits, carry_bug=None):
+    """
+    Returns a ripple carry adder netlist; with carry_bug = i, the carry out
+    of bit i is an AND instead of an OR.
+    """
+    lines = ['.inputs ' + ' '.join('a{0} b{0}'.format(i)
+                                   for i in range(bits)),
+             '.outputs ' + ' '.join('s{}'.format(i) for i in range(bits)),
+             '.gate CONST0 c0']
+    for i in range(bits):
+        lines += ['.gate XOR h{0} a{0} b{0}'.format(i),
+                  '.gate XOR s{0} h{0} c{0}'.format(i),
+                  '.gate AND g{0} a{0} b{0}'.format(i),
+                  '.gate AND p{0} h{0} c{0}'.format(i),
+                  '.gate {2} c{1} g{0} p{0}'.format(
+                      i, i + 1, 'AND' if i == carry_bug else 'OR')]
+    return parse_netlist('\n'.join(lines))
+
+
+def sum_is_even(inputs, outputs, mask):
+    """Predicate passing the vectors whose lowest sum bit is 0."""
+    return mask ^ outputs[0]
+
+
+class TestCircuitSweep(unittest.TestCase):
+    """
+    Tests exhaustive sweeps in and across processes.
+    """
+    def test_compiled_circuit_pickles(self):
+        circuit = adder(3)
+        circuit.evaluate([0] * 6)
+        restored = pickle.loads(pickle.dumps(circuit))
+        self.assertEqual(restored.truth_table_words(),
+                         circuit.truth_table_words())
+
+    def test_equivalent_circuits_have_no_failures(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                result = circuit_sweep.sweep(
+                    adder(6), circuit_sweep.Matches(adder(6)),
+                    workers=workers, block_size=64)
+                self.assertEqual(result, (1 << 12, 0, []))
+
+    def test_counts_and_counterexamples(self):
+        circuit, reference = adder(5, carry_bug=1), adder(5)
+        failing = [vector for vector in range(1 << 10)
+                   if circuit.evaluate([(vector >> i) & 1
+                                        for i in range(10)])
+                   != reference.evaluate([(vector >> i) & 1
+                                          for i in range(10)])]
+        predicate = circuit_sweep.Matches(reference)
+        for workers, block_size in itertools.product((1, 2), (16, 1024)):
+            with self.subTest(workers=workers, block_size=block_size):
+                result = circuit_sweep.sweep(circuit, predicate,
+                                             workers=workers,
+                                             max_counterexamples=5,
+                                             block_size=block_size)
+                self.assertEqual(result.vectors, 1024)
+                self.assertEqual(result.failures, len(failing))
+                self.assertEqual(
+                    result.counterexamples,
+                    [{name: (vector >> i) & 1
+                      for i, name in enumerate(circuit.inputs)}
+                     for vector in failing[:5]])
+
+        result = circuit_sweep.sweep(circuit, predicate, workers=2,
+                                     max_counterexamples=0, block_size=16)
+        self.assertEqual((result.failures, result.counterexamples),
+                         (len(failing), []))
+
+    def test_module_level_predicate(self):
+        circuit = adder(4)
+        result = circuit_sweep.sweep(circuit, sum_is_even, workers=2,
+                                     block_size=16)
+        # s0 = a0 XOR b0 is 1 for half of all vectors.
+        self.assertEqual(result.failures, 128)
+
+    def test_streamed_counterexamples(self):
+        circuit = adder(5, carry_bug=0)
+        stream = circuit_sweep.counterexamples(
+            circuit, circuit_sweep.Matches(adder(5)), workers=2,
+            block_size=16, per_range=1)
+        for values in itertools.islice(stream, 3):
+            self.assertNotEqual(circuit.evaluate(values),
+                                adder(5).evaluate(values))
+        stream.close()
+
+    def test_always_one_and_no_inputs(self):
+        circuit = CompiledCircuit([], [('CONST1', ())], [0], ['y'])
+        self.assertEqual(circuit_sweep.sweep(circuit, workers=1),
+                         (1, 0, []))
+        with self.assertRaises(ValueError):
+            circuit_sweep.sweep(adder(2), block_size=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
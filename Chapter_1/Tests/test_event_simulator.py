@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import random
+import unittest
+
+from Chapter_1 import logic_circuits as lc
+from Chapter_1.circuit_compiler import CircuitCompiler
+from Chapter_1.event_simulator import EventDrivenSimulator
+
+
+class TestEventDrivenSimulator(unittest.TestCase):
+    """
+    Tests that incremental simulation agrees with full evaluation and only
+    evaluates the gates affected by a change.
+    """
+    def setUp(self):
+        # Two independent cones: OUT1 = NOT(A.a AND A.b), OUT2 = B.a OR B.b.
+        self.and_gate = lc.AndGate("A")
+        self.out1 = lc.NotGate("OUT1")
+        lc.Connector(self.and_gate, self.out1)
+        self.out2 = lc.OrGate("B")
+        self.simulator = EventDrivenSimulator.from_gates(self.out1, self.out2)
+
+    def test_initial_outputs(self):
+        self.assertEqual(self.simulator.outputs, (1, 0))
+        self.assertEqual(self.simulator.total_evaluations, 3)
+
+    def test_change_only_evaluates_its_cone(self):
+        step = self.simulator.set_inputs({'B.pin_a': 1})
+        self.assertEqual(step.evaluations, 1)
+        self.assertEqual(step.changed_outputs, ['B'])
+        self.assertEqual(self.simulator.outputs, (1, 1))
+
+    def test_change_stops_when_output_is_unchanged(self):
+        step = self.simulator.toggle('A.pin_a')
+        # The AND gate is evaluated, but its output stays 0.
+        self.assertEqual(step.evaluations, 1)
+        self.assertEqual(step.changed_outputs, [])
+        step = self.simulator.toggle('A.pin_b')
+        self.assertEqual(step.evaluations, 2)
+        self.assertEqual(step.changed_outputs, ['OUT1'])
+        self.assertEqual(self.simulator.outputs, (0, 0))
+
+    def test_unchanged_value_costs_nothing(self):
+        self.assertEqual(self.simulator.set_inputs({'A.pin_a': 0}).evaluations,
+                         0)
+
+    def test_unknown_input_raises(self):
+        with self.assertRaises(KeyError):
+            self.simulator.set_inputs({'C.pin_a': 1})
+
+    def test_random_toggles_match_full_evaluation(self):
+        rng = random.Random(3)
+        gates = [lc.AndGate("I{}".format(i)) for i in range(6)]
+        for index in range(60):
+            gate_class = rng.choice((lc.AndGate, lc.OrGate, lc.NotGate))
+            gate = gate_class("G{}".format(index))
+            for source in rng.sample(gates, 1 if gate_class is lc.NotGate
+                                     else 2):
+                lc.Connector(source, gate)
+            gates.append(gate)
+        compiled = CircuitCompiler(*gates[-5:]).compile()
+        simulator = EventDrivenSimulator(compiled)
+        values = dict.fromkeys(compiled.inputs, 0)
+        for _ in range(200):
+            name = rng.choice(compiled.inputs)
+            values[name] = 1 - values[name]
+            simulator.toggle(name)
+            self.assertEqual(simulator.outputs, compiled.evaluate(values))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+import unittest
+
+from Chapter_1.fraction import Fraction, bounded_precision, fprod, fsum
+
+
+class TestFraction(unittest.TestCase):
+    """
+    Tests the Fraction class.
+        -   Normalization in the constructor.
+        -   Arithmetic results are in lowest terms.
+        -   Instances are immutable.
+    """
+    def test_constructor_reduces_and_fixes_sign(self):
+        fraction = Fraction(6, -8)
+        self.assertEqual((fraction.numerator, fraction.denominator), (-3, 4))
+
+    def test_zero_denominator_raises(self):
+        with self.assertRaises(ZeroDivisionError):
+            Fraction(1, 0)
+
+    def test_arithmetic_is_in_lowest_terms(self):
+        a, b = Fraction(5, 6), Fraction(7, 10)
+        cases = [(a + b, (23, 15)), (a - b, (2, 15)), (a * b, (7, 12)),
+                 (a / b, (25, 21)), (a / -b, (-25, 21)),
+                 (a - a, (0, 1)), (Fraction(0, 3) * b, (0, 1))]
+        for result, expected in cases:
+            self.assertEqual((result.numerator, result.denominator), expected)
+
+    def test_division_by_zero_raises(self):
+        with self.assertRaises(ZeroDivisionError):
+            Fraction(1, 2) / Fraction(0, 1)
+        with self.assertRaises(ZeroDivisionError):
+            ~Fraction(0, 1)
+
+    def test_reciprocal_keeps_denominator_positive(self):
+        fraction = ~Fraction(-2, 3)
+        self.assertEqual((fraction.numerator, fraction.denominator), (-3, 2))
+
+    def test_fraction_is_immutable(self):
+        fraction = Fraction(1, 2)
+        with self.assertRaises(AttributeError):
+            fraction.numerator = 3
+        with self.assertRaises(AttributeError):
+            fraction.label = 'half'
+
+
+class TestFractionHash(unittest.TestCase):
+    """
+    Tests that Fractions can be used as dictionary keys and set members.
+    """
+    def test_hash_matches_equal_numbers(self):
+        import fractions
+
+        self.assertEqual(hash(Fraction(4, 2)), hash(2))
+        self.assertEqual(hash(Fraction(1, 2)), hash(0.5))
+        self.assertEqual(hash(Fraction(-7, 3)),
+                         hash(fractions.Fraction(-7, 3)))
+
+    def test_equal_fractions_are_one_key(self):
+        table = {Fraction(1, 3): 'third', 2: 'two'}
+        self.assertEqual(table[Fraction(2, 6)], 'third')
+        self.assertEqual(table[Fraction(6, 3)], 'two')
+        self.assertEqual(len({Fraction(1, 2), Fraction(2, 4), Fraction(3, 6)}),
+                         1)
+
+    def test_hash_is_cached(self):
+        fraction = Fraction(22, 7)
+        self.assertEqual(hash(fraction), hash(fraction))
+        self.assertEqual(fraction._hash, hash(fraction))
+
+
+class TestFsumFprod(unittest.TestCase):
+    """
+    Tests the streaming fsum() and fprod() functions.
+    """
+    def setUp(self):
+        self.values = [Fraction(1, 6), Fraction(-3, 4), 2, Fraction(5, 9),
+                       Fraction(7, 10), Fraction(-1, 6)]
+
+    def test_fsum_matches_repeated_addition(self):
+        expected = Fraction(0, 1)
+        for value in self.values:
+            expected = expected + (value if isinstance(value, Fraction)
+                                   else Fraction(value, 1))
+        self.assertEqual(fsum(iter(self.values)), expected)
+
+    def test_fprod_matches_repeated_multiplication(self):
+        expected = Fraction(1, 1)
+        for value in self.values:
+            expected = expected * (value if isinstance(value, Fraction)
+                                   else Fraction(value, 1))
+        result = fprod(value for value in self.values)
+        self.assertEqual((result.numerator, result.denominator),
+                         (expected.numerator, expected.denominator))
+
+    def test_empty_iterables(self):
+        self.assertEqual(fsum([]), Fraction(0, 1))
+        self.assertEqual(fprod([]), Fraction(1, 1))
+
+    def test_result_is_normalized(self):
+        result = fsum([Fraction(1, 4), Fraction(1, 4)])
+        self.assertEqual((result.numerator, result.denominator), (1, 2))
+
+    def test_invalid_items_raise(self):
+        with self.assertRaises(TypeError):
+            fsum([Fraction(1, 2), 0.5])
+
+
+class TestMixedOperands(unittest.TestCase):
+    """
+    Tests arithmetic and comparisons between Fractions, ints and floats.
+    """
+    def setUp(self):
+        self.fraction = Fraction(-5, 6)
+
+    def assertTerms(self, fraction, numerator, denominator):
+        self.assertIsInstance(fraction, Fraction)
+        self.assertEqual((fraction.numerator, fraction.denominator),
+                         (numerator, denominator))
+
+    def test_int_arithmetic(self):
+        self.assertTerms(self.fraction + 2, 7, 6)
+        self.assertTerms(2 + self.fraction, 7, 6)
+        self.assertTerms(self.fraction - 2, -17, 6)
+        self.assertTerms(2 - self.fraction, 17, 6)
+        self.assertTerms(self.fraction * 4, -10, 3)
+        self.assertTerms(4 * self.fraction, -10, 3)
+        self.assertTerms(self.fraction / -10, 1, 12)
+        self.assertTerms(10 / self.fraction, -12, 1)
+        self.assertTerms(self.fraction * 0, 0, 1)
+
+    def test_int_division_by_zero_raises(self):
+        with self.assertRaises(ZeroDivisionError):
+            self.fraction / 0
+        with self.assertRaises(ZeroDivisionError):
+            1 / Fraction(0, 1)
+
+    def test_float_arithmetic_returns_floats(self):
+        self.assertAlmostEqual(self.fraction + 0.5, -1 / 3)
+        self.assertAlmostEqual(0.5 - self.fraction, 4 / 3)
+        self.assertAlmostEqual(self.fraction * 1.5, -1.25)
+        self.assertAlmostEqual(1.0 / self.fraction, -1.2)
+        self.assertEqual(float(Fraction(1, 4)), 0.25)
+
+    def test_comparisons_with_ints_and_floats(self):
+        self.assertTrue(Fraction(4, 2) == 2)
+        self.assertTrue(2 == Fraction(4, 2))
+        self.assertTrue(Fraction(1, 4) == 0.25)
+        self.assertTrue(self.fraction < 0)
+        self.assertTrue(-1 < self.fraction)
+        self.assertTrue(self.fraction >= -0.9)
+        self.assertTrue(Fraction(1, 3) != 0.3333333333333333)
+        self.assertTrue(self.fraction < float('inf'))
+        self.assertFalse(self.fraction == float('nan'))
+        self.assertTrue(self.fraction != float('nan'))
+
+    def test_unsupported_operands_raise(self):
+        with self.assertRaises(TypeError):
+            self.fraction + 'x'
+        with self.assertRaises(TypeError):
+            self.fraction < 'x'
+
+
+class TestLimitDenominator(unittest.TestCase):
+    """
+    Tests limit_denominator(), from_float() and bounded_precision().
+    """
+    def test_limit_denominator_matches_standard_library(self):
+        import fractions
+
+        for numerator, denominator in ((314159, 100000), (-314159, 100000),
+                                       (1, 3), (123456789, 987654321)):
+            expected = fractions.Fraction(numerator, denominator)
+            for max_denominator in (1, 7, 10, 113, 1000):
+                result = Fraction(numerator, denominator).limit_denominator(
+                    max_denominator)
+                limited = expected.limit_denominator(max_denominator)
+                self.assertEqual((result.numerator, result.denominator),
+                                 (limited.numerator, limited.denominator))
+
+    def test_from_float(self):
+        self.assertEqual(Fraction.from_float(0.375), Fraction(3, 8))
+        self.assertEqual(Fraction.from_float(-0.1).denominator, 2**55)
+        self.assertEqual(Fraction.from_float(3.141592653589793, 1000),
+                         Fraction(355, 113))
+        with self.assertRaises(ValueError):
+            Fraction(1, 3).limit_denominator(0)
+
+    def test_bounded_precision(self):
+        third = Fraction(1, 3)
+        with bounded_precision(100):
+            result = Fraction(1, 97) + Fraction(1, 89)
+            self.assertLessEqual(result.denominator, 100)
+            self.assertEqual(third * 2, Fraction(2, 3))
+        self.assertEqual((Fraction(1, 97) + Fraction(1, 89)).denominator,
+                         97 * 89)
+
+    def test_bounded_precision_scope(self):
+        values = [Fraction(1, 97), Fraction(1, 89), 2]
+        with bounded_precision(100):
+            self.assertEqual(Fraction(1, 9797).denominator, 9797)
+            self.assertEqual(Fraction.from_float(0.1).denominator, 2**55)
+            self.assertLessEqual(fsum(values).denominator, 100)
+            self.assertLessEqual(fprod(values).denominator, 100)
+            self.assertEqual(fsum(values),
+                             fsum(values).limit_denominator(100))
+        self.assertEqual(fsum(values).denominator, 97 * 89)
+        self.assertEqual(fprod(values), Fraction(2, 97 * 89))
+
+
+if __name__ == "__main__":
+    unittest.main()
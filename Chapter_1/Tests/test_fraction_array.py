@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import unittest
+
+from Chapter_1.fraction import Fraction, bounded_precision
+from Chapter_1.fraction_array import FractionArray, np
+
+
+@unittest.skipIf(np is None, 'FractionArray requires NumPy.')
+class TestFractionArray(unittest.TestCase):
+    """
+    Tests the FractionArray class against the scalar Fraction class.
+        -   Elementwise arithmetic and comparisons.
+        -   Promotion to Python ints on int64 overflow.
+        -   Reductions.
+    """
+    def setUp(self):
+        self.left = [Fraction(1, 2), Fraction(-3, 4), Fraction(5, 6),
+                     Fraction(0, 1)]
+        self.right = [Fraction(2, 3), Fraction(3, 8), Fraction(-7, 10),
+                      Fraction(9, 5)]
+        self.left_array = FractionArray.from_fractions(self.left)
+        self.right_array = FractionArray.from_fractions(self.right)
+
+    def test_constructor_normalizes(self):
+        array = FractionArray([2, 3, -4], [4, -9, 2])
+        self.assertEqual(array.to_fractions(),
+                         [Fraction(1, 2), Fraction(-1, 3), Fraction(-2, 1)])
+        self.assertTrue((array.denominator > 0).all())
+
+    def test_elementwise_arithmetic(self):
+        for operation in ('__add__', '__sub__', '__mul__', '__truediv__'):
+            result = getattr(self.left_array, operation)(self.right_array)
+            expected = [getattr(a, operation)(b)
+                        for a, b in zip(self.left, self.right)]
+            self.assertEqual(result.to_fractions(), expected)
+
+    def test_scalar_operands(self):
+        half = Fraction(1, 2)
+        self.assertEqual((self.left_array + half).to_fractions(),
+                         [a + half for a in self.left])
+        self.assertEqual((half - self.left_array).to_fractions(),
+                         [half - a for a in self.left])
+        self.assertEqual((self.left_array * 3).to_fractions(),
+                         [a * Fraction(3, 1) for a in self.left])
+
+    def test_comparisons(self):
+        self.assertEqual(list(self.left_array < self.right_array),
+                         [a < b for a, b in zip(self.left, self.right)])
+        self.assertEqual(list(Fraction(1, 2) <= self.left_array),
+                         [Fraction(1, 2) <= a for a in self.left])
+
+    def test_overflow_promotes_to_python_ints(self):
+        big = FractionArray([2**62 + 1], [3])
+        result = big * big
+        self.assertEqual(result[0], Fraction((2**62 + 1)**2, 9))
+        self.assertEqual((result / big)[0], Fraction(2**62 + 1, 3))
+        self.assertEqual((result / big).numerator.dtype, np.int64)
+
+    def test_elements_stay_exact_in_bounded_precision(self):
+        array = FractionArray([1, 2], [9797, 9797])
+        with bounded_precision(100):
+            self.assertEqual(array[0].denominator, 9797)
+            self.assertEqual(array.to_fractions(),
+                             [Fraction(1, 9797), Fraction(2, 9797)])
+
+    def test_int64_limits(self):
+        largest = FractionArray(np.array([2**64 - 1], dtype=np.uint64), [1])
+        self.assertEqual(largest[0], Fraction(2**64 - 1, 1))
+        self.assertEqual(largest.numerator.dtype, object)
+        smallest = FractionArray(np.array([-2**63], dtype=np.int64), [1])
+        self.assertEqual((-smallest)[0], Fraction(2**63, 1))
+        self.assertEqual((-FractionArray([-2**63], [1]))[0],
+                         Fraction(2**63, 1))
+        self.assertEqual((smallest * FractionArray([-1]))[0],
+                         Fraction(2**63, 1))
+        limit = FractionArray(np.array([2**63 - 1, -(2**63 - 1)]), [1, 1])
+        self.assertEqual(limit.numerator.dtype, np.int64)
+        self.assertEqual((-limit).to_fractions(),
+                         [Fraction(-(2**63 - 1), 1), Fraction(2**63 - 1, 1)])
+
+    def test_division_by_zero_raises(self):
+        with self.assertRaises(ZeroDivisionError):
+            self.right_array / self.left_array
+
+    def test_reductions(self):
+        self.assertEqual(self.left_array.sum(),
+                         self.left[0] + self.left[1] + self.left[2])
+        self.assertEqual(self.right_array.prod(),
+                         (self.right[0] * self.right[1] * self.right[2]
+                          * self.right[3]))
+        self.assertEqual(self.left_array.min(), Fraction(-3, 4))
+        self.assertEqual(self.left_array.max(), Fraction(5, 6))
+        with self.assertRaises(ValueError):
+            FractionArray([]).min()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import io
+import pickle
+import unittest
+
+from Chapter_1.fraction import Fraction, bounded_precision
+from Chapter_1 import fraction_io
+from Chapter_1.fraction_array import FractionArray, np
+
+
+class TestFractionIO(unittest.TestCase):
+    """
+    Tests the binary codec, the text parser and pickling of Fractions.
+    """
+    def setUp(self):
+        self.fractions = [Fraction(0, 1), Fraction(-1, 2), Fraction(63, 64),
+                          Fraction(-2**70 - 1, 3**40), Fraction(5, 1)]
+
+    def test_binary_round_trip(self):
+        data = fraction_io.encode_fractions(self.fractions)
+        for trusted in (False, True):
+            self.assertEqual(
+                list(fraction_io.decode_fractions(data, trusted=trusted)),
+                self.fractions)
+
+    def test_decoding_is_exact_in_bounded_precision(self):
+        data = fraction_io.encode_fractions(self.fractions)
+        text = [str(fraction) for fraction in self.fractions]
+        with bounded_precision(10):
+            for trusted in (False, True):
+                self.assertEqual(
+                    list(fraction_io.decode_fractions(data, trusted=trusted)),
+                    self.fractions)
+                self.assertEqual(
+                    list(fraction_io.parse_fractions(text, trusted=trusted)),
+                    self.fractions)
+
+    def test_small_fractions_take_two_bytes(self):
+        self.assertEqual(len(fraction_io.encode_fractions([Fraction(-1, 2)])),
+                         2)
+
+    def test_stream_round_trip_across_chunks(self):
+        fractions = [Fraction(n, 2**40 + 15) for n in range(-20000, 20000, 3)]
+        stream = io.BytesIO()
+        self.assertEqual(fraction_io.write_fractions(stream, fractions),
+                         len(fractions))
+        stream.seek(0)
+        self.assertEqual(list(fraction_io.read_fractions(stream)), fractions)
+
+    def test_truncated_data_raises(self):
+        data = fraction_io.encode_fractions(self.fractions)
+        with self.assertRaises(ValueError):
+            list(fraction_io.decode_fractions(data[:-1]))
+        with self.assertRaises(ValueError):
+            list(fraction_io.read_fractions(io.BytesIO(data[:-1])))
+
+    def test_decoding_is_lazy(self):
+        data = fraction_io.encode_fractions(self.fractions)
+        fractions = fraction_io.decode_fractions(data[:-1])
+        self.assertEqual(next(fractions), self.fractions[0])
+        with self.assertRaises(ValueError):
+            list(fractions)
+
+    def test_untrusted_input_is_normalized(self):
+        data = bytes([4, 4])  # zigzag(2) over 4
+        fraction = next(fraction_io.decode_fractions(data))
+        self.assertEqual((fraction.numerator, fraction.denominator), (1, 2))
+
+    def test_text_round_trip(self):
+        text = fraction_io.format_fractions(self.fractions)
+        self.assertEqual(list(fraction_io.parse_fractions(text)),
+                         self.fractions)
+        self.assertEqual(
+            list(fraction_io.parse_fractions(io.StringIO(text),
+                                             trusted=True)),
+            self.fractions)
+        for malformed in ('1/2 x/3', '1/', '1/2 3/', '/2'):
+            with self.assertRaises(ValueError):
+                list(fraction_io.parse_fractions(malformed))
+
+    def test_pickle_round_trip(self):
+        data = pickle.dumps(self.fractions)
+        self.assertEqual(pickle.loads(data), self.fractions)
+        self.assertLess(len(pickle.dumps(Fraction(1, 2))), 70)
+
+    @unittest.skipIf(np is None, 'FractionArray requires NumPy.')
+    def test_fraction_array_round_trip(self):
+        array = FractionArray.from_fractions(self.fractions)
+        data = fraction_io.encode_fraction_array(array)
+        self.assertEqual(data, fraction_io.encode_fractions(self.fractions))
+        for trusted in (False, True):
+            decoded = fraction_io.decode_fraction_array(data, trusted)
+            self.assertEqual(decoded.to_fractions(), self.fractions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import random
+import unittest
+
+from Chapter_1.fraction import Fraction
+from Chapter_1 import fraction_linalg as linalg
+
+
+def matrix_product(left, right):
+    return [[sum((a * b for a, b in zip(row, column)), Fraction(0, 1))
+             for column in zip(*right)] for row in left]
+
+
+class TestFractionLinalg(unittest.TestCase):
+    """
+    Tests the fraction-free solve, determinant, rank and inverse functions.
+    """
+    def setUp(self):
+        random.seed(1)
+        self.matrix = [[2, -1, 0], [-1, 2, -1], [0, -1, 2]]
+        self.random_matrix = [[random.randint(-9, 9) for _ in range(6)]
+                              for _ in range(6)]
+
+    def test_determinant(self):
+        self.assertEqual(linalg.determinant(self.matrix), 4)
+        self.assertEqual(linalg.determinant([[0, 1], [1, 0]]), -1)
+        self.assertEqual(linalg.determinant([[1, 2], [2, 4]]), 0)
+        self.assertEqual(
+            linalg.determinant([[Fraction(1, 2), 1], [Fraction(1, 3), 1]]),
+            Fraction(1, 6))
+
+    def test_determinant_of_product(self):
+        other = [[random.randint(-9, 9) for _ in range(6)] for _ in range(6)]
+        self.assertEqual(
+            linalg.determinant(matrix_product(self.random_matrix, other)),
+            linalg.determinant(self.random_matrix)
+            * linalg.determinant(other))
+
+    def test_rank(self):
+        self.assertEqual(linalg.rank(self.matrix), 3)
+        self.assertEqual(linalg.rank([[1, 2, 3], [2, 4, 6], [0, 0, 1]]), 2)
+        self.assertEqual(linalg.rank([[0, 0], [0, 0]]), 0)
+        self.assertEqual(linalg.rank([[1, 2, 3, 4], [2, 4, 6, 9]]), 2)
+
+    def test_solve(self):
+        b = [1, Fraction(1, 2), 3]
+        x = linalg.solve(self.matrix, b)
+        self.assertEqual([sum(a * value for a, value in zip(row, x))
+                          for row in self.matrix], b)
+
+    def test_inverse(self):
+        identity = [[Fraction(int(i == j), 1) for j in range(6)]
+                    for i in range(6)]
+        inverse = linalg.inverse(self.random_matrix)
+        self.assertEqual(matrix_product(self.random_matrix, inverse),
+                         identity)
+
+    def test_singular_matrix_raises(self):
+        with self.assertRaises(ValueError):
+            linalg.solve([[1, 2], [2, 4]], [1, 1])
+        with self.assertRaises(ValueError):
+            linalg.determinant([[1, 2, 3], [4, 5, 6]])
+
+
+if __name__ == "__main__":
+    unittest.main()
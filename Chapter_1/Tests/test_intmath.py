@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import math
+import random
+import unittest
+
+from Chapter_1 import intmath
+
+
+class TestIntmath(unittest.TestCase):
+    """
+    Tests the integer kernels against the math module.
+    """
+    def setUp(self):
+        random.seed(2)
+        common = random.getrandbits(300)
+        self.pairs = [(0, 0), (0, 7), (12, 0), (-12, 18), (18, -12),
+                      (2**64, 2**32 * 3), (1, 2**200)]
+        self.pairs += [(random.getrandbits(bits) * common,
+                        random.getrandbits(bits // 2 + 1) * common)
+                       for bits in (10, 100, 1000, 5000)]
+
+    def test_gcd_variants_agree(self):
+        for m, n in self.pairs:
+            expected = math.gcd(m, n)
+            self.assertEqual(intmath.gcd(m, n), expected)
+            self.assertEqual(intmath.binary_gcd(m, n), expected)
+            self.assertEqual(intmath.lehmer_gcd(m, n), expected)
+
+    def test_lcm(self):
+        self.assertEqual(intmath.lcm(4, 6), 12)
+        self.assertEqual(intmath.lcm(0, 6), 0)
+
+    def test_extended_gcd(self):
+        for a, b in self.pairs:
+            g, x, y = intmath.extended_gcd(a, b)
+            self.assertEqual(g, math.gcd(a, b))
+            self.assertEqual(a * x + b * y, g)
+
+    def test_mod_inverse(self):
+        self.assertEqual(intmath.mod_inverse(3, 7), 5)
+        with self.assertRaises(ValueError):
+            intmath.mod_inverse(4, 8)
+
+    def test_gcd_many(self):
+        left = [m for m, _ in self.pairs]
+        right = [n for _, n in self.pairs]
+        self.assertEqual(intmath.gcd_many(left, right),
+                         [math.gcd(m, n) for m, n in self.pairs])
+        with self.assertRaises(ValueError):
+            intmath.gcd_many([1, 2], [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
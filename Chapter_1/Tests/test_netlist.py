@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+import itertools
+import os
+import tempfile
+import unittest
+
+from Chapter_1 import logic_circuits as lc
+from Chapter_1 import netlist
+from Chapter_1.circuit_compiler import CircuitCompiler, CompiledCircuit
+
+FULL_ADDER = """
+# One bit full adder.
+.model full_adder
+.inputs a b cin
+.outputs sum cout
+.gate OR cout carry1 carry2   # Gates may be listed in any order.
+.gate XOR half a b
+.gate XOR sum half cin
+.gate AND carry1 a b
+.gate AND carry2 half cin
+.end
+"""
+
+
+class TestNetlist(unittest.TestCase):
+    """
+    Tests the text and binary netlist loaders and writers.
+    """
+    def assertSameFunction(self, first, second):
+        self.assertEqual(first.inputs, second.inputs)
+        self.assertEqual(first.output_names, second.output_names)
+        self.assertEqual(first.truth_table_words(),
+                         second.truth_table_words())
+
+    def test_parse_full_adder(self):
+        adder = netlist.parse_netlist(FULL_ADDER)
+        self.assertEqual(adder.inputs, ['a', 'b', 'cin'])
+        self.assertEqual(adder.output_names, ['sum', 'cout'])
+        self.assertEqual(adder.gate_count, 5)
+        for a, b, cin in itertools.product((0, 1), repeat=3):
+            total = a + b + cin
+            self.assertEqual(adder.evaluate([a, b, cin]),
+                             (total & 1, total >> 1))
+
+    def test_every_operation(self):
+        text = """
+        .inputs a b c
+        .outputs and or not nand nor xor xnor buf zero one
+        .gate AND and a b c
+        .gate OR or a b c
+        .gate NOT not a
+        .gate NAND nand a b c
+        .gate NOR nor a b c
+        .gate XOR xor a b c
+        .gate XNOR xnor a b c
+        .gate BUF buf a
+        .gate CONST0 zero
+        .gate CONST1 one
+        """
+        circuit = netlist.parse_netlist(text)
+        for bits in itertools.product((0, 1), repeat=3):
+            a = bits[0]
+            expected = (int(all(bits)), int(any(bits)), 1 - a,
+                        1 - all(bits), 1 - any(bits), sum(bits) & 1,
+                        1 - (sum(bits) & 1), a, 0, 1)
+            self.assertEqual(circuit.evaluate(bits), expected)
+            self.assertEqual(circuit.simulate(bits, width=1), expected)
+        # Bit-parallel over all eight vectors at once.
+        words = circuit.truth_table_words()
+        for vector in range(8):
+            bits = [(vector >> i) & 1 for i in range(3)]
+            self.assertEqual(tuple((word >> vector) & 1 for word in words),
+                             circuit.evaluate(bits))
+
+    def test_parse_errors(self):
+        bad_netlists = [
+            ".inputs a\n.outputs y\n.gate FOO y a\n",
+            ".inputs a\n.outputs y\n.gate NOT y a a\n",
+            ".inputs a\n.outputs y\n.gate AND y\n",
+            ".inputs a\n.outputs y\n.gate AND y a b\n",
+            ".inputs a\n.outputs y\n.gate NOT y a\n.gate NOT y a\n",
+            ".inputs a\n.outputs z\n.gate NOT y a\n",
+            ".inputs a\n.outputs y\n.gate AND y a x\n.gate NOT x y\n",
+            ".inputs a a\n.outputs a\n",
+            ".latch a b\n",
+        ]
+        for text in bad_netlists:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    netlist.parse_netlist(text)
+
+    def test_text_round_trip(self):
+        adder = netlist.parse_netlist(FULL_ADDER)
+        reloaded = netlist.parse_netlist(netlist.format_netlist(adder))
+        self.assertEqual(reloaded.instructions, adder.instructions)
+        self.assertEqual(reloaded.outputs, adder.outputs)
+        self.assertSameFunction(reloaded, adder)
+
+    def test_outputs_sharing_slots_are_buffered(self):
+        circuit = CompiledCircuit(['a', 'b'], [('XOR', (0, 1))], [2, 2, 0],
+                                  ['y', 'z', 'w'])
+        text = netlist.format_netlist(circuit)
+        self.assertEqual(text.count('.gate BUF'), 2)
+        self.assertSameFunction(netlist.parse_netlist(text), circuit)
+
+    def test_binary_round_trip(self):
+        adder = netlist.parse_netlist(FULL_ADDER)
+        reloaded = netlist.decode_netlist(netlist.encode_netlist(adder))
+        self.assertEqual(reloaded.inputs, adder.inputs)
+        self.assertEqual(reloaded.instructions, adder.instructions)
+        self.assertEqual(reloaded.outputs, adder.outputs)
+        self.assertEqual(reloaded.output_names, adder.output_names)
+
+        empty = CompiledCircuit([], [], [], [])
+        self.assertEqual(netlist.decode_netlist(
+            netlist.encode_netlist(empty)).gate_count, 0)
+
+    def test_corrupt_binary(self):
+        data = netlist.encode_netlist(netlist.parse_netlist(FULL_ADDER))
+        for corrupt in (data[:-1], data + b'\0', b'XXXX' + data[4:]):
+            with self.assertRaises(ValueError):
+                netlist.decode_netlist(corrupt)
+
+    def test_compiled_gates_round_trip(self):
+        pin_a, pin_b = lc.InputPin("A"), lc.InputPin("B")
+        nand, nor, xor = lc.NandGate("N1"), lc.NorGate("N2"), lc.XorGate("X")
+        for gate in (nand, nor):
+            lc.Connector(pin_a, gate)
+            lc.Connector(pin_b, gate)
+        lc.Connector(nand, xor)
+        lc.Connector(nor, xor)
+        compiled = CircuitCompiler(xor).compile()
+        for a, b in itertools.product((0, 1), repeat=2):
+            pin_a.set_value(a)
+            pin_b.set_value(b)
+            self.assertEqual(compiled.evaluate([a, b]), (xor.get_output(),))
+
+        with tempfile.TemporaryDirectory() as directory:
+            for binary in (False, True):
+                path = os.path.join(directory, 'circuit.net')
+                netlist.save_netlist(path, compiled, binary=binary)
+                self.assertSameFunction(netlist.load_netlist(path), compiled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+import io
+import random
+import unittest
+
+from Chapter_1 import logic_circuits as lc
+from Chapter_1 import sequential
+
+
+def counter(width):
+    """
+    Returns a register counting up by the input EN each cycle, and the
+    carry out gate, which is 1 when the count wraps around.
+    """
+    enable = lc.InputPin("EN")
+    register = lc.Register("COUNT", width)
+    carry = enable
+    next_bits = []
+    for i, flip_flop in enumerate(register.flip_flops):
+        total = lc.XorGate("SUM{}".format(i))
+        lc.Connector(flip_flop, total)
+        lc.Connector(carry, total)
+        carry_out = lc.AndGate("CARRY{}".format(i))
+        lc.Connector(flip_flop, carry_out)
+        lc.Connector(carry, carry_out)
+        next_bits.append(total)
+        carry = carry_out
+    register.connect_inputs(next_bits)
+    return enable, register, carry
+
+
+class TestFlipFlops(unittest.TestCase):
+    """
+    Tests DFlipFlop, Register and clock() in logic_circuits.
+    """
+    def test_toggle(self):
+        flip_flop = lc.DFlipFlop("Q")
+        inverter = lc.NotGate("NQ")
+        lc.Connector(flip_flop, inverter)
+        lc.Connector(inverter, flip_flop)
+        states = []
+        for _ in range(4):
+            states.append(flip_flop.get_output())
+            lc.clock(flip_flop)
+        self.assertEqual(states, [0, 1, 0, 1])
+        flip_flop.reset()
+        self.assertEqual(flip_flop.get_output(), 0)
+
+    def test_shift_register_sees_old_states(self):
+        first, second = lc.DFlipFlop("A", 1), lc.DFlipFlop("B")
+        lc.Connector(first, second)
+        lc.Connector(second, first)
+        lc.clock(first, second)
+        self.assertEqual((first.state, second.state), (0, 1))
+
+    def test_register_counts(self):
+        enable, register, _ = counter(3)
+        enable.set_value(1)
+        values = []
+        for _ in range(10):
+            values.append(register.get_value())
+            lc.clock(register)
+        self.assertEqual(values, [0, 1, 2, 3, 4, 5, 6, 7, 0, 1])
+        with self.assertRaises(ValueError):
+            lc.Register("R", 2, 4)
+        with self.assertRaises(RuntimeError):
+            lc.DFlipFlop("Q").update()
+
+
+class TestCycleSimulator(unittest.TestCase):
+    """
+    Tests compile_sequential, CycleSimulator and trace files.
+    """
+    def test_compile_sequential(self):
+        _, register, carry = counter(4)
+        circuit = sequential.compile_sequential(carry)
+        self.assertEqual(circuit.inputs, ['EN'])
+        self.assertEqual(sorted(circuit.states),
+                         ['COUNT[{}]'.format(i) for i in range(4)])
+        circuit = sequential.compile_sequential(carry, flip_flops=[register])
+        self.assertEqual(circuit.states,
+                         ['COUNT[{}]'.format(i) for i in range(4)])
+        self.assertEqual(circuit.output_names, ['CARRY3'])
+        self.assertEqual(circuit.gate_count, 8)
+        self.assertEqual(max(circuit.levels()), 4)
+
+    def test_matches_clocked_gates(self):
+        enable, register, carry = counter(4)
+        simulator = sequential.CycleSimulator(
+            sequential.compile_sequential(carry, flip_flops=[register]))
+        rng = random.Random(0)
+        for _ in range(100):
+            value = rng.randint(0, 1)
+            enable.set_value(value)
+            expected = carry.get_output()
+            self.assertEqual(simulator.step({'EN': value}), (expected,))
+            lc.clock(register)
+            self.assertEqual(simulator.state,
+                             [flip_flop.state
+                              for flip_flop in register.flip_flops])
+        self.assertEqual(simulator.cycles, 100)
+
+    def test_run_and_run_constant(self):
+        _, register, carry = counter(8)
+        circuit = sequential.compile_sequential(carry, flip_flops=[register])
+        simulator = sequential.CycleSimulator(circuit)
+        simulator.run_constant(1000, [1])
+        self.assertEqual(simulator.state,
+                         [(1000 % 256 >> i) & 1 for i in range(8)])
+        simulator.run([(1,), (0,), (1,)])
+        self.assertEqual(simulator.cycles, 1003)
+        self.assertEqual(simulator.state,
+                         [(1002 % 256 >> i) & 1 for i in range(8)])
+        simulator.reset()
+        self.assertEqual(simulator.state, [0] * 8)
+        self.assertEqual(simulator.run_constant(255, [1]), (0,))
+        self.assertEqual(simulator.step([1]), (1,))
+        with self.assertRaises(ValueError):
+            simulator.run_constant(1, [])
+
+    def test_no_inputs(self):
+        flip_flop = lc.DFlipFlop("Q")
+        inverter = lc.NotGate("NQ")
+        lc.Connector(flip_flop, inverter)
+        lc.Connector(inverter, flip_flop)
+        simulator = sequential.CycleSimulator(
+            sequential.compile_sequential(inverter), trace=['Q', 'NQ'])
+        simulator.run_constant(5)
+        self.assertEqual(simulator.waveform('Q'), [0, 1, 0, 1, 0])
+        self.assertEqual(simulator.waveform('NQ'), [1, 0, 1, 0, 1])
+
+    def test_unread_flip_flop(self):
+        # Nothing reads the state of the second flip-flop.
+        first, second = lc.DFlipFlop("F1"), lc.DFlipFlop("F2")
+        inverter = lc.NotGate("N")
+        lc.Connector(first, inverter)
+        lc.Connector(inverter, first)
+        lc.Connector(inverter, second)
+        circuit = sequential.compile_sequential(
+            inverter, flip_flops=[first, second])
+        self.assertEqual(circuit.states, ['F1', 'F2'])
+        simulator = sequential.CycleSimulator(circuit, trace=['F2'])
+        simulator.run_constant(4)
+        self.assertEqual(simulator.waveform('F2'), [0, 1, 0, 1])
+        self.assertEqual(simulator.state, [0, 0])
+
+    def test_unconnected_flip_flop(self):
+        flip_flop = lc.DFlipFlop("Q")
+        with self.assertRaises(ValueError):
+            sequential.compile_sequential(flip_flop)
+
+    def test_trace_file(self):
+        _, register, carry = counter(9)
+        circuit = sequential.compile_sequential(carry, flip_flops=[register])
+        names = ['EN', 'CARRY8'] + circuit.states
+        simulator = sequential.CycleSimulator(circuit, trace=names)
+        simulator.run_constant(600, [1])
+        stream = io.BytesIO()
+        self.assertEqual(simulator.write_trace(stream), 600)
+        # Eleven signals take two bytes per cycle.
+        self.assertEqual(len(stream.getvalue()),
+                         14 + len('\n'.join(names)) + 2 * 600)
+        stream.seek(0)
+        read_names, records = sequential.read_trace(stream)
+        self.assertEqual(read_names, names)
+        self.assertEqual(records, simulator.records)
+        self.assertEqual(simulator.waveform('CARRY8').index(1), 511)
+
+        with self.assertRaises(ValueError):
+            sequential.read_trace(io.BytesIO(stream.getvalue()[:-1]))
+
+        # Streamed, in chunks, the same trace is written.
+        streamed = io.BytesIO()
+        original = sequential.TRACE_CHUNK
+        sequential.TRACE_CHUNK = 64
+        try:
+            simulator = sequential.CycleSimulator(circuit, trace=names,
+                                                  stream=streamed)
+            simulator.run_constant(300, [1])
+            self.assertEqual(simulator.records, [])
+            simulator.run_constant(300, [1])
+        finally:
+            sequential.TRACE_CHUNK = original
+        self.assertEqual(streamed.getvalue(), stream.getvalue())
+        self.assertEqual(simulator.cycles, 600)
+        with self.assertRaises(RuntimeError):
+            simulator.waveform('EN')
+        with self.assertRaises(KeyError):
+            sequential.CycleSimulator(circuit, trace=['NOPE'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Reduced ordered binary decision diagrams (ROBDDs) of logic circuits.
+
+A BDD represents a boolean function as a directed acyclic graph. Each inner
+node tests one variable and has a low child, for the variable being 0, and a
+high child, for it being 1; the two terminal nodes are the constants 0 and 1.
+Variables are tested in the same order on every path. The BDD is reduced by
+keeping every node in a unique table, keyed by its variable and children, so
+no two nodes are equal and no node has equal children. For a fixed variable
+order every function then has exactly one node, and two circuits are
+equivalent exactly when their outputs are the same nodes, which is checked
+without enumerating 2**n input vectors.
+
+All operations are built on if-then-else, ITE(f, g, h) = f AND g OR NOT f AND
+h, whose results are memoized in a computed table bounded to CACHE_SIZE
+entries, least recently used first out.
+
+The size of a BDD depends heavily on the variable order. variable_order()
+gives the static depth-first fan-in order, which keeps inputs that meet in
+the same gates close together, and BDD.sift() improves an order by moving
+every variable in turn to the level where the BDD is smallest (Rudell's
+sifting), swapping adjacent levels in place.
+"""
+import collections
+
+from Chapter_1.circuit_compiler import as_compiled
+
+# Maximum number of entries of the computed table.
+CACHE_SIZE = 1 << 18
+
+
+class BDD:
+    """
+    A BDD manager: a shared graph of nodes over a list of variables.
+
+    Nodes are ints; FALSE and TRUE are the terminal nodes 0 and 1. A node
+    always denotes the same function, even after the variables are
+    reordered.
+
+    Variables
+    ---------
+    variables, list of str
+        Variable names, in their initial order.
+    cache_size, int; default = CACHE_SIZE
+        Maximum number of entries of the computed table.
+    """
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, variables, cache_size=CACHE_SIZE):
+        self.variables = list(variables)
+        if len(set(self.variables)) != len(self.variables):
+            raise ValueError('Variable names must be unique.')
+        self._indices = {name: index
+                         for index, name in enumerate(self.variables)}
+        # Level of each variable, and variable at each level.
+        self._levels = list(range(len(self.variables)))
+        self._order = list(range(len(self.variables)))
+        # Variable and children of each node; None for the terminals.
+        self._node_variables = [None, None]
+        self._lows = [None, None]
+        self._highs = [None, None]
+        self._unique = {}
+        self._variable_nodes = [set() for _ in self.variables]
+        self.cache_size = cache_size
+        self._computed = collections.OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self):
+        """Returns the number of inner nodes in the unique table."""
+        return len(self._unique)
+
+    @property
+    def order(self):
+        """The variable names from the top level to the bottom level."""
+        return [self.variables[index] for index in self._order]
+
+    def _level(self, node):
+        if node <= 1:
+            return len(self.variables)
+        return self._levels[self._node_variables[node]]
+
+    def _make(self, variable, low, high):
+        """Returns the node testing variable, from the unique table."""
+        if low == high:
+            return low
+        key = (variable, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self._node_variables)
+            self._node_variables.append(variable)
+            self._lows.append(low)
+            self._highs.append(high)
+            self._unique[key] = node
+            self._variable_nodes[variable].add(node)
+        return node
+
+    def variable(self, name):
+        """
+        Returns the node of a single variable.
+
+        Variables
+        ---------
+        name, str
+        """
+        try:
+            index = self._indices[name]
+        except KeyError:
+            raise KeyError('No variable named {}.'.format(name))
+        return self._make(index, self.FALSE, self.TRUE)
+
+    def ite(self, f, g, h):
+        """
+        Returns the node of (f AND g) OR (NOT f AND h).
+
+        The cofactors are expanded with an explicit stack rather than by
+        recursion, whose depth would be the number of variables.
+
+        Variables
+        ---------
+        f, int
+        g, int
+        h, int
+        """
+        TRUE, FALSE = self.TRUE, self.FALSE
+        # Terminal cases, most calls, are answered before setting up the
+        # stack.
+        if f == TRUE:
+            return g
+        if f == FALSE or g == h:
+            return h
+        if g == TRUE and h == FALSE:
+            return f
+        computed = self._computed
+        variables, levels = self._node_variables, self._levels
+        lows, highs = self._lows, self._highs
+        bottom = len(self.variables)
+        results = []
+        # Each task is an (f, g, h) triple to expand, or a (key, variable)
+        # pair that makes the node of key from the low and high results on
+        # top of the results stack.
+        tasks = [(f, g, h)]
+        while tasks:
+            task = tasks.pop()
+            if len(task) == 2:
+                key, variable = task
+                high = results.pop()
+                result = self._make(variable, results.pop(), high)
+                computed[key] = result
+                if len(computed) > self.cache_size:
+                    computed.popitem(last=False)
+                results.append(result)
+                continue
+            f, g, h = task
+            if f == TRUE:
+                results.append(g)
+            elif f == FALSE or g == h:
+                results.append(h)
+            elif g == TRUE and h == FALSE:
+                results.append(f)
+            elif task in computed:
+                self.cache_hits += 1
+                computed.move_to_end(task)
+                results.append(computed[task])
+            else:
+                self.cache_misses += 1
+                # f is an inner node, and the terminals are below every
+                # level.
+                f_level = levels[variables[f]]
+                g_level = levels[variables[g]] if g > 1 else bottom
+                h_level = levels[variables[h]] if h > 1 else bottom
+                level = min(f_level, g_level, h_level)
+                f_low, f_high = ((lows[f], highs[f]) if f_level == level
+                                 else (f, f))
+                g_low, g_high = ((lows[g], highs[g]) if g_level == level
+                                 else (g, g))
+                h_low, h_high = ((lows[h], highs[h]) if h_level == level
+                                 else (h, h))
+                tasks.append((task, self._order[level]))
+                tasks.append((f_high, g_high, h_high))
+                tasks.append((f_low, g_low, h_low))
+        return results[0]
+
+    def negate(self, f):
+        """Returns the node of NOT f."""
+        return self.ite(f, self.FALSE, self.TRUE)
+
+    def conjoin(self, f, g):
+        """Returns the node of f AND g."""
+        return self.ite(f, g, self.FALSE)
+
+    def disjoin(self, f, g):
+        """Returns the node of f OR g."""
+        return self.ite(f, self.TRUE, g)
+
+    def exclusive_or(self, f, g):
+        """Returns the node of f XOR g."""
+        return self.ite(f, self.negate(g), g)
+
+    def build(self, circuit):
+        """
+        Returns the nodes of the outputs of a compiled circuit, whose inputs
+        must all be variables of the BDD.
+
+        Variables
+        ---------
+        circuit, CompiledCircuit
+        """
+        nodes = [self.variable(name) for name in circuit.inputs]
+        folds = {'AND': self.conjoin, 'NAND': self.conjoin,
+                 'OR': self.disjoin, 'NOR': self.disjoin,
+                 'XOR': self.exclusive_or, 'XNOR': self.exclusive_or}
+        for operation, operands in circuit.instructions:
+            if operation == 'CONST0':
+                node = self.FALSE
+            elif operation == 'CONST1':
+                node = self.TRUE
+            elif operation == 'BUF':
+                node = nodes[operands[0]]
+            elif operation == 'NOT':
+                node = self.negate(nodes[operands[0]])
+            elif operation in folds:
+                fold = folds[operation]
+                node = nodes[operands[0]]
+                for operand in operands[1:]:
+                    node = fold(node, nodes[operand])
+                if operation in ('NAND', 'NOR', 'XNOR'):
+                    node = self.negate(node)
+            else:
+                raise ValueError('Unknown gate operation {}.'.format(
+                    operation))
+            nodes.append(node)
+        return [nodes[slot] for slot in circuit.outputs]
+
+    def evaluate(self, node, values):
+        """
+        Returns the value, 0 or 1, of the function of node for one
+        assignment.
+
+        Variables
+        ---------
+        node, int
+        values, dict
+            Value of every variable the function depends on, by name.
+        """
+        while node > 1:
+            name = self.variables[self._node_variables[node]]
+            node = self._highs[node] if values[name] else self._lows[node]
+        return node
+
+    def satisfy_count(self, node):
+        """
+        Returns the number of assignments of all the variables of the BDD
+        for which the function of node is 1.
+
+        Variables
+        ---------
+        node, int
+        """
+        # Satisfying assignments of the variables from the level of each
+        # node down.
+        counts = {self.FALSE: 0, self.TRUE: 1}
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current in counts:
+                stack.pop()
+                continue
+            low, high = self._lows[current], self._highs[current]
+            pending = [child for child in (low, high) if child not in counts]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            level = self._level(current)
+            counts[current] = (
+                counts[low] << (self._level(low) - level - 1)) + (
+                counts[high] << (self._level(high) - level - 1))
+        return counts[node] << self._level(node)
+
+    def any_sat(self, node):
+        """
+        Returns an assignment of all the variables, as a dict of 0s and 1s by
+        name, for which the function of node is 1, or None if there is none.
+        Variables the function does not depend on are 0.
+
+        Variables
+        ---------
+        node, int
+        """
+        if node == self.FALSE:
+            return None
+        assignment = dict.fromkeys(self.variables, 0)
+        # Every inner node of a reduced BDD has a path to TRUE.
+        while node > 1:
+            name = self.variables[self._node_variables[node]]
+            if self._lows[node] != self.FALSE:
+                node = self._lows[node]
+            else:
+                assignment[name] = 1
+                node = self._highs[node]
+        return assignment
+
+    def _reachable(self, roots):
+        """Returns the set of inner nodes reachable from the roots."""
+        seen = set()
+        stack = [root for root in roots if root > 1]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            for child in (self._lows[node], self._highs[node]):
+                if child > 1 and child not in seen:
+                    stack.append(child)
+        return seen
+
+    def node_count(self, roots):
+        """
+        Returns the number of inner nodes reachable from the roots.
+
+        Variables
+        ---------
+        roots, iterable of int
+        """
+        return len(self._reachable(roots))
+
+    def collect_garbage(self, roots):
+        """
+        Removes every node that is not reachable from the roots, and returns
+        the number of nodes that remain. Removed nodes must no longer be
+        used.
+
+        Variables
+        ---------
+        roots, iterable of int
+        """
+        live = self._reachable(roots)
+        for variable, nodes in enumerate(self._variable_nodes):
+            dead = nodes - live
+            for node in dead:
+                del self._unique[variable, self._lows[node],
+                                 self._highs[node]]
+                self._node_variables[node] = None
+            nodes -= dead
+        self._computed.clear()
+        return len(live)
+
+    def swap(self, level):
+        """
+        Swaps the variables at level and level + 1 in place. Every node keeps
+        denoting the same function.
+
+        Variables
+        ---------
+        level, int
+        """
+        if not 0 <= level < len(self.variables) - 1:
+            raise ValueError('No level below level {}.'.format(level))
+        upper, lower = self._order[level], self._order[level + 1]
+        self._order[level], self._order[level + 1] = lower, upper
+        self._levels[upper], self._levels[lower] = level + 1, level
+
+        variables = self._node_variables
+        lows, highs = self._lows, self._highs
+        for node in list(self._variable_nodes[upper]):
+            low, high = lows[node], highs[node]
+            low_tests_lower = low > 1 and variables[low] == lower
+            high_tests_lower = high > 1 and variables[high] == lower
+            if not (low_tests_lower or high_tests_lower):
+                # The node does not depend on the lower variable, and simply
+                # moves down a level.
+                continue
+            low_low, low_high = ((lows[low], highs[low]) if low_tests_lower
+                                 else (low, low))
+            high_low, high_high = ((lows[high], highs[high])
+                                   if high_tests_lower else (high, high))
+            # Rewrite the node to test the lower variable first.
+            new_low = self._make(upper, low_low, high_low)
+            new_high = self._make(upper, low_high, high_high)
+            del self._unique[upper, low, high]
+            self._variable_nodes[upper].discard(node)
+            variables[node] = lower
+            lows[node], highs[node] = new_low, new_high
+            self._unique[lower, new_low, new_high] = node
+            self._variable_nodes[lower].add(node)
+
+    def sift(self, roots):
+        """
+        Reorders the variables with Rudell's sifting to reduce the number of
+        nodes reachable from the roots, and returns that number.
+
+        Each variable, most frequent first, is swapped down to the bottom
+        level and up to the top level, and then back to the level where the
+        BDD was smallest. Garbage is collected after every swap, so only the
+        roots and the nodes below them remain valid.
+
+        Variables
+        ---------
+        roots, iterable of int
+        """
+        roots = list(roots)
+        bottom = len(self.variables) - 1
+        size = self.collect_garbage(roots)
+        by_frequency = sorted(range(len(self.variables)),
+                              key=lambda index: -len(
+                                  self._variable_nodes[index]))
+        for index in by_frequency:
+            level = best_level = self._levels[index]
+            best_size = size
+            while level < bottom:
+                self.swap(level)
+                level += 1
+                size = self.collect_garbage(roots)
+                if size < best_size:
+                    best_size, best_level = size, level
+            while level > 0:
+                self.swap(level - 1)
+                level -= 1
+                size = self.collect_garbage(roots)
+                if size < best_size:
+                    best_size, best_level = size, level
+            while level < best_level:
+                self.swap(level)
+                level += 1
+            size = self.collect_garbage(roots)
+        return size
+
+
+def variable_order(circuit):
+    """
+    Returns the names of the inputs of a compiled circuit in depth-first
+    fan-in order: the order in which a depth-first search from the outputs,
+    first operands first, reaches them.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    """
+    number_of_inputs = len(circuit.inputs)
+    order = []
+    seen = set()
+    stack = list(reversed(circuit.outputs))
+    while stack:
+        slot = stack.pop()
+        if slot in seen:
+            continue
+        seen.add(slot)
+        if slot < number_of_inputs:
+            order.append(circuit.inputs[slot])
+        else:
+            stack.extend(reversed(
+                circuit.instructions[slot - number_of_inputs][1]))
+    # Inputs that reach no output go last.
+    order.extend(name for slot, name in enumerate(circuit.inputs)
+                 if slot not in seen)
+    return order
+
+
+def circuit_bdd(circuit, order=None, sift=False):
+    """
+    Returns a BDD manager and the nodes of the outputs of a circuit.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit, LogicGate or sequence of LogicGate
+    order, list of str; default = None
+        Variable order; the depth-first fan-in order by default.
+    sift, bool; default = False
+        If True, reorder the variables by sifting after building the BDD.
+    """
+    circuit = as_compiled(circuit)
+    manager = BDD(order if order is not None else variable_order(circuit))
+    roots = manager.build(circuit)
+    if sift:
+        manager.sift(roots)
+    return manager, roots
+
+
+def equivalent(first, second):
+    """
+    Returns whether two circuits compute the same outputs, matched by
+    position, for all input vectors. Inputs are matched by name; an input of
+    only one of the circuits is a variable the other does not depend on.
+
+    Variables
+    ---------
+    first, CompiledCircuit, LogicGate or sequence of LogicGate
+    second, CompiledCircuit, LogicGate or sequence of LogicGate
+    """
+    first, second = as_compiled(first), as_compiled(second)
+    if len(first.outputs) != len(second.outputs):
+        return False
+    order = variable_order(first)
+    names = set(order)
+    order.extend(name for name in variable_order(second)
+                 if name not in names)
+    manager = BDD(order)
+    return manager.build(first) == manager.build(second)
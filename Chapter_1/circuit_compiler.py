@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Compiles a network of logic gates from logic_circuits into a flat list of
+instructions, and the instructions into a single generated Python function.
+
+LogicGate.get_output() evaluates a circuit by recursing through the
+Connectors on every call, so a gate whose output feeds several other gates is
+evaluated once per path to it. The compiled circuit is topologically sorted
+instead: each gate is evaluated exactly once per input vector, by one line of
+straight-line code.
+
+Every gate is compiled to a bitwise expression: AND is &, OR is |, XOR is ^,
+and NOT is an exclusive or with a mask of ones, as are the inverted NAND, NOR
+and XNOR gates. All but NOT and BUF take any number of operands, and CONST0
+and CONST1 take none. With a mask of 1, the compiled function
+evaluates a single input vector of 0s and 1s. With wider words, bit k of
+every word belongs to input vector k, so one call evaluates as many vectors
+as the words have bits: Python ints of any width, or NumPy uint64 arrays of
+64 vectors per element.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from Chapter_1 import logic_circuits as lc
+
+# Python expression for each gate operation, given the names of the operand
+# variables; `mask` is a variable holding a word of ones.
+EXPRESSIONS = {
+    'AND': lambda operands: ' & '.join(operands),
+    'OR': lambda operands: ' | '.join(operands),
+    'NOT': lambda operands: 'mask ^ {}'.format(operands[0]),
+    'NAND': lambda operands: 'mask ^ ({})'.format(' & '.join(operands)),
+    'NOR': lambda operands: 'mask ^ ({})'.format(' | '.join(operands)),
+    'XOR': lambda operands: ' ^ '.join(operands),
+    'XNOR': lambda operands: 'mask ^ {}'.format(' ^ '.join(operands)),
+    'BUF': lambda operands: operands[0],
+    'CONST0': lambda operands: 'mask & 0',
+    'CONST1': lambda operands: 'mask',
+}
+
+# Output of each gate operation for a list of operand bits.
+BIT_FUNCTIONS = {
+    'AND': lambda bits: int(all(bits)),
+    'OR': lambda bits: int(any(bits)),
+    'NOT': lambda bits: 1 - bits[0],
+    'NAND': lambda bits: 1 - all(bits),
+    'NOR': lambda bits: 1 - any(bits),
+    'XOR': lambda bits: sum(bits) & 1,
+    'XNOR': lambda bits: 1 - (sum(bits) & 1),
+    'BUF': lambda bits: bits[0],
+    'CONST0': lambda bits: 0,
+    'CONST1': lambda bits: 1,
+}
+
+# Number of operands taken by each gate operation; None for any number.
+ARITIES = {
+    'AND': None, 'OR': None, 'NAND': None, 'NOR': None, 'XOR': None,
+    'XNOR': None, 'NOT': 1, 'BUF': 1, 'CONST0': 0, 'CONST1': 0,
+}
+
+
+def exhaustive_words(number_of_inputs, start=0, count=None):
+    """
+    Returns one Python int word per input that together enumerate the input
+    vectors start to start + count - 1; in vector v, input i is bit i of v.
+    Bit k of each word belongs to vector start + k.
+
+    count must be a power of two and start a multiple of count. By default
+    all 2**number_of_inputs vectors are enumerated.
+
+    Variables
+    ---------
+    number_of_inputs, int
+    start, int; default = 0
+    count, int; default = None
+    """
+    if count is None:
+        count = 1 << number_of_inputs
+    if count & (count - 1) or start % count:
+        raise ValueError('count must be a power of two and start a '
+                         'multiple of count.')
+    all_ones = (1 << count) - 1
+    words = []
+    for i in range(number_of_inputs):
+        run = 1 << i
+        if run >= count:
+            # Input i is constant across the whole block of vectors.
+            words.append(all_ones if (start >> i) & 1 else 0)
+        else:
+            # Runs of `run` zeros then `run` ones, repeated over count bits.
+            period = run << 1
+            pattern = ((1 << run) - 1) << run
+            words.append(pattern * (all_ones // ((1 << period) - 1)))
+    return words
+
+
+def random_words(number_of_inputs, count, rng):
+    """
+    Returns one random Python int word of `count` bits per input.
+
+    Variables
+    ---------
+    number_of_inputs, int
+    count, int
+    rng, random.Random instance
+    """
+    return [rng.getrandbits(count) for _ in range(number_of_inputs)]
+
+
+class CompiledCircuit:
+    """
+    A combinational circuit as a flat instruction list.
+
+    Slots 0 to len(inputs) - 1 hold the primary inputs, and instruction i
+    writes slot len(inputs) + i. Each instruction is a pair of the gate
+    operation and a tuple of operand slots, and only refers to earlier slots.
+
+    Variables
+    ---------
+    inputs, list of str
+        Names of the primary inputs.
+    instructions, list of (str, tuple of int)
+    outputs, list of int
+        Slots of the circuit outputs.
+    output_names, list of str
+    """
+    def __init__(self, inputs, instructions, outputs, output_names):
+        self.inputs = list(inputs)
+        self.instructions = list(instructions)
+        self.outputs = list(outputs)
+        self.output_names = list(output_names)
+        self._function = None
+
+    def __getstate__(self):
+        # The generated function can not be pickled; it is generated again
+        # on first use after unpickling.
+        state = self.__dict__.copy()
+        state['_function'] = None
+        return state
+
+    @property
+    def gate_count(self):
+        return len(self.instructions)
+
+    def source(self):
+        """Returns the source code of the generated function."""
+        number_of_inputs = len(self.inputs)
+        lines = ['def circuit(values, mask):']
+        if number_of_inputs:
+            lines.append('    {}, = values'.format(
+                ', '.join('s{}'.format(slot)
+                          for slot in range(number_of_inputs))))
+        for slot, (operation, operands) in enumerate(self.instructions,
+                                                     number_of_inputs):
+            try:
+                expression = EXPRESSIONS[operation]
+            except KeyError:
+                raise ValueError('Unknown gate operation {}.'.format(
+                    operation))
+            lines.append('    s{} = {}'.format(slot, expression(
+                ['s{}'.format(operand) for operand in operands])))
+        lines.append('    return ({})'.format(
+            ''.join('s{}, '.format(slot) for slot in self.outputs)))
+        return '\n'.join(lines)
+
+    @property
+    def function(self):
+        """
+        The generated function, circuit(values, mask); it is generated on
+        first use, so circuits that are only loaded, written or transformed
+        never pay for it.
+        """
+        if self._function is None:
+            namespace = {}
+            exec(compile(self.source(), '<compiled circuit>', 'exec'),
+                 namespace)
+            self._function = namespace['circuit']
+        return self._function
+
+    def _input_values(self, values):
+        """Returns values, a mapping or a sequence, in input order."""
+        if isinstance(values, dict):
+            try:
+                return [values[name] for name in self.inputs]
+            except KeyError as error:
+                raise KeyError('No value for input {}.'.format(error))
+        if len(values) != len(self.inputs):
+            raise ValueError('Expected {} input values, got {}.'.format(
+                len(self.inputs), len(values)))
+        return values
+
+    def evaluate(self, values):
+        """
+        Returns the outputs, as a tuple of 0s and 1s, for one input vector.
+
+        Variables
+        ---------
+        values, dict or sequence of int
+            Input values, either by input name or in the order of inputs.
+        """
+        return self.function(self._input_values(values), 1)
+
+    def simulate(self, words, width=None):
+        """
+        Evaluates many input vectors at once, bit-parallel, and returns one
+        word per output.
+
+        Bit k of each word holds the value of that input, or output, in
+        vector k.
+
+        Variables
+        ---------
+        words, dict or sequence of int or numpy.ndarray
+            One word per input, by input name or in the order of inputs;
+            Python ints, or NumPy uint64 arrays.
+        width, int; default = None
+            Number of vectors held by Python int words. Required unless the
+            words are NumPy arrays.
+        """
+        values = self._input_values(words)
+        if width is not None:
+            mask = (1 << width) - 1
+        elif np is not None and any(isinstance(value, np.ndarray)
+                                    for value in values):
+            mask = np.uint64(0xFFFFFFFFFFFFFFFF)
+        else:
+            raise ValueError('width is required for Python int words.')
+        return self.function(values, mask)
+
+    def truth_table_words(self):
+        """
+        Returns one word of 2**len(inputs) bits per output; bit v is the
+        output for the input vector v, where input i is bit i of v.
+        """
+        number_of_inputs = len(self.inputs)
+        return self.simulate(exhaustive_words(number_of_inputs),
+                             width=1 << number_of_inputs)
+
+    def to_gates(self):
+        """
+        Rebuilds the circuit from logic_circuits gates and returns its output
+        gates, one per output.
+
+        Every input becomes an InputPin named after it, gates of more than two
+        operands become chains of two-input gates, and CONST0 and CONST1
+        become ConstantGates, which compile back to the same instructions.
+        The output gates are named after the outputs.
+        """
+        binary_classes = {'AND': lc.AndGate, 'OR': lc.OrGate,
+                          'XOR': lc.XorGate}
+        # Operation of a chain, and whether its last gate is inverted.
+        chains = {'AND': ('AND', False), 'OR': ('OR', False),
+                  'XOR': ('XOR', False), 'NAND': ('AND', True),
+                  'NOR': ('OR', True), 'XNOR': ('XOR', True)}
+        inverted_classes = {'AND': lc.NandGate, 'OR': lc.NorGate}
+
+        output_labels = {}
+        for name, slot in zip(self.output_names, self.outputs):
+            output_labels.setdefault(slot, name)
+        gates = [lc.InputPin(name) for name in self.inputs]
+        for slot, (operation, operands) in enumerate(self.instructions,
+                                                     len(self.inputs)):
+            if operation not in ARITIES:
+                raise ValueError('Unknown gate operation {}.'.format(
+                    operation))
+            arity = ARITIES[operation]
+            if (arity is None and not operands
+                    or arity is not None and len(operands) != arity):
+                raise ValueError('Wrong number of inputs for {} at slot '
+                                 '{}.'.format(operation, slot))
+            label = output_labels.get(slot, 'n{}'.format(slot))
+            sources = [gates[operand] for operand in operands]
+            if operation in ('CONST0', 'CONST1'):
+                gate = lc.ConstantGate(label, int(operation == 'CONST1'))
+            elif operation == 'BUF':
+                gate = sources[0]
+            elif operation == 'NOT' or len(sources) == 1:
+                gate = sources[0]
+                if operation in ('NOT', 'NAND', 'NOR', 'XNOR'):
+                    gate = lc.NotGate(label)
+                    lc.Connector(sources[0], gate)
+            else:
+                chain_operation, inverted = chains[operation]
+                gate = sources[0]
+                for index, source in enumerate(sources[1:], 1):
+                    gate_class = binary_classes[chain_operation]
+                    gate_label = '{}.{}'.format(label, index)
+                    if index == len(sources) - 1:
+                        if inverted and chain_operation in inverted_classes:
+                            gate_class = inverted_classes[chain_operation]
+                            inverted = False
+                        if not inverted:
+                            gate_label = label
+                    next_gate = gate_class(gate_label)
+                    lc.Connector(gate, next_gate)
+                    lc.Connector(source, next_gate)
+                    gate = next_gate
+                if inverted:
+                    inverter = lc.NotGate(label)
+                    lc.Connector(gate, inverter)
+                    gate = inverter
+            gates.append(gate)
+        return [gates[slot] for slot in self.outputs]
+
+
+class CircuitCompiler:
+    """
+    Walks the Connector graph upstream of one or more output gates once and
+    compiles it into a CompiledCircuit.
+
+    Every InputPin becomes a primary input named by its label, and every
+    unconnected pin becomes a primary input named after its gate and pin,
+    e.g. "G1.pin_a". ConstantGates become CONST0 and CONST1 instructions,
+    not inputs. The circuit is cut at DFlipFlops: each becomes an
+    input named by its label, holding its state, and the logic feeding its
+    D input is not compiled; see sequential.compile_sequential().
+    """
+    def __init__(self, *output_gates, inputs=()):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        output_gates, LogicGate instances
+        inputs, sequence of InputPin or DFlipFlop; default = ()
+            Gates that become primary inputs even if no output depends on
+            them, in this order, ahead of the inputs that are found.
+        """
+        if not output_gates:
+            raise ValueError('At least one output gate is required.')
+        self.output_gates = output_gates
+        self.inputs = tuple(inputs)
+
+    def topological_order(self):
+        """
+        Returns the gates upstream of the output gates, each gate after all
+        the gates that feed it. The search stops at DFlipFlops. Raises
+        ValueError if the gates form a loop.
+        """
+        order = []
+        state = {}  # id(gate) -> False while visiting, True once ordered.
+        for root in self.inputs + tuple(self.output_gates):
+            stack = [(root, False)]
+            while stack:
+                gate, expanded = stack.pop()
+                key = id(gate)
+                if expanded:
+                    state[key] = True
+                    order.append(gate)
+                    continue
+                if key in state:
+                    if not state[key]:
+                        raise ValueError('The circuit contains a loop '
+                                         'through {}.'.format(
+                                             gate.get_label()))
+                    continue
+                state[key] = False
+                stack.append((gate, True))
+                if getattr(gate, 'operation', None) == 'DFF':
+                    # A flip-flop's output does not depend on its input.
+                    continue
+                for connector in reversed(gate.get_pins()):
+                    if connector is not None:
+                        stack.append((connector.get_from(), False))
+        return order
+
+    def compile(self):
+        """Returns the CompiledCircuit of the output gates."""
+        order = self.topological_order()
+
+        # Primary inputs: InputPins, DFlipFlops and unconnected pins, keyed
+        # by (id(gate), pin name), where the pin name of a gate is None.
+        inputs = []
+        gates = []
+        for gate in order:
+            if not hasattr(gate, 'operation'):
+                raise TypeError('Can not compile gate {} of type {}.'.format(
+                    gate.get_label(), type(gate).__name__))
+            if gate.operation in ('INPUT', 'DFF'):
+                inputs.append(((id(gate), None), gate.get_label()))
+                continue
+            gates.append(gate)
+            for name, connector in zip(gate.pin_names, gate.get_pins()):
+                if connector is None:
+                    inputs.append(((id(gate), name),
+                                   '{}.{}'.format(gate.get_label(), name)))
+
+        input_names = [name for _, name in inputs]
+        if len(set(input_names)) != len(input_names):
+            raise ValueError('Input names must be unique.')
+        input_slots = {key: slot for slot, (key, _) in enumerate(inputs)}
+        # Slot holding the output of each gate, including InputPins.
+        source_slots = {key: slot for (key, name), slot in input_slots.items()
+                        if name is None}
+        source_slots.update((id(gate), slot)
+                            for slot, gate in enumerate(gates, len(inputs)))
+
+        instructions = []
+        for gate in gates:
+            operands = tuple(
+                input_slots[id(gate), name] if connector is None
+                else source_slots[id(connector.get_from())]
+                for name, connector in zip(gate.pin_names, gate.get_pins()))
+            instructions.append((gate.operation, operands))
+
+        return CompiledCircuit(
+            input_names, instructions,
+            [source_slots[id(gate)] for gate in self.output_gates],
+            [gate.get_label() for gate in self.output_gates])
+
+
+def as_compiled(circuit):
+    """
+    Returns a CompiledCircuit given one, a single output gate or a sequence
+    of output gates.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit, LogicGate or sequence of LogicGate
+    """
+    if isinstance(circuit, CompiledCircuit):
+        return circuit
+    if hasattr(circuit, 'get_output'):
+        return CircuitCompiler(circuit).compile()
+    return CircuitCompiler(*circuit).compile()
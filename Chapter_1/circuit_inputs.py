@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Drives logic circuits programmatically: binds values to the InputPins of a
+gate network, reads input vectors from CSV files, runs a compiled circuit
+over a stream of input vectors, and streams the rows of a truth table.
+
+Everything is lazy, so vectors and truth table rows are produced one at a
+time and never held in memory all at once.
+"""
+import csv
+
+from Chapter_1.circuit_compiler import CircuitCompiler, exhaustive_words
+
+# Number of truth table rows evaluated together, bit-parallel.
+BLOCK_SIZE = 4096
+
+
+def input_pins(*output_gates):
+    """
+    Returns the InputPins upstream of the output gates, by label.
+
+    Variables
+    ---------
+    output_gates, LogicGate instances
+    """
+    return {gate.get_label(): gate
+            for gate in CircuitCompiler(*output_gates).topological_order()
+            if getattr(gate, 'operation', None) == 'INPUT'}
+
+
+def bind_inputs(pins, values):
+    """
+    Sets the values of InputPins, after which LogicGate.get_output() runs
+    without prompting.
+
+    Variables
+    ---------
+    pins, dict
+        InputPins by label, as returned by input_pins().
+    values, dict
+        Values by input label; every pin must be given a value.
+    """
+    missing = set(pins) - set(values)
+    if missing:
+        raise KeyError('No value for inputs {}.'.format(sorted(missing)))
+    unknown = set(values) - set(pins)
+    if unknown:
+        raise KeyError('No inputs named {}.'.format(sorted(unknown)))
+    for label, pin in pins.items():
+        pin.set_value(values[label])
+
+
+def vectors_from_csv(source):
+    """
+    Yields input vectors, as dicts of ints by input name, from a CSV file
+    whose header row holds the input names.
+
+    Variables
+    ---------
+    source, str or file object
+        Path of the CSV file, or an open text file.
+    """
+    if isinstance(source, str):
+        with open(source, newline='') as csv_file:
+            yield from vectors_from_csv(csv_file)
+        return
+    for row in csv.DictReader(source):
+        yield {name: int(value) for name, value in row.items()}
+
+
+def drive(circuit, vectors):
+    """
+    Yields the outputs of a compiled circuit for each input vector.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    vectors, iterable of dict or sequence of int
+        Input values by input name or in the order of circuit.inputs, e.g.
+        from vectors_from_csv().
+    """
+    for vector in vectors:
+        yield circuit.evaluate(vector)
+
+
+def truth_table(circuit, block_size=BLOCK_SIZE):
+    """
+    Yields the rows of the truth table of a compiled circuit as pairs of
+    input and output tuples, in the conventional order: the first input
+    changes slowest and the last input fastest.
+
+    Rows are evaluated bit-parallel in blocks of block_size, but yielded one
+    at a time, so tables for circuits with many inputs are never held in
+    memory.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    block_size, int; default = BLOCK_SIZE
+        A power of two.
+    """
+    number_of_inputs = len(circuit.inputs)
+    rows = 1 << number_of_inputs
+    block_size = min(block_size, rows)
+    row_format = '0{}b'.format(number_of_inputs)
+    for start in range(0, rows, block_size):
+        # The first input is the most significant bit of the row number.
+        words = exhaustive_words(number_of_inputs, start, block_size)[::-1]
+        columns = [format(word, '0{}b'.format(block_size))[::-1]
+                   for word in circuit.simulate(words, width=block_size)]
+        for offset in range(block_size):
+            row = start + offset
+            inputs = tuple(map(int, format(row, row_format)
+                               if number_of_inputs else ''))
+            yield inputs, tuple(int(column[offset]) for column in columns)
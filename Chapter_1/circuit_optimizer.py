@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Optimization passes that shrink a compiled logic circuit without changing the
+function it computes.
+
+Each pass reads a CompiledCircuit and builds a new one:
+
+fold_constants
+    Propagates constant gates, and inputs fixed to a constant, through the
+    circuit, and simplifies gates with repeated operands: x AND 1 is x,
+    x OR 1 is 1, x AND x is x, x XOR x is 0, and so on. Buffers are removed.
+remove_double_negations
+    Replaces NOT(NOT(x)) with x.
+merge_common_subexpressions
+    Hash-conses gates on their operation and operands, so structurally
+    identical gates are built only once.
+eliminate_dead_gates
+    Drops the gates that do not reach any output.
+
+CircuitOptimizer runs the passes until the circuit stops shrinking, and
+records the gate count after every pass. A circuit built from LogicGates is
+optimized by compiling it with CircuitCompiler, and the optimized circuit
+turned back into LogicGates with CompiledCircuit.to_gates().
+"""
+import collections
+
+from Chapter_1.circuit_compiler import CompiledCircuit
+
+# Gate count of a circuit before and after one optimization pass.
+PassResult = collections.namedtuple('PassResult',
+                                    ['name', 'gates_before', 'gates_after'])
+
+# Base operation of each gate operation, and whether its output is inverted.
+_BASES = {'AND': ('AND', 0), 'NAND': ('AND', 1), 'OR': ('OR', 0),
+          'NOR': ('OR', 1), 'XOR': ('XOR', 0), 'XNOR': ('XOR', 1)}
+_OPERATIONS = {base: operation for operation, base in _BASES.items()}
+
+
+class _CircuitBuilder:
+    """
+    Accumulates the instructions of a new circuit over the inputs of an old
+    one. Constant gates are created once each, and, if hash_cons is True,
+    so is every other gate.
+    """
+    def __init__(self, inputs, hash_cons=False):
+        self.inputs = list(inputs)
+        self.instructions = []
+        self.hash_cons = hash_cons
+        self._table = {}
+        self._constants = {}  # Slot -> value of every constant gate.
+
+    def emit(self, operation, operands):
+        """Returns the slot of a gate, adding the gate if necessary."""
+        if operation in ('CONST0', 'CONST1'):
+            return self.constant(int(operation == 'CONST1'))
+        key = (operation, operands)
+        if self.hash_cons and key in self._table:
+            return self._table[key]
+        slot = len(self.inputs) + len(self.instructions)
+        self.instructions.append(key)
+        self._table[key] = slot
+        return slot
+
+    def constant(self, value):
+        """Returns the slot of the constant gate for value."""
+        key = ('CONST1' if value else 'CONST0', ())
+        if key not in self._table:
+            self._constants[len(self.inputs) + len(self.instructions)] = value
+            self._table[key] = len(self.inputs) + len(self.instructions)
+            self.instructions.append(key)
+        return self._table[key]
+
+    def constant_value(self, slot):
+        """Returns the value of slot if it is a constant, otherwise None."""
+        return self._constants.get(slot)
+
+    def instruction(self, slot):
+        """Returns the instruction writing slot, or None for an input."""
+        if slot < len(self.inputs):
+            return None
+        return self.instructions[slot - len(self.inputs)]
+
+    def build(self, outputs, output_names):
+        return CompiledCircuit(self.inputs, self.instructions, outputs,
+                               output_names)
+
+
+def _rewrite(circuit, rewrite, hash_cons=False, slots=None):
+    """
+    Returns a copy of circuit in which every gate is replaced by
+    rewrite(builder, operation, operands); rewrite returns the new slot of
+    the gate, either an existing slot or one added with builder.emit().
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    rewrite, function
+        Operands are passed as a tuple of slots of the new circuit.
+    hash_cons, bool; default = False
+    slots, function; default = None
+        Given the builder, returns the new slots of the inputs.
+    """
+    builder = _CircuitBuilder(circuit.inputs, hash_cons)
+    new_slots = (list(range(len(circuit.inputs))) if slots is None
+                 else slots(builder))
+    for operation, operands in circuit.instructions:
+        new_slots.append(rewrite(
+            builder, operation,
+            tuple([new_slots[operand] for operand in operands])))
+    return builder.build([new_slots[slot] for slot in circuit.outputs],
+                         circuit.output_names)
+
+
+def _fold(builder, operation, operands):
+    """Constant folding and simplification of a single gate."""
+    if operation in ('CONST0', 'CONST1'):
+        return builder.constant(int(operation == 'CONST1'))
+    if operation == 'BUF':
+        return operands[0]
+    values = [builder.constant_value(operand) for operand in operands]
+    if operation == 'NOT':
+        if values[0] is not None:
+            return builder.constant(1 - values[0])
+        return builder.emit('NOT', operands)
+
+    base, inverted = _BASES[operation]
+    if base == 'XOR':
+        # Constants flip the output, and pairs of equal operands cancel.
+        counts = collections.Counter()
+        for operand, value in zip(operands, values):
+            if value is None:
+                counts[operand] += 1
+            else:
+                inverted ^= value
+        remaining = tuple(operand for operand, count in counts.items()
+                          if count % 2)
+    else:
+        # An AND is 0 if any operand is 0; 1s can be dropped, as can
+        # repeated operands. Likewise for OR, with 0 and 1 swapped.
+        absorbing = 0 if base == 'AND' else 1
+        if absorbing in values:
+            return builder.constant(absorbing ^ inverted)
+        remaining = tuple(dict.fromkeys(
+            operand for operand, value in zip(operands, values)
+            if value is None))
+
+    if not remaining:
+        # The empty AND is 1, the empty OR and XOR are 0.
+        return builder.constant(int(base == 'AND') ^ inverted)
+    if len(remaining) == 1:
+        if inverted:
+            return builder.emit('NOT', remaining)
+        return remaining[0]
+    return builder.emit(_OPERATIONS[base, inverted], remaining)
+
+
+def fold_constants(circuit, constants=None):
+    """
+    Returns circuit with constants propagated and trivial gates simplified.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    constants, dict; default = None
+        Values, 0 or 1, of inputs that are fixed; the inputs remain inputs
+        of the circuit, but are no longer used.
+    """
+    constants = constants or {}
+    unknown = set(constants) - set(circuit.inputs)
+    if unknown:
+        raise KeyError('No inputs named {}.'.format(sorted(unknown)))
+
+    def slots(builder):
+        return [builder.constant(constants[name]) if name in constants
+                else slot for slot, name in enumerate(circuit.inputs)]
+
+    return _rewrite(circuit, _fold, slots=slots)
+
+
+def remove_double_negations(circuit):
+    """
+    Returns circuit with every NOT(NOT(x)) replaced by x.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    """
+    def rewrite(builder, operation, operands):
+        if operation == 'NOT':
+            source = builder.instruction(operands[0])
+            if source is not None and source[0] == 'NOT':
+                return source[1][0]
+        return builder.emit(operation, operands)
+
+    return _rewrite(circuit, rewrite)
+
+
+def merge_common_subexpressions(circuit):
+    """
+    Returns circuit with structurally identical gates merged: gates with the
+    same operation and the same operands, in any order, are built once.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    """
+    def rewrite(builder, operation, operands):
+        # Every gate of several operands is commutative.
+        return builder.emit(operation, tuple(sorted(operands)))
+
+    return _rewrite(circuit, rewrite, hash_cons=True)
+
+
+def eliminate_dead_gates(circuit):
+    """
+    Returns circuit without the gates that do not reach any output.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    """
+    number_of_inputs = len(circuit.inputs)
+    live = [False] * (number_of_inputs + len(circuit.instructions))
+    for slot in circuit.outputs:
+        live[slot] = True
+    for slot in range(len(live) - 1, number_of_inputs - 1, -1):
+        if live[slot]:
+            for operand in circuit.instructions[slot - number_of_inputs][1]:
+                live[operand] = True
+
+    new_slots = list(range(number_of_inputs)) + [None] * len(
+        circuit.instructions)
+    instructions = []
+    for slot, (operation, operands) in enumerate(circuit.instructions,
+                                                 number_of_inputs):
+        if live[slot]:
+            new_slots[slot] = number_of_inputs + len(instructions)
+            instructions.append((operation, tuple(
+                [new_slots[operand] for operand in operands])))
+    return CompiledCircuit(circuit.inputs, instructions,
+                           [new_slots[slot] for slot in circuit.outputs],
+                           circuit.output_names)
+
+
+class CircuitOptimizer:
+    """
+    Runs the optimization passes over a compiled circuit until it stops
+    shrinking, and reports the gate count after every pass.
+    """
+    def __init__(self, circuit, constants=None, max_rounds=10):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        circuit, CompiledCircuit
+        constants, dict; default = None
+            Values of inputs that are fixed, by input name.
+        max_rounds, int; default = 10
+            Maximum number of times the passes are repeated.
+        """
+        self.circuit = circuit
+        self.constants = constants
+        self.max_rounds = max_rounds
+        self.history = []
+
+    def passes(self):
+        """Returns the passes of one round, as (name, function) pairs."""
+        return [
+            ('fold_constants',
+             lambda circuit: fold_constants(circuit, self.constants)),
+            ('remove_double_negations', remove_double_negations),
+            ('merge_common_subexpressions', merge_common_subexpressions),
+            ('eliminate_dead_gates', eliminate_dead_gates),
+        ]
+
+    def optimize(self):
+        """Returns the optimized CompiledCircuit."""
+        circuit = self.circuit
+        self.history = []
+        for _ in range(self.max_rounds):
+            gates_before_round = circuit.gate_count
+            for name, optimization in self.passes():
+                optimized = optimization(circuit)
+                self.history.append(PassResult(name, circuit.gate_count,
+                                               optimized.gate_count))
+                circuit = optimized
+            if circuit.gate_count == gates_before_round:
+                break
+        return circuit
+
+    def report(self):
+        """
+        Returns a text report of the gate count reduction of every pass of
+        the last call to optimize().
+        """
+        if not self.history:
+            return 'Not optimized yet.'
+        lines = ['{:<28} {:>8} -> {:>8}'.format(*result)
+                 for result in self.history]
+        before = self.history[0].gates_before
+        after = self.history[-1].gates_after
+        lines.append('Total: {} -> {} gates, {:.1%} removed.'.format(
+            before, after, 1 - after / before if before else 0))
+        return '\n'.join(lines)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Script times the logic circuit tools of Chapter_1 against the approaches
+they replace, one benchmark per section:
+
+    -   Reconvergent chains: LogicGate.get_output() against circuits
+        compiled by circuit_compiler.
+    -   Truth tables: per-vector evaluation against bit-parallel
+        simulation.
+    -   Toggling inputs: full re-evaluation against event-driven
+        simulation.
+    -   Building circuits: gate objects against loading a netlist.
+    -   Optimizing: compiled circuits before and after circuit_optimizer.
+    -   Equivalence: BDDs against comparing truth tables.
+    -   Exhaustive sweeps: one process against several.
+"""
+import os
+import random
+import timeit
+from unittest import mock
+
+from Chapter_1 import logic_circuits as lc
+from Chapter_1 import bdd
+from Chapter_1 import circuit_sweep
+from Chapter_1 import netlist
+from Chapter_1.circuit_compiler import CircuitCompiler, exhaustive_words, np
+from Chapter_1.circuit_inputs import input_pins
+from Chapter_1.circuit_optimizer import CircuitOptimizer
+from Chapter_1.event_simulator import EventDrivenSimulator
+
+
+def reconvergent_chain(depth):
+    """
+    Returns the last gate of a chain of `depth` stages. Each stage feeds the
+    output of the previous stage into both pins of an AND or OR gate, so
+    get_output() evaluates the first stage 2**depth times.
+    """
+    gate = lc.AndGate("G0")
+    for stage in range(1, depth + 1):
+        next_gate = (lc.OrGate if stage % 2 else lc.AndGate)(
+            "G{}".format(stage))
+        lc.Connector(gate, next_gate)
+        lc.Connector(gate, next_gate)
+        if stage % 3 == 0:
+            inverter = lc.NotGate("N{}".format(stage))
+            lc.Connector(next_gate, inverter)
+            next_gate = inverter
+        gate = next_gate
+    return gate
+
+
+def random_circuit(number_of_inputs, number_of_gates, seed=0):
+    """
+    Returns the output gates of a random circuit. The first
+    number_of_inputs // 2 gates are AND gates whose pins are left
+    unconnected, so the circuit has number_of_inputs primary inputs; every
+    later gate takes its inputs from two random earlier gates.
+    """
+    rng = random.Random(seed)
+    gates = [lc.AndGate("I{}".format(i)) for i in range(number_of_inputs // 2)]
+    consumed = set()
+    for index in range(number_of_gates):
+        gate_class = rng.choice((lc.AndGate, lc.OrGate, lc.NotGate))
+        gate = gate_class("G{}".format(index))
+        sources = rng.sample(gates[-50:], 1 if gate_class is lc.NotGate else 2)
+        for source in sources:
+            lc.Connector(source, gate)
+            consumed.add(id(source))
+        gates.append(gate)
+    return [gate for gate in gates if id(gate) not in consumed]
+
+
+def redundant_circuit(number_of_inputs, number_of_gates, seed=0):
+    """
+    Returns the output gates of a random circuit over InputPins, bound to
+    random values, with the redundancy of generated circuits: every third
+    gate duplicates an earlier gate, and gates may repeat an operand.
+    """
+    rng = random.Random(seed)
+    gates = [lc.InputPin("I{}".format(i), rng.randint(0, 1))
+             for i in range(number_of_inputs)]
+    structures = []
+    consumed = set()
+    for index in range(number_of_gates):
+        if structures and index % 3 == 0:
+            gate_class, sources = rng.choice(structures)
+        else:
+            gate_class = rng.choice((lc.AndGate, lc.OrGate, lc.NotGate))
+            sources = rng.choices(gates[-20:],
+                                  k=1 if gate_class is lc.NotGate else 2)
+            structures.append((gate_class, sources))
+        gate = gate_class("G{}".format(index))
+        for source in sources:
+            lc.Connector(source, gate)
+            consumed.add(id(source))
+        gates.append(gate)
+    return [gate for gate in gates if id(gate) not in consumed]
+
+
+def ripple_adder(bits, xor_gates=True):
+    """
+    Returns the sum and carry out gates of a ripple carry adder of two
+    bits-bit numbers over InputPins A0.., B0.., with exclusive ors built
+    from XorGates, or from AND, OR and NOT gates.
+    """
+    def exclusive_or(label, x, y):
+        if xor_gates:
+            gate = lc.XorGate(label)
+            lc.Connector(x, gate)
+            lc.Connector(y, gate)
+            return gate
+        either, both = lc.OrGate(label + "o"), lc.NandGate(label + "n")
+        gate = lc.AndGate(label)
+        for source in (x, y):
+            lc.Connector(source, either)
+            lc.Connector(source, both)
+        lc.Connector(either, gate)
+        lc.Connector(both, gate)
+        return gate
+
+    outputs = []
+    carry = None
+    for i in range(bits):
+        a, b = lc.InputPin("A{}".format(i)), lc.InputPin("B{}".format(i))
+        half = exclusive_or("H{}".format(i), a, b)
+        generate = lc.AndGate("G{}".format(i))
+        lc.Connector(a, generate)
+        lc.Connector(b, generate)
+        if carry is None:
+            outputs.append(half)
+            carry = generate
+            continue
+        outputs.append(exclusive_or("S{}".format(i), half, carry))
+        propagate = lc.AndGate("P{}".format(i))
+        lc.Connector(half, propagate)
+        lc.Connector(carry, propagate)
+        carry_out = lc.OrGate("C{}".format(i + 1))
+        lc.Connector(generate, carry_out)
+        lc.Connector(propagate, carry_out)
+        carry = carry_out
+    return outputs + [carry]
+
+
+if __name__ == "__main__":
+    print("\nEvaluating reconvergent chains; unconnected pins are fed 1.")
+    for depth in (8, 12, 16):
+        output = reconvergent_chain(depth)
+        compiled = CircuitCompiler(output).compile()
+        values = [1] * len(compiled.inputs)
+
+        with mock.patch('builtins.input', return_value='1'):
+            assert (output.get_output(),) == compiled.evaluate(values)
+            number = 3
+            get_output_seconds = timeit.timeit(output.get_output,
+                                               number=number) / number
+        number = 10000
+        compiled_seconds = timeit.timeit(lambda: compiled.evaluate(values),
+                                         number=number) / number
+        print("Depth {:>2} ({} gates): get_output {:.3f} ms, "
+              "compiled {:.4f} ms.".format(depth, compiled.gate_count,
+                                           1000 * get_output_seconds,
+                                           1000 * compiled_seconds))
+
+    number_of_inputs = 20
+    outputs = random_circuit(number_of_inputs, 300)
+    compiled = CircuitCompiler(*outputs).compile()
+    vectors = 1 << number_of_inputs
+    print("\nTruth table of a random circuit: {} inputs, {} gates, "
+          "{} outputs, {:,} vectors.".format(number_of_inputs,
+                                             compiled.gate_count,
+                                             len(compiled.outputs), vectors))
+
+    start = timeit.default_timer()
+    for vector in range(vectors):
+        compiled.evaluate([(vector >> i) & 1
+                           for i in range(number_of_inputs)])
+    print("Per-vector evaluate:     {:.3f} seconds.".format(
+        timeit.default_timer() - start))
+
+    start = timeit.default_timer()
+    compiled.truth_table_words()
+    print("Bit-parallel Python int: {:.3f} seconds.".format(
+        timeit.default_timer() - start))
+
+    if np is not None:
+        words = exhaustive_words(number_of_inputs)
+        arrays = [np.frombuffer(word.to_bytes(vectors // 8, 'little'),
+                                dtype=np.uint64) for word in words]
+        start = timeit.default_timer()
+        compiled.simulate(arrays)
+        print("Bit-parallel NumPy:      {:.3f} seconds.".format(
+            timeit.default_timer() - start))
+
+    outputs = random_circuit(1000, 20000, seed=1)
+    compiled = CircuitCompiler(*outputs).compile()
+    simulator = EventDrivenSimulator(compiled)
+    rng = random.Random(0)
+    values = dict.fromkeys(compiled.inputs, 0)
+    toggles = [rng.choice(compiled.inputs) for _ in range(1000)]
+    print("\nToggling one input at a time: {} inputs, {:,} gates, "
+          "{:,} toggles.".format(len(compiled.inputs), compiled.gate_count,
+                                 len(toggles)))
+
+    start = timeit.default_timer()
+    for name in toggles:
+        values[name] = 1 - values[name]
+        compiled.evaluate(values)
+    print("Full evaluation:  {:.3f} seconds, {:,} gate evaluations.".format(
+        timeit.default_timer() - start, compiled.gate_count * len(toggles)))
+
+    start = timeit.default_timer()
+    evaluations = sum(simulator.toggle(name).evaluations for name in toggles)
+    print("Event-driven:     {:.3f} seconds, {:,} gate evaluations.".format(
+        timeit.default_timer() - start, evaluations))
+
+    print("\nBuilding a circuit of 1000 inputs and 100,000 gates.")
+    start = timeit.default_timer()
+    compiled = CircuitCompiler(*random_circuit(1000, 100000, seed=2)).compile()
+    print("LogicGate objects and compile: {:.3f} seconds.".format(
+        timeit.default_timer() - start))
+    text = netlist.format_netlist(compiled)
+    data = netlist.encode_netlist(compiled)
+
+    start = timeit.default_timer()
+    netlist.parse_netlist(text)
+    print("Text netlist, {:,} bytes:    {:.3f} seconds.".format(
+        len(text), timeit.default_timer() - start))
+
+    start = timeit.default_timer()
+    netlist.decode_netlist(data)
+    print("Binary netlist, {:,} bytes:  {:.3f} seconds.".format(
+        len(data), timeit.default_timer() - start))
+
+    print("\nOptimizing a reconvergent chain of depth 16.")
+    output = reconvergent_chain(16)
+    compiled = CircuitCompiler(output).compile()
+    optimizer = CircuitOptimizer(compiled)
+    optimized = optimizer.optimize()
+    print(optimizer.report())
+    optimized_output, = optimized.to_gates()
+    for pin in input_pins(optimized_output).values():
+        pin.set_value(1)
+    with mock.patch('builtins.input', return_value='1'):
+        assert output.get_output() == optimized_output.get_output()
+        get_output_seconds = timeit.timeit(output.get_output, number=1)
+    optimized_seconds = timeit.timeit(optimized_output.get_output,
+                                      number=1000) / 1000
+    print("get_output: {:.3f} ms before, {:.4f} ms after, {:,.0f} times "
+          "faster.".format(1000 * get_output_seconds,
+                           1000 * optimized_seconds,
+                           get_output_seconds / optimized_seconds))
+
+    print("\nOptimizing a random circuit of 100 inputs and 20,000 gates.")
+    outputs = redundant_circuit(100, 20000)
+    compiled = CircuitCompiler(*outputs).compile()
+    optimizer = CircuitOptimizer(compiled)
+    start = timeit.default_timer()
+    optimized = optimizer.optimize()
+    print(optimizer.report())
+    print("Optimized in {:.3f} seconds.".format(
+        timeit.default_timer() - start))
+    rng = random.Random(1)
+    values = [rng.randint(0, 1) for _ in compiled.inputs]
+    assert compiled.evaluate(values) == optimized.evaluate(values)
+    number = 100
+    before = timeit.timeit(lambda: compiled.evaluate(values),
+                           number=number) / number
+    after = timeit.timeit(lambda: optimized.evaluate(values),
+                          number=number) / number
+    print("Compiled evaluate: {:.3f} ms before, {:.3f} ms after, {:.1f} "
+          "times faster.".format(1000 * before, 1000 * after, before / after))
+
+    print("\nEquivalence of ripple carry adders with and without XorGates.")
+    for bits in (8, 32):
+        first = CircuitCompiler(*ripple_adder(bits)).compile()
+        second = CircuitCompiler(
+            *ripple_adder(bits, xor_gates=False)).compile()
+        start = timeit.default_timer()
+        result = bdd.equivalent(first, second)
+        line = "{:>2} bits, {} inputs: BDD {} in {:.3f} seconds".format(
+            bits, len(first.inputs), result, timeit.default_timer() - start)
+        if bits <= 8:
+            start = timeit.default_timer()
+            result = first.truth_table_words() == second.truth_table_words()
+            line += ", truth tables {} in {:.3f} seconds".format(
+                result, timeit.default_timer() - start)
+        print(line + ".")
+
+    adder = CircuitCompiler(*ripple_adder(10)).compile()
+    bad_order = sorted(adder.inputs)
+    manager, roots = bdd.circuit_bdd(adder, order=bad_order)
+    before = manager.node_count(roots)
+    start = timeit.default_timer()
+    after = manager.sift(roots)
+    print("Sifting a 10 bit adder BDD built with all A's before all B's: "
+          "{:,} -> {:,} nodes in {:.3f} seconds.".format(
+              before, after, timeit.default_timer() - start))
+
+    bits = 12
+    first = CircuitCompiler(*ripple_adder(bits)).compile()
+    predicate = circuit_sweep.Matches(ripple_adder(bits, xor_gates=False))
+    print("\nExhaustive sweep of a {} bit adder against a reference, {:,} "
+          "vectors.".format(bits, 1 << len(first.inputs)))
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = timeit.default_timer()
+        result = circuit_sweep.sweep(first, predicate, workers=workers)
+        print("{} worker(s): {} failures in {:.3f} seconds.".format(
+            workers, result.failures, timeit.default_timer() - start))
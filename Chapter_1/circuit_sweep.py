@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Exhaustive verification of compiled logic circuits, sharded across a pool of
+worker processes.
+
+The 2**n input vectors of a circuit are numbered as in exhaustive_words():
+in vector v, input i is bit i of v. The vector numbers are split into
+contiguous ranges, which the workers evaluate bit-parallel, BLOCK_SIZE
+vectors per call of the compiled circuit, checking every block with a
+predicate.
+
+The circuit and the predicate are sent to every worker once, when the pool
+starts; the tasks themselves are just ranges of vector numbers, and the
+results only the number of vectors that fail the predicate and the first
+few failing vectors, the counterexamples.
+
+A predicate takes the input words, as a dict by input name, the output
+words, as a tuple, and the mask of ones of the block width, and returns the
+word of the vectors that pass: bit k is 1 if vector k of the block passes.
+Predicates are sent to other processes, so they must be picklable: a
+function defined at module level, or an instance of a class such as
+Matches.
+"""
+import collections
+import multiprocessing
+import os
+
+from Chapter_1.circuit_compiler import as_compiled, exhaustive_words
+
+# Number of vectors evaluated by each call of the compiled circuit.
+BLOCK_SIZE = 1 << 16
+
+# Number of ranges per worker; more ranges balance the load better.
+RANGES_PER_WORKER = 8
+
+# Aggregate result of a sweep: the number of vectors checked and failed, and
+# the first failing vectors, as dicts of input values by name.
+SweepResult = collections.namedtuple(
+    'SweepResult', ['vectors', 'failures', 'counterexamples'])
+
+
+class Matches:
+    """
+    Predicate passing the vectors for which a circuit has the same outputs
+    as a reference circuit, whose inputs are matched by name.
+
+    Variables
+    ---------
+    reference, CompiledCircuit, LogicGate or sequence of LogicGate
+    """
+    def __init__(self, reference):
+        self.reference = as_compiled(reference)
+
+    def __call__(self, inputs, outputs, mask):
+        expected = self.reference.simulate(inputs, width=mask.bit_length())
+        if len(expected) != len(outputs):
+            raise ValueError('The circuits have different numbers of '
+                             'outputs.')
+        passing = mask
+        for output, expected_output in zip(outputs, expected):
+            passing &= ~(output ^ expected_output)
+        return passing
+
+
+def always_one(inputs, outputs, mask):
+    """Predicate passing the vectors for which every output is 1."""
+    passing = mask
+    for output in outputs:
+        passing &= output
+    return passing
+
+
+def _check_range(circuit, predicate, start, stop, block_size,
+                 max_counterexamples):
+    """
+    Checks the vectors start to stop - 1 and returns the number of failures
+    and up to max_counterexamples failing vector numbers.
+    """
+    number_of_inputs = len(circuit.inputs)
+    failures = 0
+    counterexamples = []
+    for block_start in range(start, stop, block_size):
+        words = exhaustive_words(number_of_inputs, block_start, block_size)
+        mask = (1 << block_size) - 1
+        outputs = circuit.simulate(words, width=block_size)
+        failing = mask & ~predicate(dict(zip(circuit.inputs, words)),
+                                    outputs, mask)
+        if not failing:
+            continue
+        failures += bin(failing).count('1')
+        while failing and len(counterexamples) < max_counterexamples:
+            lowest = failing & -failing
+            counterexamples.append(block_start + lowest.bit_length() - 1)
+            failing ^= lowest
+    return failures, counterexamples
+
+
+# Circuit, predicate, block size and counterexample limit of a worker,
+# set once by _initialize_worker.
+_worker_task = None
+
+
+def _initialize_worker(circuit, predicate, block_size, max_counterexamples):
+    global _worker_task
+    _worker_task = (circuit, predicate, block_size, max_counterexamples)
+
+
+def _check_worker_range(bounds):
+    circuit, predicate, block_size, max_counterexamples = _worker_task
+    return _check_range(circuit, predicate, bounds[0], bounds[1], block_size,
+                        max_counterexamples)
+
+
+def _ranges(number_of_vectors, block_size, number_of_ranges):
+    """
+    Splits range(number_of_vectors) into at most number_of_ranges contiguous
+    ranges whose lengths are multiples of block_size.
+    """
+    blocks = number_of_vectors // block_size
+    blocks_per_range = max(1, -(-blocks // number_of_ranges))
+    step = blocks_per_range * block_size
+    return [(start, min(start + step, number_of_vectors))
+            for start in range(0, number_of_vectors, step)]
+
+
+def _range_results(circuit, predicate, workers, block_size,
+                   max_counterexamples):
+    """
+    Yields the (failures, counterexamples) of every range, in the order in
+    which they complete.
+    """
+    number_of_vectors = 1 << len(circuit.inputs)
+    block_size = min(block_size, number_of_vectors)
+    if block_size & (block_size - 1):
+        raise ValueError('block_size must be a power of two.')
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        yield _check_range(circuit, predicate, 0, number_of_vectors,
+                           block_size, max_counterexamples)
+        return
+
+    ranges = _ranges(number_of_vectors, block_size,
+                     workers * RANGES_PER_WORKER)
+    with multiprocessing.Pool(
+            workers, initializer=_initialize_worker,
+            initargs=(circuit, predicate, block_size,
+                      max_counterexamples)) as pool:
+        yield from pool.imap_unordered(_check_worker_range, ranges)
+
+
+def _vector_values(circuit, vector):
+    """Returns the input values of vector number `vector`, by name."""
+    return {name: (vector >> i) & 1 for i, name in enumerate(circuit.inputs)}
+
+
+def sweep(circuit, predicate=always_one, workers=None, max_counterexamples=10,
+          block_size=BLOCK_SIZE):
+    """
+    Checks a predicate for every input vector of a circuit and returns a
+    SweepResult. The counterexamples are the failing vectors with the lowest
+    numbers.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit, LogicGate or sequence of LogicGate
+    predicate, function; default = always_one
+        See the module docstring.
+    workers, int; default = None
+        Number of worker processes; the number of CPUs by default. With one
+        worker the sweep runs in the calling process.
+    max_counterexamples, int; default = 10
+        Maximum number of counterexamples returned; with 0 only counts are
+        sent back by the workers.
+    block_size, int; default = BLOCK_SIZE
+        Number of vectors evaluated at once; a power of two.
+    """
+    circuit = as_compiled(circuit)
+    failures = 0
+    counterexamples = []
+    for range_failures, range_counterexamples in _range_results(
+            circuit, predicate, workers, block_size, max_counterexamples):
+        failures += range_failures
+        counterexamples.extend(range_counterexamples)
+    counterexamples = sorted(counterexamples)[:max_counterexamples]
+    return SweepResult(
+        1 << len(circuit.inputs), failures,
+        [_vector_values(circuit, vector) for vector in counterexamples])
+
+
+def counterexamples(circuit, predicate=always_one, workers=None,
+                    block_size=BLOCK_SIZE, per_range=10):
+    """
+    Yields failing input vectors, as dicts of input values by name, as soon
+    as the range containing them has been checked. Stop iterating to cancel
+    the sweep.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit, LogicGate or sequence of LogicGate
+    predicate, function; default = always_one
+    workers, int; default = None
+    block_size, int; default = BLOCK_SIZE
+    per_range, int; default = 10
+        Maximum number of counterexamples reported per range.
+    """
+    circuit = as_compiled(circuit)
+    for _, range_counterexamples in _range_results(
+            circuit, predicate, workers, block_size, per_range):
+        for vector in range_counterexamples:
+            yield _vector_values(circuit, vector)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Event-driven simulation of a compiled logic circuit.
+
+The simulator caches the output of every gate and keeps, for every input and
+gate, the list of gates it feeds. When inputs change, only the gates fed by a
+changed value are re-evaluated, and the change propagates further only
+through the gates whose output actually changes.
+"""
+import collections
+import heapq
+
+from Chapter_1.circuit_compiler import BIT_FUNCTIONS, CircuitCompiler
+
+# Result of one simulation step: the number of gates evaluated and the names
+# of the outputs whose value changed.
+Step = collections.namedtuple('Step', ['evaluations', 'changed_outputs'])
+
+
+class EventDrivenSimulator:
+    """
+    Incrementally simulates a CompiledCircuit as its inputs change.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    initial_values, dict or sequence of int; default = None
+        Initial input values; all inputs are 0 by default.
+    """
+    def __init__(self, circuit, initial_values=None):
+        self.circuit = circuit
+        number_of_inputs = len(circuit.inputs)
+        self._first_gate_slot = number_of_inputs
+        self._input_slots = {name: slot
+                             for slot, name in enumerate(circuit.inputs)}
+        self._functions = [BIT_FUNCTIONS[operation]
+                           for operation, _ in circuit.instructions]
+        self._operands = [operands for _, operands in circuit.instructions]
+
+        # Gates, by slot, fed by each slot.
+        self._fanout = [[] for _ in range(number_of_inputs
+                                          + len(circuit.instructions))]
+        for slot, operands in enumerate(self._operands, number_of_inputs):
+            for operand in set(operands):
+                self._fanout[operand].append(slot)
+
+        self._output_slots = {}
+        for name, slot in zip(circuit.output_names, circuit.outputs):
+            self._output_slots.setdefault(slot, []).append(name)
+
+        if initial_values is None:
+            initial_values = [0] * number_of_inputs
+        self.values = (list(circuit._input_values(initial_values))
+                       + [0] * len(circuit.instructions))
+        for slot in range(number_of_inputs, len(self.values)):
+            self.values[slot] = self._evaluate(slot)
+        self.total_evaluations = len(circuit.instructions)
+
+    @classmethod
+    def from_gates(cls, *output_gates):
+        """
+        Returns a simulator for the circuit upstream of the output gates.
+
+        Variables
+        ---------
+        output_gates, LogicGate instances
+        """
+        return cls(CircuitCompiler(*output_gates).compile())
+
+    def _evaluate(self, slot):
+        """Returns the output of the gate in slot from the cached values."""
+        values = self.values
+        return self._functions[slot - self._first_gate_slot](
+            [values[operand]
+             for operand in self._operands[slot - self._first_gate_slot]])
+
+    @property
+    def outputs(self):
+        """Returns the current outputs as a tuple of 0s and 1s."""
+        return tuple(self.values[slot] for slot in self.circuit.outputs)
+
+    def set_inputs(self, changes):
+        """
+        Applies new input values and propagates their effects, and returns
+        a Step with the number of gate evaluations that took.
+
+        Variables
+        ---------
+        changes, dict
+            New values by input name; unchanged inputs may be omitted.
+        """
+        values = self.values
+        fanout = self._fanout
+        pending = []
+        scheduled = set()
+        changed_outputs = []
+        for name, value in changes.items():
+            try:
+                slot = self._input_slots[name]
+            except KeyError:
+                raise KeyError('No input named {}.'.format(name))
+            if values[slot] != value:
+                values[slot] = value
+                if slot in self._output_slots:
+                    changed_outputs.extend(self._output_slots[slot])
+                for gate_slot in fanout[slot]:
+                    if gate_slot not in scheduled:
+                        scheduled.add(gate_slot)
+                        heapq.heappush(pending, gate_slot)
+
+        # Slots are in topological order, so taking the lowest pending slot
+        # first evaluates every gate at most once, after all of its inputs.
+        evaluations = 0
+        while pending:
+            slot = heapq.heappop(pending)
+            evaluations += 1
+            value = self._evaluate(slot)
+            if value == values[slot]:
+                continue
+            values[slot] = value
+            if slot in self._output_slots:
+                changed_outputs.extend(self._output_slots[slot])
+            for gate_slot in fanout[slot]:
+                if gate_slot not in scheduled:
+                    scheduled.add(gate_slot)
+                    heapq.heappush(pending, gate_slot)
+        self.total_evaluations += evaluations
+        return Step(evaluations, changed_outputs)
+
+    def toggle(self, name):
+        """
+        Inverts a single input and returns the resulting Step.
+
+        Variables
+        ---------
+        name, str
+        """
+        return self.set_inputs(
+            {name: 1 - self.values[self._input_slots[name]]})
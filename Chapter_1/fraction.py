@@ -4,29 +4,159 @@
 Implements a Fraction class that behaves like a fraction. This includes
 basic mathematical operations as well as boolean comparators. Unary negation
 and inversion (reciprocal) are also included.
+
+The fsum() and fprod() functions add and multiply streams of fractions
+without building intermediate Fraction objects, and the bounded_precision()
+context manager rounds every arithmetic result to a maximum denominator.
 """
+import contextlib
+import math
+import sys
+
+from Chapter_1.intmath import gcd
+
+# Hashes follow the numeric tower of the standard library: the hash of a/b is
+# a * pow(b, -1, P) reduced modulo the prime P, so that equal ints, floats and
+# Fractions hash alike.
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INF = sys.hash_info.inf
 
+# Maximum denominator of arithmetic results; None for exact arithmetic. Set
+# through the bounded_precision() context manager.
+_max_denominator = None
+
+
+def _limit_terms(numerator, denominator, max_denominator):
+    """
+    Returns the terms of the closest fraction to numerator/denominator whose
+    denominator is at most max_denominator.
 
-def gcd(m, n):
-    """Returns the greatest common denominator between m and n.
+    The candidates are the continued fraction convergents of the fraction
+    and the last semiconvergent before the denominator bound is exceeded.
 
     Variables
     ---------
-    m, int
-    n, int
+    numerator, int
+    denominator, int
+        Positive and in lowest terms with numerator.
+    max_denominator, int
     """
-    # Euclid's Algorithm
-    while m % n != 0:
-        previous_m = m
-        previous_n = n
+    if denominator <= max_denominator:
+        return numerator, denominator
+
+    # p0/q0 and p1/q1 are the two latest convergents.
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    n, d = numerator, denominator
+    while True:
+        a = n // d
+        q2 = q0 + a * q1
+        if q2 > max_denominator:
+            break
+        p0, q0, p1, q1 = p1, q1, p0 + a * p1, q2
+        n, d = d, n - a * d
+
+    # Largest semiconvergent whose denominator is within the bound.
+    k = (max_denominator - q0) // q1
+    if 2 * d * (q0 + k * q1) <= denominator:
+        return p1, q1
+    return p0 + k * p1, q0 + k * q1
+
+
+@contextlib.contextmanager
+def bounded_precision(max_denominator):
+    """
+    Context manager that limits the denominator of every arithmetic result
+    computed inside the with block to max_denominator, so that long
+    iterative computations keep operands, and the cost of each operation,
+    from growing.
 
-        m = previous_n
-        n = previous_m % previous_n
-    return n
+    Arithmetic results are those of the operators, of fsum() and fprod(),
+    and of limit_denominator(). Fractions built by the constructor or by
+    from_float(), and values converted from other types such as
+    FractionArray elements, stay exact.
+
+    The setting is global to the module and is not thread safe.
+
+    Variables
+    ---------
+    max_denominator, int
+    """
+    global _max_denominator
+    if max_denominator < 1:
+        raise ValueError('max_denominator must be at least 1.')
+    previous = _max_denominator
+    _max_denominator = max_denominator
+    try:
+        yield
+    finally:
+        _max_denominator = previous
+
+
+def _restore(numerator, denominator):
+    """
+    Builds a Fraction from terms already in lowest terms, without a gcd and
+    exactly, whatever the bounded_precision() setting. Used by pickling and
+    by conversions from other types.
+    """
+    fraction = object.__new__(Fraction)
+    fraction._numerator = numerator
+    fraction._denominator = denominator
+    return fraction
+
+
+def _add_reduced(a, b, c, d):
+    """
+    Returns a/b + c/d as a Fraction, where both operands are in lowest terms
+    with positive denominators.
+    """
+    g = gcd(b, d)
+    if g == 1:
+        return Fraction._from_reduced(a * d + b * c, b * d)
+    s = b // g
+    t = a * (d // g) + c * s
+    g2 = gcd(t, g)
+    if g2 == 1:
+        return Fraction._from_reduced(t, s * d)
+    return Fraction._from_reduced(t // g2, s * (d // g2))
+
+
+def _mul_reduced(a, b, c, d):
+    """
+    Returns a/b * c/d as a Fraction, where both operands are in lowest terms
+    with positive denominators.
+    """
+    g1 = gcd(a, d)
+    g2 = gcd(c, b)
+    return Fraction._from_reduced((a // g1) * (c // g2),
+                                  (b // g2) * (d // g1))
+
+
+def _div_reduced(a, b, c, d):
+    """
+    Returns a/b / c/d as a Fraction, where both operands are in lowest terms
+    with positive denominators.
+    """
+    if c == 0:
+        raise ZeroDivisionError('Fraction division by zero.')
+    g1 = gcd(a, abs(c))
+    g2 = gcd(d, b)
+    numerator = (a // g1) * (d // g2)
+    denominator = (b // g2) * (c // g1)
+    if denominator < 0:
+        return Fraction._from_reduced(-numerator, -denominator)
+    return Fraction._from_reduced(numerator, denominator)
 
 
 class Fraction:
-    """Class implements the abstract data type of Fraction."""
+    """
+    Class implements the abstract data type of Fraction.
+
+    Instances are immutable; the numerator and denominator are stored in
+    slots and are always kept in lowest terms with a positive denominator.
+    Instances are hashable, and the hash is computed once on first use.
+    """
+    __slots__ = ('_numerator', '_denominator', '_hash')
+
     def __init__(self, numerator, denominator):
         """Constructor.
 
@@ -38,13 +168,86 @@ class Fraction:
         if not isinstance(numerator, int) or not isinstance(denominator, int):
             raise TypeError('Both the numerator and denominator must be ints.')
 
+        if denominator == 0:
+            raise ZeroDivisionError('Fraction({}, 0)'.format(numerator))
+
         if denominator < 0:
             numerator = -numerator
             denominator = abs(denominator)
 
-        greatest_common_denominator = abs(gcd(numerator, denominator))
-        self.numerator = numerator // greatest_common_denominator
-        self.denominator = denominator // greatest_common_denominator
+        greatest_common_denominator = gcd(numerator, denominator)
+        self._numerator = numerator // greatest_common_denominator
+        self._denominator = denominator // greatest_common_denominator
+
+    @classmethod
+    def _from_reduced(cls, numerator, denominator):
+        """
+        Builds a Fraction without validating or normalizing the arguments.
+
+        Only for internal use, where the numerator and the positive
+        denominator are already known to be in lowest terms.
+
+        Variables
+        ---------
+        numerator, int
+        denominator, int
+        """
+        if _max_denominator is not None and denominator > _max_denominator:
+            numerator, denominator = _limit_terms(numerator, denominator,
+                                                  _max_denominator)
+        fraction = object.__new__(cls)
+        fraction._numerator = numerator
+        fraction._denominator = denominator
+        return fraction
+
+    @classmethod
+    def from_float(cls, x, max_denominator=None):
+        """
+        Returns the Fraction equal to the float x.
+
+        If max_denominator is given, the closest Fraction to x with a
+        denominator of at most max_denominator is returned instead.
+
+        Variables
+        ---------
+        x, float
+        max_denominator, int; default = None
+        """
+        numerator, denominator = float(x).as_integer_ratio()
+        if max_denominator is not None:
+            if max_denominator < 1:
+                raise ValueError('max_denominator must be at least 1.')
+            numerator, denominator = _limit_terms(numerator, denominator,
+                                                  max_denominator)
+        fraction = object.__new__(cls)
+        fraction._numerator = numerator
+        fraction._denominator = denominator
+        return fraction
+
+    def limit_denominator(self, max_denominator):
+        """
+        Returns the closest Fraction to self with a denominator of at most
+        max_denominator.
+
+        Variables
+        ---------
+        max_denominator, int
+        """
+        if max_denominator < 1:
+            raise ValueError('max_denominator must be at least 1.')
+        if self._denominator <= max_denominator:
+            return self
+        numerator, denominator = _limit_terms(
+            self._numerator, self._denominator, max_denominator)
+        return Fraction._from_reduced(numerator, denominator)
+
+    @property
+    def numerator(self):
+        return self._numerator
+
+    @property
+    def denominator(self):
+        return self._denominator
 
     def __str__(self):
         """Overwrites defafult __str__() to visually look like a fraction."""
@@ -52,30 +255,101 @@ class Fraction:
             return str(self.numerator)
         return "{}/{}".format(self.numerator, self.denominator)
 
+    def __reduce__(self):
+        """Pickles a Fraction as its two terms only."""
+        return (_restore, (self._numerator, self._denominator))
+
+    def __float__(self):
+        """Returns the correctly rounded float value of the fraction."""
+        return self._numerator / self._denominator
+
+    def _comparison_terms(self, other):
+        """
+        Returns a pair (lhs, rhs) such that comparing self with other is
+        equivalent to comparing lhs with rhs; None if other is not a
+        Fraction, int or float.
+
+        Finite floats are compared exactly through their integer ratio; inf
+        and nan are compared against 0.0, which gives the float results.
+        """
+        if isinstance(other, Fraction):
+            return (self._numerator * other._denominator,
+                    self._denominator * other._numerator)
+        if isinstance(other, int):
+            return self._numerator, self._denominator * other
+        if isinstance(other, float):
+            if math.isinf(other) or math.isnan(other):
+                return 0.0, other
+            numerator, denominator = other.as_integer_ratio()
+            return (self._numerator * denominator,
+                    self._denominator * numerator)
+        return None
+
     def __add__(self, other_fraction):
         """Implements fraction addition.
 
         General fraction addition:  a/b + c/d = (d*a + c*b) / (b*d)
 
+        Both operands are in lowest terms, so only gcd(b, d) and the gcd of
+        the new numerator with gcd(b, d) are needed to reduce the result;
+        both are usually much smaller than the full gcd.
+
+        Adding an int n needs no gcd at all: a/b + n = (a + n*b) / b is
+        already in lowest terms. Adding a float returns a float.
+
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        new_numerator = (self.numerator * other_fraction.denominator
-                         + self.denominator * other_fraction.numerator)
-        new_denominator = self.denominator * other_fraction.denominator
-        return Fraction(new_numerator, new_denominator)
+        if isinstance(other_fraction, Fraction):
+            return _add_reduced(self._numerator, self._denominator,
+                                other_fraction._numerator,
+                                other_fraction._denominator)
+        if isinstance(other_fraction, int):
+            return Fraction._from_reduced(
+                self._numerator + other_fraction * self._denominator,
+                self._denominator)
+        if isinstance(other_fraction, float):
+            return float(self) + other_fraction
+        return NotImplemented
+
+    __radd__ = __add__
 
     def __eq__(self, other_fraction):
         """Implements fraction equality.
 
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        first_numerator = self.numerator * other_fraction.denominator
-        second_numerator = self.denominator * other_fraction.numerator
-        return first_numerator == second_numerator
+        terms = self._comparison_terms(other_fraction)
+        if terms is None:
+            return NotImplemented
+        lhs, rhs = terms
+        return lhs == rhs
+
+    def __hash__(self):
+        """
+        Returns a hash equal to the hash of any equal int, float or
+        fractions.Fraction. The value is cached on the instance.
+        """
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+        try:
+            inverse = pow(self._denominator, -1, _HASH_MODULUS)
+        except ValueError:
+            # The denominator is divisible by the modulus.
+            hash_value = _HASH_INF
+        else:
+            hash_value = hash(hash(abs(self._numerator)) * inverse)
+        if self._numerator < 0:
+            hash_value = -hash_value
+        if hash_value == -1:
+            hash_value = -2
+        self._hash = hash_value
+        return hash_value
 
     def __sub__(self, other_fraction):
         """Implements fraction subtraction.
@@ -84,25 +358,58 @@ class Fraction:
 
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        new_numerator = (self.numerator * other_fraction.denominator
-                         - self.denominator * other_fraction.numerator)
-        new_denominator = self.denominator * other_fraction.denominator
-        return Fraction(new_numerator, new_denominator)
+        if isinstance(other_fraction, Fraction):
+            return _add_reduced(self._numerator, self._denominator,
+                                -other_fraction._numerator,
+                                other_fraction._denominator)
+        if isinstance(other_fraction, int):
+            return Fraction._from_reduced(
+                self._numerator - other_fraction * self._denominator,
+                self._denominator)
+        if isinstance(other_fraction, float):
+            return float(self) - other_fraction
+        return NotImplemented
+
+    def __rsub__(self, other):
+        """Implements n - a/b = (n*b - a) / b for an int or float n."""
+        if isinstance(other, int):
+            return Fraction._from_reduced(
+                other * self._denominator - self._numerator,
+                self._denominator)
+        if isinstance(other, float):
+            return other - float(self)
+        return NotImplemented
 
     def __mul__(self, other_fraction):
         """Implements fraction multiplication.
 
         General fraction multiplication: a/b * c/d = (a * c) / (b * d)
 
+        Cancelling gcd(a, d) and gcd(c, b) before multiplying leaves the
+        result in lowest terms.
+
+        For an int n only gcd(n, b) has to be cancelled.
+
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        new_numerator = self.numerator * other_fraction.numerator
-        new_denominator = self.denominator * other_fraction.denominator
-        return Fraction(new_numerator, new_denominator)
+        if isinstance(other_fraction, Fraction):
+            return _mul_reduced(self._numerator, self._denominator,
+                                other_fraction._numerator,
+                                other_fraction._denominator)
+        if isinstance(other_fraction, int):
+            g = gcd(other_fraction, self._denominator)
+            return Fraction._from_reduced(
+                self._numerator * (other_fraction // g),
+                self._denominator // g)
+        if isinstance(other_fraction, float):
+            return float(self) * other_fraction
+        return NotImplemented
+
+    __rmul__ = __mul__
 
     def __truediv__(self, other_fraction):
         """Implements fraction division.
@@ -111,11 +418,26 @@ class Fraction:
 
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        new_numerator = self.numerator * other_fraction.denominator
-        new_denominator = self.denominator * other_fraction.numerator
-        return Fraction(new_numerator, new_denominator)
+        if isinstance(other_fraction, Fraction):
+            return _div_reduced(self._numerator, self._denominator,
+                                other_fraction._numerator,
+                                other_fraction._denominator)
+        if isinstance(other_fraction, int):
+            return _div_reduced(self._numerator, self._denominator,
+                                other_fraction, 1)
+        if isinstance(other_fraction, float):
+            return float(self) / other_fraction
+        return NotImplemented
+
+    def __rtruediv__(self, other):
+        """Implements n / (a/b) = (n*b) / a for an int or float n."""
+        if isinstance(other, int):
+            return _div_reduced(other, 1, self._numerator, self._denominator)
+        if isinstance(other, float):
+            return other / float(self)
+        return NotImplemented
 
     def __le__(self, other_fraction):
         """Implements less than or equal to for fractions.
@@ -124,10 +446,12 @@ class Fraction:
 
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        lhs = self.numerator * other_fraction.denominator
-        rhs = self.denominator * other_fraction.numerator
+        terms = self._comparison_terms(other_fraction)
+        if terms is None:
+            return NotImplemented
+        lhs, rhs = terms
         return lhs <= rhs
 
     def __lt__(self, other_fraction):
@@ -137,10 +461,12 @@ class Fraction:
 
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        lhs = self.numerator * other_fraction.denominator
-        rhs = self.denominator * other_fraction.numerator
+        terms = self._comparison_terms(other_fraction)
+        if terms is None:
+            return NotImplemented
+        lhs, rhs = terms
         return lhs < rhs
 
     def __ge__(self, other_fraction):
@@ -150,10 +476,12 @@ class Fraction:
 
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        lhs = self.numerator * other_fraction.denominator
-        rhs = self.denominator * other_fraction.numerator
+        terms = self._comparison_terms(other_fraction)
+        if terms is None:
+            return NotImplemented
+        lhs, rhs = terms
         return lhs >= rhs
 
     def __gt__(self, other_fraction):
@@ -163,10 +491,12 @@ class Fraction:
 
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        lhs = self.numerator * other_fraction.denominator
-        rhs = self.denominator * other_fraction.numerator
+        terms = self._comparison_terms(other_fraction)
+        if terms is None:
+            return NotImplemented
+        lhs, rhs = terms
         return lhs > rhs
 
     def __ne__(self, other_fraction):
@@ -174,19 +504,112 @@ class Fraction:
 
         Variables
         ---------
-        other_fraction, Fraction
+        other_fraction, Fraction, int or float
         """
-        first_numerator = self.numerator * other_fraction.denominator
-        second_numerator = self.denominator * other_fraction.numerator
-        return first_numerator != second_numerator
+        terms = self._comparison_terms(other_fraction)
+        if terms is None:
+            return NotImplemented
+        lhs, rhs = terms
+        return lhs != rhs
 
     def __neg__(self):
         """Implements unary negation."""
-        return Fraction(-self.numerator, self.denominator)
+        return Fraction._from_reduced(-self._numerator, self._denominator)
 
     def __pos__(self):
         return self
 
     def __invert__(self):
         """Implements unary inversion, i.e. the reciprocal."""
-        return Fraction(self.denominator, self.numerator)
+        if self._numerator == 0:
+            raise ZeroDivisionError(
+                'Fraction({}, 0)'.format(self._denominator))
+        if self._numerator < 0:
+            return Fraction._from_reduced(-self._denominator,
+                                          -self._numerator)
+        return Fraction._from_reduced(self._denominator, self._numerator)
+
+
+def _bounded(numerator, denominator):
+    """
+    Returns numerator/denominator as a Fraction, rounded like an arithmetic
+    result inside bounded_precision().
+    """
+    fraction = Fraction(numerator, denominator)
+    if _max_denominator is None:
+        return fraction
+    return fraction.limit_denominator(_max_denominator)
+
+
+def _terms(value):
+    """Returns the numerator and denominator of a Fraction or an int."""
+    if isinstance(value, Fraction):
+        return value._numerator, value._denominator
+    if isinstance(value, int):
+        return value, 1
+    raise TypeError('Expected a Fraction or an int, got {}.'.format(
+        type(value).__name__))
+
+
+def fsum(iterable):
+    """
+    Returns the sum of an iterable of Fractions and ints as a Fraction; exact
+    except inside bounded_precision(), which rounds the result only.
+
+    The iterable is consumed once as a stream. The running total is kept over
+    the least common multiple of the denominators seen so far, so no
+    intermediate Fraction is created and the result is normalized once.
+
+    Variables
+    ---------
+    iterable, iterable of Fraction or int
+    """
+    numerator, denominator = 0, 1
+    for value in iterable:
+        n, d = _terms(value)
+        if d == denominator:
+            numerator += n
+        elif d == 1:
+            numerator += n * denominator
+        else:
+            # New common denominator: lcm(denominator, d).
+            g = gcd(denominator, d)
+            scale = d // g
+            numerator = numerator * scale + n * (denominator // g)
+            denominator *= scale
+    return _bounded(numerator, denominator)
+
+
+def fprod(iterable):
+    """
+    Returns the product of an iterable of Fractions and ints as a Fraction;
+    exact except inside bounded_precision(), which rounds the result only.
+
+    The iterable is consumed once as a stream. Partial products are combined
+    pairwise, like a binary counter, so that the operands of every
+    multiplication are of similar size while at most O(log n) partial
+    products are held in memory. The result is normalized once.
+
+    Variables
+    ---------
+    iterable, iterable of Fraction or int
+    """
+    # Each entry is [count, numerator, denominator] of a partial product;
+    # counts are powers of two that decrease towards the top of the stack.
+    partials = []
+    for value in iterable:
+        n, d = _terms(value)
+        count = 1
+        while partials and partials[-1][0] == count:
+            previous_count, previous_n, previous_d = partials.pop()
+            count += previous_count
+            n *= previous_n
+            d *= previous_d
+        partials.append([count, n, d])
+
+    numerator, denominator = 1, 1
+    while partials:
+        _, n, d = partials.pop()
+        numerator *= n
+        denominator *= d
+    return _bounded(numerator, denominator)
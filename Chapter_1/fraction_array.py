@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Implements a FractionArray class that stores a column of fractions as two
+integer arrays, one for the numerators and one for the denominators, so that
+arithmetic, comparisons and reductions run over whole arrays at once instead
+of one Fraction object at a time.
+
+The arrays are NumPy int64 arrays. Whenever an operation could overflow 64
+bits, the operands are promoted to object arrays of Python ints, and results
+are narrowed back to int64 once they fit again.
+
+Requires NumPy.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from Chapter_1.fraction import Fraction, _restore
+
+# Largest magnitude that is still safe to hold in an int64 element. -2**63 is
+# excluded, since its negation and absolute value overflow.
+_INT64_LIMIT = 2**63 - 1
+
+
+def _max_abs(values):
+    """Returns the largest magnitude in values, an array or an int."""
+    if isinstance(values, int):
+        return abs(values)
+    if values.size == 0:
+        return 0
+    # Python ints, since np.abs(-2**63) overflows.
+    return max(int(values.max()), -int(values.min()))
+
+
+def _widen(values):
+    """Returns values as an object array of Python ints."""
+    if isinstance(values, int) or values.dtype == object:
+        return values
+    return values.astype(object)
+
+
+def _narrow(values):
+    """Returns values as an int64 array if every element fits."""
+    if values.dtype != object or _max_abs(values) > _INT64_LIMIT:
+        return values
+    return values.astype(np.int64)
+
+
+def _operands(bound, *values):
+    """
+    Returns the operands unchanged if bound, the largest intermediate
+    magnitude of the operation, fits in an int64; else widens them to
+    object arrays.
+    """
+    if bound > _INT64_LIMIT:
+        return tuple(_widen(value) for value in values)
+    return values
+
+
+class FractionArray:
+    """
+    A one dimensional array of fractions.
+
+    Like Fraction, every element is kept in lowest terms with a positive
+    denominator. The numerator and denominator attributes are the underlying
+    arrays.
+    """
+    def __init__(self, numerators, denominators=None):
+        """Constructor.
+
+        Variables
+        ---------
+        numerators, iterable of int
+        denominators, iterable of int; default = None
+            Defaults to a denominator of 1 for every element.
+        """
+        if np is None:
+            raise ImportError('FractionArray requires NumPy.')
+        numerator = self._as_array(numerators)
+        if denominators is None:
+            denominator = np.ones(len(numerator), dtype=numerator.dtype)
+        else:
+            denominator = self._as_array(denominators)
+        if numerator.shape != denominator.shape or numerator.ndim != 1:
+            raise ValueError('The numerators and denominators must be one '
+                             'dimensional and of equal length.')
+        if np.any(denominator == 0):
+            raise ZeroDivisionError('FractionArray with a zero denominator.')
+        if numerator.dtype != denominator.dtype:
+            numerator, denominator = _widen(numerator), _widen(denominator)
+        self.numerator, self.denominator = self._normalize(numerator,
+                                                           denominator)
+
+    @staticmethod
+    def _as_array(values):
+        """Returns values as an int64 array, or an object array of ints."""
+        if isinstance(values, np.ndarray) and values.dtype.kind in 'iu':
+            # Unsigned values of 2**63 or more, and -2**63, do not fit.
+            if _max_abs(values) > _INT64_LIMIT:
+                return values.astype(object)
+            return values.astype(np.int64)
+        values = list(values)
+        if not all(isinstance(value, (int, np.integer)) for value in values):
+            raise TypeError('Both the numerators and denominators must be '
+                            'ints.')
+        values = [int(value) for value in values]
+        if max(map(abs, values), default=0) > _INT64_LIMIT:
+            return np.array(values, dtype=object)
+        return np.array(values, dtype=np.int64)
+
+    @staticmethod
+    def _normalize(numerator, denominator):
+        """Divides out the elementwise gcd and moves signs to the numerator."""
+        greatest_common_denominator = np.gcd(numerator, denominator)
+        numerator = numerator // greatest_common_denominator
+        denominator = denominator // greatest_common_denominator
+        negative = denominator < 0
+        if np.any(negative):
+            numerator = np.where(negative, -numerator, numerator)
+            denominator = np.where(negative, -denominator, denominator)
+        return _narrow(numerator), _narrow(denominator)
+
+    @classmethod
+    def _from_reduced(cls, numerator, denominator):
+        """
+        Builds a FractionArray from arrays that are already in lowest terms
+        with positive denominators.
+        """
+        array = object.__new__(cls)
+        array.numerator = _narrow(numerator)
+        array.denominator = _narrow(denominator)
+        return array
+
+    @classmethod
+    def from_fractions(cls, fractions):
+        """
+        Builds a FractionArray from an iterable of Fractions.
+
+        Variables
+        ---------
+        fractions, iterable of Fraction
+        """
+        fractions = list(fractions)
+        return cls([fraction.numerator for fraction in fractions],
+                   [fraction.denominator for fraction in fractions])
+
+    def to_fractions(self):
+        """Returns the elements as a list of Fractions."""
+        return [_restore(int(numerator), int(denominator))
+                for numerator, denominator in zip(self.numerator,
+                                                  self.denominator)]
+
+    def __len__(self):
+        return len(self.numerator)
+
+    def __iter__(self):
+        return iter(self.to_fractions())
+
+    def __getitem__(self, position):
+        """Returns a Fraction for an index, or a FractionArray for a slice."""
+        if isinstance(position, (int, np.integer)):
+            return _restore(int(self.numerator[position]),
+                            int(self.denominator[position]))
+        return FractionArray._from_reduced(self.numerator[position],
+                                           self.denominator[position])
+
+    def __repr__(self):
+        return "FractionArray([{}])".format(
+            ", ".join(str(fraction) for fraction in self))
+
+    def __str__(self):
+        return repr(self)
+
+    @staticmethod
+    def _terms(other):
+        """
+        Returns the numerator and denominator of other, a FractionArray,
+        Fraction or int; None if other is not supported.
+        """
+        if isinstance(other, FractionArray):
+            return other.numerator, other.denominator
+        if isinstance(other, Fraction):
+            return other.numerator, other.denominator
+        if isinstance(other, int):
+            return other, 1
+        return None
+
+    def _add(self, c, d):
+        """Returns self + c/d, where c/d is in lowest terms."""
+        a, b = self.numerator, self.denominator
+        bound = max(_max_abs(a) * _max_abs(d) + _max_abs(b) * _max_abs(c),
+                    _max_abs(b) * _max_abs(d))
+        a, b, c, d = _operands(bound, a, b, c, d)
+        g = np.gcd(b, d)
+        s = b // g
+        t = a * (d // g) + c * s
+        g2 = np.gcd(t, g)
+        return FractionArray._from_reduced(t // g2, s * (d // g2))
+
+    def _mul(self, c, d):
+        """Returns self * c/d, where c/d is in lowest terms."""
+        a, b = self.numerator, self.denominator
+        bound = max(_max_abs(a) * _max_abs(c), _max_abs(b) * _max_abs(d))
+        a, b, c, d = _operands(bound, a, b, c, d)
+        g1 = np.gcd(a, d)
+        g2 = np.gcd(c, b)
+        return FractionArray._from_reduced((a // g1) * (c // g2),
+                                           (b // g2) * (d // g1))
+
+    def __add__(self, other):
+        """Implements elementwise addition: a/b + c/d = (a*d + c*b) / (b*d)"""
+        terms = self._terms(other)
+        if terms is None:
+            return NotImplemented
+        return self._add(*terms)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        """Implements elementwise subtraction."""
+        terms = self._terms(other)
+        if terms is None:
+            return NotImplemented
+        c, d = terms
+        return self._add(-c, d)
+
+    def __rsub__(self, other):
+        terms = self._terms(other)
+        if terms is None:
+            return NotImplemented
+        return (-self)._add(*terms)
+
+    def __mul__(self, other):
+        """Implements elementwise multiplication: a/b * c/d = (a*c) / (b*d)"""
+        terms = self._terms(other)
+        if terms is None:
+            return NotImplemented
+        return self._mul(*terms)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        """Implements elementwise division: a/b / c/d = (a*d) / (b*c)"""
+        terms = self._terms(other)
+        if terms is None:
+            return NotImplemented
+        c, d = terms
+        return self._mul(*self._reciprocal(c, d))
+
+    def __rtruediv__(self, other):
+        terms = self._terms(other)
+        if terms is None:
+            return NotImplemented
+        return (~self)._mul(*terms)
+
+    @staticmethod
+    def _reciprocal(c, d):
+        """Returns the terms of d/c with the sign on the numerator."""
+        if np.any(np.asarray(c) == 0):
+            raise ZeroDivisionError('FractionArray division by zero.')
+        if isinstance(c, int):
+            return (d, c) if c > 0 else (-d, -c)
+        negative = c < 0
+        return np.where(negative, -d, d), np.where(negative, -c, c)
+
+    def __neg__(self):
+        return FractionArray._from_reduced(-self.numerator, self.denominator)
+
+    def __pos__(self):
+        return self
+
+    def __invert__(self):
+        """Implements elementwise inversion, i.e. the reciprocal."""
+        return FractionArray._from_reduced(
+            *self._reciprocal(self.numerator, self.denominator))
+
+    def _cross_products(self, other):
+        """
+        Returns a*d and c*b for the comparison of a/b with c/d, or None if
+        other is not supported.
+        """
+        terms = self._terms(other)
+        if terms is None:
+            return None
+        a, b = self.numerator, self.denominator
+        c, d = terms
+        bound = max(_max_abs(a) * _max_abs(d), _max_abs(b) * _max_abs(c))
+        a, b, c, d = _operands(bound, a, b, c, d)
+        return a * d, c * b
+
+    def __eq__(self, other):
+        """Returns a boolean array of elementwise equality."""
+        products = self._cross_products(other)
+        if products is None:
+            return NotImplemented
+        lhs, rhs = products
+        return lhs == rhs
+
+    def __ne__(self, other):
+        products = self._cross_products(other)
+        if products is None:
+            return NotImplemented
+        lhs, rhs = products
+        return lhs != rhs
+
+    def __lt__(self, other):
+        products = self._cross_products(other)
+        if products is None:
+            return NotImplemented
+        lhs, rhs = products
+        return lhs < rhs
+
+    def __le__(self, other):
+        products = self._cross_products(other)
+        if products is None:
+            return NotImplemented
+        lhs, rhs = products
+        return lhs <= rhs
+
+    def __gt__(self, other):
+        products = self._cross_products(other)
+        if products is None:
+            return NotImplemented
+        lhs, rhs = products
+        return lhs > rhs
+
+    def __ge__(self, other):
+        products = self._cross_products(other)
+        if products is None:
+            return NotImplemented
+        lhs, rhs = products
+        return lhs >= rhs
+
+    def _reduce(self, combine, empty):
+        """
+        Reduces the array with a pairwise tree of elementwise operations, so
+        operand sizes stay balanced and each level is a single vectorized
+        step.
+
+        Returns empty for an empty array; raises ValueError if empty is None.
+        """
+        if len(self) == 0:
+            if empty is None:
+                raise ValueError('Reduction of an empty FractionArray.')
+            return empty
+        array = self
+        while len(array) > 1:
+            half = len(array) // 2
+            combined = combine(array[:half], array[half:2 * half])
+            if len(array) % 2:
+                combined = FractionArray._from_reduced(
+                    np.concatenate((_widen(combined.numerator),
+                                    _widen(array.numerator[-1:]))),
+                    np.concatenate((_widen(combined.denominator),
+                                    _widen(array.denominator[-1:]))))
+            array = combined
+        return array[0]
+
+    def sum(self):
+        """Returns the sum of the elements as a Fraction."""
+        return self._reduce(FractionArray.__add__, Fraction(0, 1))
+
+    def prod(self):
+        """Returns the product of the elements as a Fraction."""
+        return self._reduce(FractionArray.__mul__, Fraction(1, 1))
+
+    def min(self):
+        """Returns the smallest element as a Fraction."""
+        return self._reduce(self._smaller, None)
+
+    def max(self):
+        """Returns the largest element as a Fraction."""
+        return self._reduce(self._larger, None)
+
+    @staticmethod
+    def _smaller(left, right):
+        keep_left = left <= right
+        return FractionArray._from_reduced(
+            np.where(keep_left, left.numerator, right.numerator),
+            np.where(keep_left, left.denominator, right.denominator))
+
+    @staticmethod
+    def _larger(left, right):
+        keep_left = left >= right
+        return FractionArray._from_reduced(
+            np.where(keep_left, left.numerator, right.numerator),
+            np.where(keep_left, left.denominator, right.denominator))
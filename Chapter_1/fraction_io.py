@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Streaming serialization of Fractions, in a compact binary format and in the
+"a/b" text format produced by Fraction.__str__.
+
+Binary format: each fraction is the zigzag encoded numerator followed by the
+denominator, both written as unsigned LEB128 varints (7 bits per byte, high
+bit set on every byte but the last). Small fractions therefore take two
+bytes, and ints of any size are supported.
+
+Decoding takes a `trusted` flag. Trusted input is assumed to have been
+written by this module, i.e. to be in lowest terms with positive
+denominators, and is rebuilt without a gcd; untrusted input is validated
+and normalized by the Fraction constructor. Either way the decoded values
+are exact, even inside bounded_precision().
+"""
+from Chapter_1.fraction import Fraction, _restore, _terms
+
+# Size of the chunks read from and written to binary streams.
+CHUNK_SIZE = 1 << 16
+
+
+def _zigzag(value):
+    """Maps ints to non-negative ints: 0, -1, 1, -2, ... to 0, 1, 2, 3, ..."""
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value):
+    """Inverse of _zigzag."""
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_varint(buffer, value):
+    """Appends the non-negative int value to buffer as a varint."""
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _make_fraction(trusted):
+    """Returns the function that builds a Fraction from decoded terms."""
+    if trusted:
+        return _restore
+    return Fraction
+
+
+def _read_ints(data, start):
+    """
+    Decodes consecutive varints from data, starting at index start.
+
+    Returns the decoded ints and the index just after the last complete
+    varint.
+    """
+    values = []
+    value = shift = 0
+    end = start
+    for index in range(start, len(data)):
+        byte = data[index]
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+            end = index + 1
+    return values, end
+
+
+def _iter_terms(data):
+    """
+    Yields the (numerator, denominator) pairs encoded in data, decoding one
+    varint at a time. Raises ValueError at the end if the data is
+    truncated.
+    """
+    numerator = None
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        if numerator is None:
+            numerator = _unzigzag(value)
+        else:
+            yield numerator, value
+            numerator = None
+        value = shift = 0
+    if shift or numerator is not None:
+        raise ValueError('Truncated fraction data.')
+
+
+def encode_fractions(fractions):
+    """
+    Returns the binary encoding of an iterable of Fractions (or ints).
+
+    Variables
+    ---------
+    fractions, iterable of Fraction or int
+    """
+    buffer = bytearray()
+    for fraction in fractions:
+        numerator, denominator = _terms(fraction)
+        _write_varint(buffer, _zigzag(numerator))
+        _write_varint(buffer, denominator)
+    return bytes(buffer)
+
+
+def decode_fractions(data, trusted=False):
+    """
+    Yields the Fractions encoded in data by encode_fractions(), decoding
+    each one as it is requested. Truncated data raises ValueError after the
+    complete fractions before it are yielded.
+
+    Variables
+    ---------
+    data, bytes-like
+    trusted, bool; default = False
+        If True, skip validation and normalization of the decoded terms.
+    """
+    make_fraction = _make_fraction(trusted)
+    for numerator, denominator in _iter_terms(memoryview(data).cast('B')):
+        yield make_fraction(numerator, denominator)
+
+
+def write_fractions(stream, fractions):
+    """
+    Writes an iterable of Fractions to a binary stream, in chunks, and
+    returns the number of fractions written.
+
+    Variables
+    ---------
+    stream, binary file object
+    fractions, iterable of Fraction or int
+    """
+    buffer = bytearray()
+    count = 0
+    for fraction in fractions:
+        numerator, denominator = _terms(fraction)
+        _write_varint(buffer, _zigzag(numerator))
+        _write_varint(buffer, denominator)
+        count += 1
+        if len(buffer) >= CHUNK_SIZE:
+            stream.write(buffer)
+            buffer = bytearray()
+    stream.write(buffer)
+    return count
+
+
+def read_fractions(stream, trusted=False):
+    """
+    Yields the Fractions written to a binary stream by write_fractions(),
+    reading the stream in chunks.
+
+    Variables
+    ---------
+    stream, binary file object
+    trusted, bool; default = False
+        If True, skip validation and normalization of the decoded terms.
+    """
+    make_fraction = _make_fraction(trusted)
+    pending = b''
+    numerator = None
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        data = pending + chunk
+        values, end = _read_ints(data, 0)
+        pending = data[end:]
+        for value in values:
+            if numerator is None:
+                numerator = _unzigzag(value)
+            else:
+                yield make_fraction(numerator, value)
+                numerator = None
+    if pending or numerator is not None:
+        raise ValueError('Truncated fraction data.')
+
+
+def parse_fractions(lines, trusted=False):
+    """
+    Yields the Fractions written as whitespace separated "a/b" or "a" tokens,
+    the format of Fraction.__str__, in an iterable of lines (such as a text
+    file) or a single string.
+
+    Variables
+    ---------
+    lines, str or iterable of str
+    trusted, bool; default = False
+        If True, skip validation and normalization of the parsed terms.
+    """
+    make_fraction = _make_fraction(trusted)
+    if isinstance(lines, str):
+        lines = [lines]
+    for line in lines:
+        for token in line.split():
+            numerator, separator, denominator = token.partition('/')
+            if separator:
+                yield make_fraction(int(numerator), int(denominator))
+            else:
+                yield make_fraction(int(numerator), 1)
+
+
+def format_fractions(fractions, separator='\n'):
+    """
+    Returns the fractions in the "a/b" text format, joined by separator.
+
+    Variables
+    ---------
+    fractions, iterable of Fraction or int
+    separator, str; default = '\n'
+    """
+    return separator.join(str(fraction) for fraction in fractions)
+
+
+def encode_fraction_array(array):
+    """
+    Returns the binary encoding of a FractionArray, in the same format as
+    encode_fractions().
+
+    Variables
+    ---------
+    array, FractionArray
+    """
+    buffer = bytearray()
+    for numerator, denominator in zip(array.numerator.tolist(),
+                                      array.denominator.tolist()):
+        _write_varint(buffer, _zigzag(numerator))
+        _write_varint(buffer, denominator)
+    return bytes(buffer)
+
+
+def decode_fraction_array(data, trusted=False):
+    """
+    Returns the FractionArray encoded in data by encode_fraction_array() or
+    encode_fractions().
+
+    Variables
+    ---------
+    data, bytes-like
+    trusted, bool; default = False
+        If True, skip normalization of the decoded terms.
+    """
+    from Chapter_1.fraction_array import FractionArray, np
+
+    numerators, denominators = [], []
+    for numerator, denominator in _iter_terms(memoryview(data).cast('B')):
+        numerators.append(numerator)
+        denominators.append(denominator)
+    if not trusted:
+        return FractionArray(numerators, denominators)
+    if np is None:
+        raise ImportError('FractionArray requires NumPy.')
+    return FractionArray._from_reduced(np.array(numerators, dtype=object),
+                                       np.array(denominators, dtype=object))
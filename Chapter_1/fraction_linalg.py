@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Exact linear algebra over the rationals built on the Fraction class.
+
+Gaussian elimination over Fractions makes every entry a fraction whose
+denominator has to be reduced with a gcd after each operation. The functions
+in this module use Bareiss' fraction-free elimination instead: the matrix is
+scaled to integers, every elimination step is an exact integer division by
+the previous pivot, and entries never grow beyond the size of a minor of the
+matrix. Results are converted to Fractions only at the very end.
+
+Matrices are lists of rows; entries may be ints or Fractions.
+"""
+from Chapter_1.fraction import Fraction
+from Chapter_1.intmath import gcd
+
+
+def _integer_rows(rows):
+    """
+    Returns the rows scaled to integers and the product of the scale
+    factors. Each row is multiplied by the lcm of the denominators of its
+    entries.
+
+    Variables
+    ---------
+    rows, list of lists of int or Fraction
+    """
+    scaled_rows = []
+    scale = 1
+    for row in rows:
+        row_scale = 1
+        for entry in row:
+            if isinstance(entry, Fraction):
+                denominator = entry.denominator
+                row_scale *= denominator // gcd(row_scale, denominator)
+            elif not isinstance(entry, int):
+                raise TypeError('Matrix entries must be ints or Fractions.')
+        if row_scale == 1:
+            scaled_rows.append([int(entry) if isinstance(entry, int)
+                                else entry.numerator for entry in row])
+        else:
+            scaled_rows.append([
+                entry.numerator * (row_scale // entry.denominator)
+                if isinstance(entry, Fraction) else entry * row_scale
+                for entry in row])
+        scale *= row_scale
+    return scaled_rows, scale
+
+
+def _check_rectangular(matrix):
+    """Raises ValueError if the rows of matrix differ in length."""
+    if matrix and any(len(row) != len(matrix[0]) for row in matrix):
+        raise ValueError('All rows of the matrix must be of equal length.')
+
+
+def _check_square(matrix):
+    """Raises ValueError if matrix is not square."""
+    _check_rectangular(matrix)
+    if any(len(row) != len(matrix) for row in matrix):
+        raise ValueError('The matrix must be square.')
+
+
+def _bareiss(rows, columns):
+    """
+    Reduces the integer matrix rows, in place, to row echelon form with
+    Bareiss' fraction-free elimination, using the first `columns` columns
+    for pivots.
+
+    Returns the rank and the sign of the row permutation.
+
+    After elimination, the pivot of row r is the determinant of the leading
+    r + 1 by r + 1 minor of the pivot columns, and every division by the
+    previous pivot is exact.
+
+    Variables
+    ---------
+    rows, list of lists of int
+    columns, int
+    """
+    number_of_rows = len(rows)
+    width = len(rows[0]) if rows else 0
+    previous_pivot = 1
+    sign = 1
+    rank = 0
+    for column in range(columns):
+        if rank == number_of_rows:
+            break
+        # Find a row with a non-zero entry in this column.
+        pivot_row = next((index for index in range(rank, number_of_rows)
+                          if rows[index][column] != 0), None)
+        if pivot_row is None:
+            continue
+        if pivot_row != rank:
+            rows[rank], rows[pivot_row] = rows[pivot_row], rows[rank]
+            sign = -sign
+
+        pivot_values = rows[rank]
+        pivot = pivot_values[column]
+        for index in range(rank + 1, number_of_rows):
+            row = rows[index]
+            factor = row[column]
+            for j in range(column + 1, width):
+                row[j] = ((pivot * row[j] - factor * pivot_values[j])
+                          // previous_pivot)
+            row[column] = 0
+        previous_pivot = pivot
+        rank += 1
+    return rank, sign
+
+
+def determinant(matrix):
+    """
+    Returns the determinant of a square matrix as a Fraction.
+
+    Variables
+    ---------
+    matrix, list of lists of int or Fraction
+    """
+    _check_square(matrix)
+    size = len(matrix)
+    if size == 0:
+        return Fraction(1, 1)
+    rows, scale = _integer_rows(matrix)
+    rank, sign = _bareiss(rows, size)
+    if rank < size:
+        return Fraction(0, 1)
+    return Fraction(sign * rows[-1][-1], scale)
+
+
+def rank(matrix):
+    """
+    Returns the rank of a matrix.
+
+    Variables
+    ---------
+    matrix, list of lists of int or Fraction
+    """
+    _check_rectangular(matrix)
+    if not matrix:
+        return 0
+    rows, _ = _integer_rows(matrix)
+    matrix_rank, _ = _bareiss(rows, len(rows[0]))
+    return matrix_rank
+
+
+def _solve_columns(matrix, columns):
+    """
+    Solves matrix * X = B, where B is given by its columns, and returns the
+    columns of X as lists of Fractions.
+    """
+    _check_square(matrix)
+    size = len(matrix)
+    if any(len(column) != size for column in columns):
+        raise ValueError('The right hand side must have one entry per row.')
+    if size == 0:
+        return [[] for _ in columns]
+
+    augmented = [list(row) + [column[index] for column in columns]
+                 for index, row in enumerate(matrix)]
+    rows, _ = _integer_rows(augmented)
+    matrix_rank, _ = _bareiss(rows, size)
+    if matrix_rank < size:
+        raise ValueError('The matrix is singular.')
+
+    # The last pivot D is, up to sign, the determinant of the scaled matrix,
+    # so by Cramer's rule every D * x is an integer and back substitution
+    # can be done exactly in integers.
+    last_pivot = rows[-1][size - 1]
+    solutions = []
+    for offset in range(len(columns)):
+        scaled_solution = [0] * size
+        for i in range(size - 1, -1, -1):
+            row = rows[i]
+            total = last_pivot * row[size + offset]
+            for j in range(i + 1, size):
+                total -= row[j] * scaled_solution[j]
+            scaled_solution[i] = total // row[i]
+        solutions.append([Fraction(value, last_pivot)
+                          for value in scaled_solution])
+    return solutions
+
+
+def solve(matrix, b):
+    """
+    Solves the linear system matrix * x = b exactly.
+
+    If b is a vector, x is returned as a list of Fractions; if b is a
+    matrix, given as a list of rows, x is returned as a list of rows of
+    Fractions.
+
+    Raises ValueError if the matrix is singular.
+
+    Variables
+    ---------
+    matrix, list of lists of int or Fraction
+        Square matrix.
+    b, list of int or Fraction, or list of lists of int or Fraction
+    """
+    if b and isinstance(b[0], (list, tuple)):
+        _check_rectangular(b)
+        columns = [list(column) for column in zip(*b)]
+        return [list(row) for row in zip(*_solve_columns(matrix, columns))]
+    return _solve_columns(matrix, [list(b)])[0]
+
+
+def inverse(matrix):
+    """
+    Returns the inverse of a square matrix as a list of rows of Fractions.
+
+    Raises ValueError if the matrix is singular.
+
+    Variables
+    ---------
+    matrix, list of lists of int or Fraction
+    """
+    size = len(matrix)
+    identity = [[int(i == j) for j in range(size)] for i in range(size)]
+    return solve(matrix, identity)
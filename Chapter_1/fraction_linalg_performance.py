@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Script compares Bareiss' fraction-free elimination in fraction_linalg with
+naive Gaussian elimination over Fractions, for random integer matrices.
+"""
+import random
+import sys
+import timeit
+
+from Chapter_1.fraction import Fraction
+from Chapter_1 import fraction_linalg
+
+
+def naive_solve(matrix, b):
+    """Gaussian elimination with partial pivoting over Fractions."""
+    size = len(matrix)
+    rows = [[Fraction(entry, 1) for entry in row] + [Fraction(value, 1)]
+            for row, value in zip(matrix, b)]
+    for column in range(size):
+        pivot_row = next(index for index in range(column, size)
+                         if rows[index][column] != 0)
+        rows[column], rows[pivot_row] = rows[pivot_row], rows[column]
+        pivot = rows[column]
+        for index in range(column + 1, size):
+            row = rows[index]
+            factor = row[column] / pivot[column]
+            for j in range(column, size + 1):
+                row[j] = row[j] - factor * pivot[j]
+    solution = [Fraction(0, 1)] * size
+    for i in range(size - 1, -1, -1):
+        total = rows[i][size]
+        for j in range(i + 1, size):
+            total = total - rows[i][j] * solution[j]
+        solution[i] = total / rows[i][i]
+    return solution
+
+
+if __name__ == "__main__":
+    # Optional matrix sizes from the command line, e.g. 50 200.
+    sizes = [int(size) for size in sys.argv[1:]] or [50, 200]
+    random.seed(0)
+
+    print("\nSolving random integer systems with entries in [-100, 100].")
+    for size in sizes:
+        matrix = [[random.randint(-100, 100) for _ in range(size)]
+                  for _ in range(size)]
+        b = [random.randint(-100, 100) for _ in range(size)]
+
+        start = timeit.default_timer()
+        bareiss_solution = fraction_linalg.solve(matrix, b)
+        bareiss_seconds = timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        naive_solution = naive_solve(matrix, b)
+        naive_seconds = timeit.default_timer() - start
+
+        assert bareiss_solution == naive_solution
+        print("{0}x{0}: Bareiss {1:.3f} seconds, naive Fraction elimination "
+              "{2:.3f} seconds.".format(size, bareiss_seconds, naive_seconds))
+
+        start = timeit.default_timer()
+        fraction_linalg.determinant(matrix)
+        print("{0}x{0} determinant: {1:.3f} seconds.".format(
+            size, timeit.default_timer() - start))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Script compares the slotted, immutable Fraction against the original
+dictionary based implementation, which normalized every result through the
+constructor and its Python level Euclid loop, and the FractionArray against
+a list of Fractions.
+"""
+import random
+import sys
+import timeit
+import tracemalloc
+
+from Chapter_1.fraction import Fraction, bounded_precision, fprod, fsum
+from Chapter_1.fraction_array import FractionArray, np
+
+
+def gcd(m, n):
+    """The original Euclid's algorithm loop from Chapter_1.fraction."""
+    while m % n != 0:
+        previous_m = m
+        previous_n = n
+
+        m = previous_n
+        n = previous_m % previous_n
+    return n
+
+
+class LegacyFraction:
+    """The original Fraction; every result is rebuilt through __init__."""
+    def __init__(self, numerator, denominator):
+        if not isinstance(numerator, int) or not isinstance(denominator, int):
+            raise TypeError('Both the numerator and denominator must be ints.')
+
+        if denominator < 0:
+            numerator = -numerator
+            denominator = abs(denominator)
+
+        greatest_common_denominator = abs(gcd(numerator, denominator))
+        self.numerator = numerator // greatest_common_denominator
+        self.denominator = denominator // greatest_common_denominator
+
+    def __add__(self, other_fraction):
+        new_numerator = (self.numerator * other_fraction.denominator
+                         + self.denominator * other_fraction.numerator)
+        new_denominator = self.denominator * other_fraction.denominator
+        return LegacyFraction(new_numerator, new_denominator)
+
+    def __mul__(self, other_fraction):
+        new_numerator = self.numerator * other_fraction.numerator
+        new_denominator = self.denominator * other_fraction.denominator
+        return LegacyFraction(new_numerator, new_denominator)
+
+
+def allocated_bytes(cls, pairs):
+    """Returns the bytes allocated while building one instance per pair."""
+    tracemalloc.start()
+    instances = [cls(numerator, denominator)
+                 for numerator, denominator in pairs]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size
+
+
+def add_all(fractions):
+    total = fractions[0]
+    for fraction in fractions[1:]:
+        total = total + fraction
+    return total
+
+
+def logistic_map(steps):
+    """Iterates x -> r*x*(1 - x); exact denominators square every step."""
+    r, x = Fraction(7, 2), Fraction(1, 3)
+    for _ in range(steps):
+        x = r * x * (1 - x)
+    return x
+
+
+def multiply_all(fractions):
+    total = fractions[0]
+    for fraction in fractions[1:]:
+        total = total * fraction
+    return total
+
+
+def multiply_pairs(fractions):
+    return [a * b for a, b in zip(fractions, fractions[1:])]
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    number = 10
+    pairs = [(random.randint(-1000, 1000), random.randint(1, 1000))
+             for _ in range(10000)]
+    new = [Fraction(n, d) for n, d in pairs]
+    legacy = [LegacyFraction(n, d) for n, d in pairs]
+
+    print("\nSize of a single instance.")
+    print("Fraction:       ", sys.getsizeof(new[0]), "bytes.")
+    print("LegacyFraction: ", sys.getsizeof(legacy[0])
+          + sys.getsizeof(legacy[0].__dict__), "bytes (object + __dict__).")
+
+    print("\nMemory allocated for {:,} instances.".format(len(pairs)))
+    print("Fraction:       ", allocated_bytes(Fraction, pairs), "bytes.")
+    print("LegacyFraction: ", allocated_bytes(LegacyFraction, pairs), "bytes.")
+
+    for name, function, items in (("Sum of", add_all, pairs[:500]),
+                                  ("Pairwise products of", multiply_pairs,
+                                   pairs)):
+        print("\n{} {:,} fractions.".format(name, len(items)))
+        for label, cls in (("Fraction", Fraction),
+                           ("LegacyFraction", LegacyFraction)):
+            fractions = [cls(n, d) for n, d in items]
+            seconds = timeit.timeit(lambda: function(fractions),
+                                    number=number)
+            print("{:<16}".format(label + ":"),
+                  "{:.3f} milliseconds per call.".format(
+                      1000 * seconds / number))
+
+    print("\nSum and product of 2,000 fractions.")
+    fractions = new[:2000]
+    for label, function in (("fsum:", lambda: fsum(fractions)),
+                            ("+ operator:", lambda: add_all(fractions)),
+                            ("fprod:", lambda: fprod(fractions)),
+                            ("* operator:", lambda: multiply_all(fractions))):
+        seconds = timeit.timeit(function, number=number)
+        print("{:<16}".format(label),
+              "{:.3f} milliseconds per call.".format(1000 * seconds / number))
+
+    print("\nSum of 10,000 mixed ints and fractions.")
+    mixed = [value if index % 2 else value.numerator
+             for index, value in enumerate(new)]
+    for label, function in (("int operands:", lambda: add_all(mixed)),
+                            ("Fraction(n, 1):",
+                             lambda: add_all([value
+                                              if isinstance(value, Fraction)
+                                              else Fraction(value, 1)
+                                              for value in mixed]))):
+        seconds = timeit.timeit(function, number=number)
+        print("{:<16}".format(label),
+              "{:.3f} milliseconds per call.".format(1000 * seconds / number))
+
+    print("\nLogistic map, exact and with a bounded denominator.")
+    for steps in (8, 11, 14):
+        start = timeit.default_timer()
+        exact = logistic_map(steps)
+        exact_seconds = timeit.default_timer() - start
+        with bounded_precision(10**12):
+            start = timeit.default_timer()
+            bounded = logistic_map(steps)
+            bounded_seconds = timeit.default_timer() - start
+        print("{} steps: exact {:.3f} ms ({:,} denominator bits), "
+              "bounded {:.3f} ms ({} bits).".format(
+                  steps, 1000 * exact_seconds,
+                  exact.denominator.bit_length(),
+                  1000 * bounded_seconds, bounded.denominator.bit_length()))
+
+    if np is None:
+        print("\nNumPy is not installed; skipping the FractionArray timings.")
+    else:
+        size = 10**6
+        numerators = np.random.randint(1, 1000, size)
+        numerators[::2] *= -1
+        denominators = np.random.randint(1, 1000, size)
+        left = FractionArray(numerators, denominators)
+        right = FractionArray(numerators[::-1], denominators[::-1])
+        left_list, right_list = left.to_fractions(), right.to_fractions()
+
+        print("\nElementwise operations on {:,} fractions.".format(size))
+        for name, operation in (("Addition", "__add__"),
+                                ("Multiplication", "__mul__"),
+                                ("Division", "__truediv__"),
+                                ("Less than", "__lt__")):
+            array_seconds = timeit.timeit(
+                lambda: getattr(left, operation)(right), number=1)
+            list_seconds = timeit.timeit(
+                lambda: [getattr(a, operation)(b)
+                         for a, b in zip(left_list, right_list)],
+                number=1)
+            print("{:<16}".format(name + ":"),
+                  "FractionArray {:.1f} ms, list of Fraction {:.1f} "
+                  "ms.".format(1000 * array_seconds, 1000 * list_seconds))
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Integer kernels shared by the Fraction class and the other exercises: greatest
+common divisor, least common multiple, the extended Euclidean algorithm and
+modular inverses.
+
+gcd() and lcm() are the C implementations from the math module, which are
+the fastest choice for ints of every size. binary_gcd() and lehmer_gcd() are
+pure Python versions of the two classic alternatives to Euclid's algorithm
+for very large ints, and gcd_many() computes gcds elementwise over whole
+arrays.
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Greatest common divisor and least common multiple; both are non-negative
+# and gcd(0, 0) == 0.
+gcd = math.gcd
+lcm = math.lcm
+
+# Number of leading bits simulated with single precision ints by Lehmer's
+# algorithm.
+_LEHMER_BITS = 62
+
+
+def binary_gcd(m, n):
+    """
+    Returns the greatest common divisor of m and n with Stein's binary
+    algorithm, which only needs shifts and subtractions.
+
+    Variables
+    ---------
+    m, int
+    n, int
+    """
+    m, n = abs(m), abs(n)
+    if m == 0:
+        return n
+    if n == 0:
+        return m
+    # Power of two common to m and n.
+    shift = ((m | n) & -(m | n)).bit_length() - 1
+    m >>= (m & -m).bit_length() - 1
+    while n:
+        n >>= (n & -n).bit_length() - 1
+        if m > n:
+            m, n = n, m
+        n -= m
+    return m << shift
+
+
+def lehmer_gcd(m, n):
+    """
+    Returns the greatest common divisor of m and n with Lehmer's algorithm.
+
+    Euclid's algorithm is run on the leading bits of m and n only, and the
+    resulting quotients are applied to the full ints in a single step, so
+    most division steps avoid multi-precision arithmetic.
+
+    Variables
+    ---------
+    m, int
+    n, int
+    """
+    m, n = abs(m), abs(n)
+    if m < n:
+        m, n = n, m
+    while n.bit_length() > _LEHMER_BITS:
+        shift = m.bit_length() - _LEHMER_BITS
+        x, y = m >> shift, n >> shift
+        a, b, c, d = 1, 0, 0, 1
+        # Simulate Euclid on the leading bits while the quotient is certain.
+        while y + c != 0 and y + d != 0:
+            q = (x + a) // (y + c)
+            if q != (x + b) // (y + d):
+                break
+            a, c = c, a - q * c
+            b, d = d, b - q * d
+            x, y = y, x - q * y
+        if b == 0:
+            # No quotient could be determined; take a full division step.
+            m, n = n, m % n
+        else:
+            m, n = a * m + b * n, c * m + d * n
+    while n:
+        m, n = n, m % n
+    return m
+
+
+def extended_gcd(a, b):
+    """
+    Returns (g, x, y) where g is the greatest common divisor of a and b and
+    a * x + b * y == g.
+
+    Variables
+    ---------
+    a, int
+    b, int
+    """
+    old_r, r = a, b
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_x, x = x, old_x - q * x
+        old_y, y = y, old_y - q * y
+    if old_r < 0:
+        return -old_r, -old_x, -old_y
+    return old_r, old_x, old_y
+
+
+def mod_inverse(a, modulus):
+    """
+    Returns the x in [0, modulus) with a * x == 1 modulo modulus.
+
+    Raises ValueError if a and modulus are not coprime.
+
+    Variables
+    ---------
+    a, int
+    modulus, int
+    """
+    try:
+        return pow(a, -1, modulus)
+    except ValueError:
+        raise ValueError('{} has no inverse modulo {}.'.format(a, modulus))
+
+
+def gcd_many(left, right):
+    """
+    Returns the elementwise greatest common divisors of two equally long
+    sequences of ints. NumPy arrays are handled by numpy.gcd, and a NumPy
+    array is returned; otherwise a list is returned.
+
+    Variables
+    ---------
+    left, sequence of int
+    right, sequence of int
+    """
+    if np is not None and (isinstance(left, np.ndarray)
+                           or isinstance(right, np.ndarray)):
+        return np.gcd(left, right)
+    if len(left) != len(right):
+        raise ValueError('Both sequences must be of equal length.')
+    return list(map(gcd, left, right))
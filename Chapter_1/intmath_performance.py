@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Script compares the gcd kernels in intmath with the Python level Euclid loop
+that Chapter_1.fraction used to provide, for operands of 10, 100 and 10,000
+digits.
+"""
+import random
+import timeit
+
+from Chapter_1 import intmath
+
+
+def euclid_gcd(m, n):
+    """The original Euclid's algorithm loop from Chapter_1.fraction."""
+    while m % n != 0:
+        previous_m = m
+        previous_n = n
+
+        m = previous_n
+        n = previous_m % previous_n
+    return n
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    kernels = (("Euclid loop", euclid_gcd),
+               ("math.gcd", intmath.gcd),
+               ("binary_gcd", intmath.binary_gcd),
+               ("lehmer_gcd", intmath.lehmer_gcd))
+
+    for digits in (10, 100, 10000):
+        # Operands share a common factor so the result is not trivially 1.
+        # The cofactors are scaled down first, so the products have about
+        # `digits` digits and keep the factor.
+        factor = random.randrange(10**(digits // 4), 10**(digits // 4 + 1))
+        scale = 10**(digits - digits // 4 - 1)
+        pairs = [(factor * random.randrange(scale // 10, scale),
+                  factor * random.randrange(scale // 10, scale))
+                 for _ in range(10)]
+        assert all(intmath.gcd(m, n) % factor == 0 for m, n in pairs)
+        number = 1 if digits >= 10000 else 1000
+        print("\nGcd of {:,} digit operands.".format(digits))
+        for name, kernel in kernels:
+            results = [kernel(m, n) for m, n in pairs]
+            assert results == [intmath.gcd(m, n) for m, n in pairs]
+            seconds = timeit.timeit(
+                lambda: [kernel(m, n) for m, n in pairs], number=number)
+            print("{:<12}".format(name + ":"),
+                  "{:.3f} microseconds per gcd.".format(
+                      10**6 * seconds / (number * len(pairs))))
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 """
 Module contains the building blocks to create boolean circuits. Specifically,
-there are AND, OR, and NOT logic gate classes, as well as a Connector class
-that routes the output of one logic gate into the input of another gate.
+there are AND, OR, NOT, NAND, NOR and XOR logic gate classes, as well as a
+Connector class that routes the output of one logic gate into the input of
+another gate.
+InputPin instances are named primary inputs whose values are set by the
+program rather than typed in by the user, ConstantGate instances are signals
+tied to 0 or 1, and DFlipFlop and Register instances store state from one
+clock edge to the next.
 
 Jose Vargas 4/28/2018
 """
@@ -37,8 +42,98 @@ class LogicGate:
         return self.output
 
 
+class InputPin(LogicGate):
+    """
+    A named primary input of a circuit. Its output is the value bound to it
+    with set_value(), so that the gates it is connected to do not prompt the
+    user for their inputs.
+    """
+    operation = 'INPUT'
+    pin_names = ()
+
+    def __init__(self, label, value=None):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        label, string
+        value, int; default = None
+            0 or 1.
+        """
+        super().__init__(label)
+        self.value = None
+        if value is not None:
+            self.set_value(value)
+
+    def set_value(self, value):
+        """
+        Binds a value to the input.
+
+        Variables
+        ---------
+        value, int
+            0 or 1.
+        """
+        if value not in (0, 1):
+            raise ValueError("INPUT {} MUST BE 0 OR 1".format(
+                self.get_label()))
+        self.value = int(value)
+
+    def get_pins(self):
+        """An InputPin has no pins."""
+        return []
+
+    def set_next_pin(self, connection_source):
+        raise RuntimeError("INPUT {} HAS NO PINS".format(self.get_label()))
+
+    def perform_gate_logic(self):
+        """Returns the bound value."""
+        if self.value is None:
+            raise RuntimeError("NO VALUE BOUND TO INPUT "
+                               "{}".format(self.get_label()))
+        return self.value
+
+
+class ConstantGate(LogicGate):
+    """
+    A signal tied to 0 or 1. Unlike an InputPin it is not a primary input;
+    it compiles to a CONST0 or CONST1 instruction.
+    """
+    pin_names = ()
+
+    def __init__(self, label, value):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        label, string
+        value, int
+            0 or 1.
+        """
+        super().__init__(label)
+        if value not in (0, 1):
+            raise ValueError("CONSTANT {} MUST BE 0 OR 1".format(label))
+        self.value = int(value)
+        self.operation = 'CONST1' if self.value else 'CONST0'
+
+    def get_pins(self):
+        """A ConstantGate has no pins."""
+        return []
+
+    def set_next_pin(self, connection_source):
+        raise RuntimeError("CONSTANT {} HAS NO PINS".format(self.get_label()))
+
+    def perform_gate_logic(self):
+        """Returns the constant value."""
+        return self.value
+
+
 class BinaryGate(LogicGate):
     """For logic gates that have two inputs."""
+    pin_names = ('pin_a', 'pin_b')
+
     def __init__(self, label):
         """
         Constructor.
@@ -75,6 +170,10 @@ class BinaryGate(LogicGate):
         else:
             return self.pin_b.get_from().get_output()
 
+    def get_pins(self):
+        """Returns the Connectors of pins A and B; None if unconnected."""
+        return [self.pin_a, self.pin_b]
+
     def set_next_pin(self, connection_source):
         """
         Connects an open pin to the output of another logic gate via
@@ -97,6 +196,8 @@ class BinaryGate(LogicGate):
 
 class UnaryGate(LogicGate):
     """For logic gates that have one input."""
+    pin_names = ('pin',)
+
     def __init__(self, label):
         """
         Constructor.
@@ -120,6 +221,10 @@ class UnaryGate(LogicGate):
         else:
             return self.pin.get_from().get_output()
 
+    def get_pins(self):
+        """Returns the Connector of the pin; None if unconnected."""
+        return [self.pin]
+
     def set_next_pin(self, connection_source):
         """
         Connects the open pin to the output of another logic gate via
@@ -138,6 +243,8 @@ class UnaryGate(LogicGate):
 
 class AndGate(BinaryGate):
     """If one or more of the inputs is 0, the logic gate returns 0."""
+    operation = 'AND'
+
     def __init__(self, label):
         """
         Constructor.
@@ -150,16 +257,66 @@ class AndGate(BinaryGate):
 
     def perform_gate_logic(self):
         """Computes the output given two user inputs."""
-        self.get_pin_a()
-        self.get_pin_b()
+        pin_a = self.get_pin_a()
+        pin_b = self.get_pin_b()
 
-        if self.pin_a and self.pin_b == 1:
+        if pin_a == 1 and pin_b == 1:
             return 1
         return 0
 
 
 class OrGate(BinaryGate):
     """If one or more of the inputs is 1, the logic gate returns 1."""
+    operation = 'OR'
+
+    def __init__(self, label):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        label, string
+        """
+        super().__init__(label)
+
+    def perform_gate_logic(self):
+        """Computes the output given two user inputs."""
+        pin_a = self.get_pin_a()
+        pin_b = self.get_pin_b()
+
+        if pin_a == 1 or pin_b == 1:
+            return 1
+        return 0
+
+
+class NandGate(BinaryGate):
+    """If one or more of the inputs is 0, the logic gate returns 1."""
+    operation = 'NAND'
+
+    def __init__(self, label):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        label, string
+        """
+        super().__init__(label)
+
+    def perform_gate_logic(self):
+        """Computes the output given two user inputs."""
+        pin_a = self.get_pin_a()
+        pin_b = self.get_pin_b()
+
+        if pin_a == 1 and pin_b == 1:
+            return 0
+        return 1
+
+
+class NorGate(BinaryGate):
+    """If one or more of the inputs is 1, the logic gate returns 0."""
+    operation = 'NOR'
+
     def __init__(self, label):
         """
         Constructor.
@@ -172,16 +329,42 @@ class OrGate(BinaryGate):
 
     def perform_gate_logic(self):
         """Computes the output given two user inputs."""
-        self.get_pin_a()
-        self.get_pin_b()
+        pin_a = self.get_pin_a()
+        pin_b = self.get_pin_b()
 
-        if self.pin_a or self.pin_b == 1:
+        if pin_a == 1 or pin_b == 1:
+            return 0
+        return 1
+
+
+class XorGate(BinaryGate):
+    """If exactly one of the inputs is 1, the logic gate returns 1."""
+    operation = 'XOR'
+
+    def __init__(self, label):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        label, string
+        """
+        super().__init__(label)
+
+    def perform_gate_logic(self):
+        """Computes the output given two user inputs."""
+        pin_a = self.get_pin_a()
+        pin_b = self.get_pin_b()
+
+        if pin_a != pin_b:
             return 1
         return 0
 
 
 class NotGate(UnaryGate):
     """Return the opposite value of the input."""
+    operation = 'NOT'
+
     def __init__(self, label):
         """
         Constructor.
@@ -194,13 +377,127 @@ class NotGate(UnaryGate):
 
     def perform_gate_logic(self):
         """Computes the output given a user input."""
-        self.get_pin()
-
-        if self.pin == 0:
+        if self.get_pin() == 0:
             return 1
         return 0
 
 
+class DFlipFlop(UnaryGate):
+    """
+    A clocked D flip-flop. Its output is the stored state, and its pin is
+    the D input, which is only read on a clock edge; see clock().
+
+    Since the output does not depend on the current input, feedback loops
+    through flip-flops are allowed.
+    """
+    operation = 'DFF'
+
+    def __init__(self, label, state=0):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        label, string
+        state, int; default = 0
+            Initial state, 0 or 1.
+        """
+        super().__init__(label)
+        if state not in (0, 1):
+            raise ValueError("STATE OF {} MUST BE 0 OR 1".format(label))
+        self.initial_state = int(state)
+        self.state = self.initial_state
+        self.next_state = None
+
+    def capture(self):
+        """Reads the D input, to be stored by the next call to update()."""
+        self.next_state = self.get_pin()
+
+    def update(self):
+        """Stores the value read by capture()."""
+        if self.next_state is None:
+            raise RuntimeError("NO VALUE CAPTURED BY "
+                               "{}".format(self.get_label()))
+        self.state = self.next_state
+        self.next_state = None
+
+    def reset(self):
+        """Restores the initial state."""
+        self.state = self.initial_state
+        self.next_state = None
+
+    def perform_gate_logic(self):
+        """Returns the stored state."""
+        return self.state
+
+
+class Register:
+    """
+    A group of D flip-flops clocked together, which stores an unsigned
+    int; flip-flop i holds bit i.
+    """
+    def __init__(self, label, width, value=0):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        label, string
+        width, int
+            Number of bits.
+        value, int; default = 0
+            Initial value.
+        """
+        if not 0 <= value < 1 << width:
+            raise ValueError("VALUE OF {} MUST FIT IN {} BITS".format(
+                label, width))
+        self.label = label
+        self.flip_flops = [DFlipFlop("{}[{}]".format(label, i),
+                                     (value >> i) & 1)
+                           for i in range(width)]
+
+    def get_label(self):
+        return self.label
+
+    def connect_inputs(self, gates):
+        """
+        Connects the output of gates[i] to the D input of flip-flop i.
+
+        Variables
+        ---------
+        gates, sequence of LogicGate
+        """
+        if len(gates) != len(self.flip_flops):
+            raise RuntimeError("{} NEEDS {} INPUTS".format(
+                self.label, len(self.flip_flops)))
+        for gate, flip_flop in zip(gates, self.flip_flops):
+            Connector(gate, flip_flop)
+
+    def get_value(self):
+        """Returns the stored value."""
+        return sum(flip_flop.state << i
+                   for i, flip_flop in enumerate(self.flip_flops))
+
+
+def clock(*flip_flops):
+    """
+    Applies one clock edge: every flip-flop first reads its D input, and
+    only then are the new states stored, so flip-flops that feed each other
+    all see the states from before the edge.
+
+    Variables
+    ---------
+    flip_flops, DFlipFlop or Register instances
+    """
+    members = []
+    for element in flip_flops:
+        members.extend(getattr(element, 'flip_flops', [element]))
+    for flip_flop in members:
+        flip_flop.capture()
+    for flip_flop in members:
+        flip_flop.update()
+
+
 class Connector:
     """
     Connects the output of one logic gate to the input of another gate.
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Reads and writes compiled logic circuits as netlists, in a BLIF-like text
+format and in a compact binary format.
+
+Building a large circuit from LogicGate and Connector objects costs several
+Python objects and method calls per gate and wire, before it can even be
+compiled. The loaders in this module build the flat CompiledCircuit
+representation directly instead, so netlists of hundreds of thousands of
+gates can be cached on disk and reloaded quickly.
+
+Text format, one statement per line; # starts a comment:
+
+    .model full_adder
+    .inputs a b cin
+    .outputs sum cout
+    .gate XOR half a b
+    .gate XOR sum half cin
+    .gate AND carry1 a b
+    .gate AND carry2 half cin
+    .gate OR cout carry1 carry2
+    .end
+
+Each .gate line gives the operation, the name of the signal the gate drives
+and the names of its input signals. AND, OR, NAND, NOR, XOR and XNOR gates
+take any number of inputs, NOT and BUF exactly one, and CONST0 and CONST1
+none. Gates may be listed in any order.
+
+Binary format, all integers little endian: the header MAGIC, a uint16
+format version and the uint32 numbers of inputs, gates, operands and
+outputs; a uint32 byte count followed by the UTF-8 input and output names,
+separated by newlines; then one uint8 operation code and one uint32 operand
+count per gate, every operand slot and every output slot as uint32 arrays.
+"""
+import array
+import struct
+import sys
+
+from Chapter_1.circuit_compiler import ARITIES, CompiledCircuit
+
+MAGIC = b'NETL'
+VERSION = 1
+
+# Operation codes of the binary format.
+OPERATIONS = ('AND', 'OR', 'NOT', 'NAND', 'NOR', 'XOR', 'XNOR', 'BUF',
+              'CONST0', 'CONST1')
+_OPERATION_CODES = {operation: code
+                    for code, operation in enumerate(OPERATIONS)}
+
+_HEADER = struct.Struct('<4sHIIII')
+_LENGTH = struct.Struct('<I')
+
+
+def _check_arity(operation, count, line_number):
+    """Raises ValueError if operation can not take count operands."""
+    if operation not in ARITIES:
+        raise ValueError('Line {}: unknown gate operation {}.'.format(
+            line_number, operation))
+    arity = ARITIES[operation]
+    if arity is None and count == 0 or arity is not None and count != arity:
+        raise ValueError('Line {}: wrong number of inputs for {}.'.format(
+            line_number, operation))
+
+
+def _gate_order(gates, definitions):
+    """
+    Returns the indices of the gates in topological order. Gates that are
+    already in order, as written by format_netlist(), are returned as is.
+
+    Variables
+    ---------
+    gates, list of (str, str, list of str, int)
+        Operation, output name, input names and line number of each gate.
+    definitions, dict
+        Index of the gate driving each signal that is not a primary input.
+    """
+    defined = set()
+    for index, (_, _, operands, _) in enumerate(gates):
+        if any(name in definitions and definitions[name] not in defined
+               for name in operands):
+            break
+        defined.add(index)
+    else:
+        return range(len(gates))
+
+    order = []
+    state = {}  # Gate index -> False while visiting, True once ordered.
+    for root in range(len(gates)):
+        stack = [(root, False)]
+        while stack:
+            index, expanded = stack.pop()
+            if expanded:
+                state[index] = True
+                order.append(index)
+                continue
+            if index in state:
+                if not state[index]:
+                    raise ValueError('The netlist contains a loop through '
+                                     '{}.'.format(gates[index][1]))
+                continue
+            state[index] = False
+            stack.append((index, True))
+            for name in reversed(gates[index][2]):
+                if name in definitions:
+                    stack.append((definitions[name], False))
+    return order
+
+
+def parse_netlist(lines):
+    """
+    Returns the CompiledCircuit described by a netlist in the text format,
+    given as an iterable of lines (such as a text file) or a single string.
+
+    Variables
+    ---------
+    lines, str or iterable of str
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    inputs = []
+    output_names = []
+    gates = []
+    for line_number, line in enumerate(lines, 1):
+        fields = line.partition('#')[0].split()
+        if not fields:
+            continue
+        keyword = fields[0]
+        if keyword == '.gate':
+            if len(fields) < 3:
+                raise ValueError('Line {}: expected .gate OPERATION OUTPUT '
+                                 'INPUTS.'.format(line_number))
+            operation = fields[1].upper()
+            _check_arity(operation, len(fields) - 3, line_number)
+            gates.append((operation, fields[2], fields[3:], line_number))
+        elif keyword == '.inputs':
+            inputs.extend(fields[1:])
+        elif keyword == '.outputs':
+            output_names.extend(fields[1:])
+        elif keyword == '.end':
+            break
+        elif keyword != '.model':
+            raise ValueError('Line {}: unknown statement {}.'.format(
+                line_number, keyword))
+
+    slots = {name: slot for slot, name in enumerate(inputs)}
+    if len(slots) != len(inputs):
+        raise ValueError('Input names must be unique.')
+    definitions = {}
+    for index, (_, name, _, line_number) in enumerate(gates):
+        if name in slots or name in definitions:
+            raise ValueError('Line {}: signal {} is driven twice.'.format(
+                line_number, name))
+        definitions[name] = index
+
+    instructions = []
+    for index in _gate_order(gates, definitions):
+        operation, name, operands, line_number = gates[index]
+        try:
+            instructions.append(
+                (operation, tuple([slots[operand] for operand in operands])))
+        except KeyError as error:
+            raise ValueError('Line {}: signal {} is not driven.'.format(
+                line_number, error.args[0]))
+        slots[name] = len(slots)
+
+    try:
+        outputs = [slots[name] for name in output_names]
+    except KeyError as error:
+        raise ValueError('Output {} is not driven.'.format(error.args[0]))
+    return CompiledCircuit(inputs, instructions, outputs, output_names)
+
+
+def format_netlist(circuit, model='circuit'):
+    """
+    Returns a CompiledCircuit as a netlist in the text format.
+
+    The gate driving an output is named after the output; other gates are
+    named n<slot>. An output that is a primary input, or shares its slot
+    with an earlier output, is driven by an extra BUF gate.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    model, str; default = 'circuit'
+    """
+    names = list(circuit.inputs) + [None] * len(circuit.instructions)
+    used = set(circuit.inputs) | set(circuit.output_names)
+    if len(used) != len(circuit.inputs) + len(circuit.output_names):
+        raise ValueError('Input and output names must be unique.')
+    if any(len(name.split()) != 1 or '#' in name for name in used):
+        raise ValueError('Names must not contain whitespace or #.')
+
+    buffers = []
+    for name, slot in zip(circuit.output_names, circuit.outputs):
+        if names[slot] is None:
+            names[slot] = name
+        else:
+            buffers.append((name, slot))
+    for slot, name in enumerate(names):
+        if name is None:
+            name = 'n{}'.format(slot)
+            while name in used:
+                name = '_' + name
+            names[slot] = name
+
+    lines = ['.model {}'.format(model),
+             '.inputs {}'.format(' '.join(circuit.inputs)),
+             '.outputs {}'.format(' '.join(circuit.output_names))]
+    for slot, (operation, operands) in enumerate(circuit.instructions,
+                                                 len(circuit.inputs)):
+        lines.append(' '.join(['.gate', operation, names[slot]]
+                              + [names[operand] for operand in operands]))
+    for name, slot in buffers:
+        lines.append('.gate BUF {} {}'.format(name, names[slot]))
+    lines.append('.end\n')
+    return '\n'.join(lines)
+
+
+def _uint32_array(values):
+    """Returns values as a uint32 array in little endian byte order."""
+    values = array.array('I', values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def encode_netlist(circuit):
+    """
+    Returns the binary encoding of a CompiledCircuit.
+
+    Variables
+    ---------
+    circuit, CompiledCircuit
+    """
+    names = list(circuit.inputs) + list(circuit.output_names)
+    if any('\n' in name for name in names):
+        raise ValueError('Names must not contain newlines.')
+    encoded_names = '\n'.join(names).encode('utf-8')
+    try:
+        codes = bytes(_OPERATION_CODES[operation]
+                      for operation, _ in circuit.instructions)
+    except KeyError as error:
+        raise ValueError('Unknown gate operation {}.'.format(error.args[0]))
+    counts = _uint32_array([len(operands)
+                            for _, operands in circuit.instructions])
+    operands = _uint32_array([slot for _, slot_tuple in circuit.instructions
+                              for slot in slot_tuple])
+    return b''.join((
+        _HEADER.pack(MAGIC, VERSION, len(circuit.inputs),
+                     len(circuit.instructions), len(operands),
+                     len(circuit.outputs)),
+        _LENGTH.pack(len(encoded_names)), encoded_names,
+        codes, counts.tobytes(), operands.tobytes(),
+        _uint32_array(circuit.outputs).tobytes()))
+
+
+def decode_netlist(data):
+    """
+    Returns the CompiledCircuit encoded in data by encode_netlist().
+
+    Variables
+    ---------
+    data, bytes-like
+    """
+    data = memoryview(data)
+    if len(data) < _HEADER.size + _LENGTH.size:
+        raise ValueError('Truncated netlist data.')
+    (magic, version, number_of_inputs, number_of_gates, number_of_operands,
+     number_of_outputs) = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('Not a binary netlist.')
+    if version != VERSION:
+        raise ValueError('Unsupported netlist version {}.'.format(version))
+    offset = _HEADER.size
+    (names_length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+
+    sections = []
+    for length in (names_length, number_of_gates, 4 * number_of_gates,
+                   4 * number_of_operands, 4 * number_of_outputs):
+        sections.append(data[offset:offset + length])
+        offset += length
+    if offset != len(data):
+        raise ValueError('Truncated netlist data.')
+    encoded_names, codes = sections[:2]
+    counts, operands, outputs = [array.array('I') for _ in range(3)]
+    for values, section in zip((counts, operands, outputs), sections[2:]):
+        values.frombytes(section)
+        if sys.byteorder == 'big':
+            values.byteswap()
+
+    names = (str(encoded_names, 'utf-8').split('\n')
+             if number_of_inputs + number_of_outputs else [])
+    if len(names) != number_of_inputs + number_of_outputs:
+        raise ValueError('Corrupt netlist names.')
+    try:
+        operations = [OPERATIONS[code] for code in codes]
+    except IndexError:
+        raise ValueError('Corrupt netlist operation codes.')
+    operands = operands.tolist()
+    instructions = []
+    start = 0
+    for slot, (operation, count) in enumerate(zip(operations, counts),
+                                              number_of_inputs):
+        slots = tuple(operands[start:start + count])
+        if slots and max(slots) >= slot:
+            raise ValueError('Corrupt netlist operands.')
+        instructions.append((operation, slots))
+        start += count
+    if start != number_of_operands:
+        raise ValueError('Corrupt netlist operand counts.')
+    if any(slot >= number_of_inputs + number_of_gates for slot in outputs):
+        raise ValueError('Corrupt netlist outputs.')
+    return CompiledCircuit(names[:number_of_inputs], instructions,
+                           outputs.tolist(), names[number_of_inputs:])
+
+
+def save_netlist(path, circuit, binary=False):
+    """
+    Writes a CompiledCircuit to a file, as a text netlist or, if binary is
+    True, in the binary format.
+
+    Variables
+    ---------
+    path, str
+    circuit, CompiledCircuit
+    binary, bool; default = False
+    """
+    if binary:
+        with open(path, 'wb') as netlist_file:
+            netlist_file.write(encode_netlist(circuit))
+    else:
+        with open(path, 'w') as netlist_file:
+            netlist_file.write(format_netlist(circuit))
+
+
+def load_netlist(path):
+    """
+    Returns the CompiledCircuit in a netlist file written by save_netlist(),
+    in either format.
+
+    Variables
+    ---------
+    path, str
+    """
+    with open(path, 'rb') as netlist_file:
+        data = netlist_file.read()
+    if data[:len(MAGIC)] == MAGIC:
+        return decode_netlist(data)
+    return parse_netlist(data.decode('utf-8'))
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Compiles and simulates sequential circuits: networks of logic gates with
+DFlipFlops and Registers that change state on every clock edge.
+
+compile_sequential() cuts the circuit at its flip-flops. What remains is one
+combinational circuit from the primary inputs and the current flip-flop
+states to the outputs and the next flip-flop states, which circuit_compiler
+turns into straight-line code in topological order.
+
+CycleSimulator then generates one Python function that runs whole stretches
+of clock cycles in a single loop: inputs, states and gate outputs are local
+variables, every gate is one line of code, and the clock edge is a single
+tuple assignment. That avoids a function call and a list per cycle, and
+simulates millions of cycles of small circuits per minute.
+
+Waveforms of selected signals are captured one packed int per cycle and
+either kept in memory or, given a stream, written to a binary trace file
+every TRACE_CHUNK cycles as the simulation runs, so long runs only ever
+hold one chunk of records. A trace file holds the header TRACE_MAGIC, a
+uint16 format version, the uint32 number of signals, and a uint32 byte count
+followed by the UTF-8 signal names separated by newlines; then one record
+per cycle of ceil(signals / 8) bytes, little endian, with bit i holding
+signal i.
+"""
+import itertools
+import struct
+
+from Chapter_1.circuit_compiler import EXPRESSIONS, CircuitCompiler
+
+TRACE_MAGIC = b'WAVE'
+TRACE_VERSION = 1
+
+# Number of cycles of trace records held in memory before they are written
+# to a trace stream.
+TRACE_CHUNK = 1 << 14
+
+_TRACE_HEADER = struct.Struct('<4sHII')
+
+
+class SequentialCircuit:
+    """
+    A sequential circuit as a combinational CompiledCircuit plus state.
+
+    The combinational circuit takes the primary inputs and the states, in
+    any order, and returns the outputs followed by the next state of every
+    flip-flop, in the order of states.
+
+    Variables
+    ---------
+    combinational, CompiledCircuit
+    states, list of str
+        Names of the flip-flops.
+    initial_state, list of int
+    number_of_outputs, int
+    """
+    def __init__(self, combinational, states, initial_state,
+                 number_of_outputs):
+        self.combinational = combinational
+        self.states = list(states)
+        self.initial_state = list(initial_state)
+        state_names = set(self.states)
+        self.inputs = [name for name in combinational.inputs
+                       if name not in state_names]
+        self.output_names = combinational.output_names[:number_of_outputs]
+        self.number_of_outputs = number_of_outputs
+        if len(self.states) != len(self.initial_state) or len(
+                combinational.outputs) != number_of_outputs + len(self.states):
+            raise ValueError('Expected one next state per state.')
+
+    @property
+    def gate_count(self):
+        return self.combinational.gate_count
+
+    def levels(self):
+        """
+        Returns the logic level of every gate, in slot order: gates fed only
+        by inputs and states are on level 1, and every other gate one level
+        above its highest operand.
+        """
+        number_of_inputs = len(self.combinational.inputs)
+        depths = [0] * number_of_inputs
+        for _, operands in self.combinational.instructions:
+            depths.append(1 + max((depths[operand] for operand in operands),
+                                  default=0))
+        return depths[number_of_inputs:]
+
+
+def compile_sequential(*output_gates, flip_flops=()):
+    """
+    Returns the SequentialCircuit of the output gates and of every
+    flip-flop upstream of them.
+
+    Variables
+    ---------
+    output_gates, LogicGate instances
+    flip_flops, sequence of DFlipFlop or Register; default = ()
+        Flip-flops whose states come first, in this order, e.g. so that the
+        states of a Register are in bit order; the others follow in the
+        order they are found.
+    """
+    roots = list(output_gates)
+    found = []
+    for element in flip_flops:
+        found.extend(getattr(element, 'flip_flops', [element]))
+    flip_flops = []
+    seen = set()
+    while True:
+        for flip_flop in found:
+            if id(flip_flop) in seen:
+                continue
+            connector = flip_flop.get_pins()[0]
+            if connector is None:
+                raise ValueError('The D input of {} is not connected.'.format(
+                    flip_flop.get_label()))
+            seen.add(id(flip_flop))
+            flip_flops.append(flip_flop)
+            roots.append(connector.get_from())
+        # The logic feeding the D inputs may reach further flip-flops.
+        found = [gate for gate in CircuitCompiler(*roots).topological_order()
+                 if getattr(gate, 'operation', None) == 'DFF'
+                 and id(gate) not in seen]
+        if not found:
+            break
+
+    # Every state is an input, even one that no gate reads.
+    combinational = CircuitCompiler(*roots, inputs=flip_flops).compile()
+    return SequentialCircuit(
+        combinational, [flip_flop.get_label() for flip_flop in flip_flops],
+        [flip_flop.initial_state for flip_flop in flip_flops],
+        len(output_gates))
+
+
+class CycleSimulator:
+    """
+    Simulates a SequentialCircuit one clock cycle at a time.
+
+    In every cycle the combinational logic is evaluated for the inputs of
+    that cycle and the current state, and then the clock edge stores the
+    next state.
+
+    Variables
+    ---------
+    circuit, SequentialCircuit
+    trace, list of str; default = None
+        Names of the inputs, states and outputs whose values are recorded in
+        every cycle; see waveform().
+    stream, binary file object; default = None
+        If given, the trace header is written to it at once and the records
+        every TRACE_CHUNK cycles, instead of keeping them all in memory.
+    """
+    def __init__(self, circuit, trace=None, stream=None):
+        self.circuit = circuit
+        combinational = circuit.combinational
+        slots = {name: slot for slot, name in enumerate(combinational.inputs)}
+        self._input_slots = [slots[name] for name in circuit.inputs]
+        self._state_slots = [slots[name] for name in circuit.states]
+        self._output_slots = combinational.outputs[:circuit.number_of_outputs]
+        self._next_state_slots = combinational.outputs[
+            circuit.number_of_outputs:]
+
+        signal_slots = dict(slots)
+        for name, slot in zip(circuit.output_names, self._output_slots):
+            signal_slots.setdefault(name, slot)
+        self.trace_names = list(trace or [])
+        try:
+            self._trace_slots = [signal_slots[name]
+                                 for name in self.trace_names]
+        except KeyError as error:
+            raise KeyError('No signal named {}.'.format(error.args[0]))
+        self.records = []
+        self.stream = stream
+        self._record_size = (len(self.trace_names) + 7) // 8
+        if stream is not None:
+            _write_trace_header(stream, self.trace_names)
+
+        self._run = self._generate_function()
+        self.state = list(circuit.initial_state)
+        self.outputs = None
+        self.cycles = 0
+
+    def source(self):
+        """Returns the source code of the generated simulation loop."""
+        def names(slots):
+            return ''.join('s{}, '.format(slot) for slot in slots)
+
+        lines = ['def run(stimulus, state, record):']
+        if self._state_slots:
+            lines.append('    {}= state'.format(names(self._state_slots)))
+        lines.append('    mask = 1')
+        lines.append('    outputs = None')
+        lines.append('    cycles = 0')
+        lines.append('    for cycles, ({}) in enumerate(stimulus, 1):'.format(
+            names(self._input_slots)))
+        number_of_inputs = len(self.circuit.combinational.inputs)
+        for slot, (operation, operands) in enumerate(
+                self.circuit.combinational.instructions, number_of_inputs):
+            lines.append('        s{} = {}'.format(slot, EXPRESSIONS[
+                operation](['s{}'.format(operand) for operand in operands])))
+        if self._trace_slots:
+            lines.append('        record({})'.format(' | '.join(
+                's{} << {}'.format(slot, bit)
+                for bit, slot in enumerate(self._trace_slots))))
+        lines.append('        outputs = ({})'.format(
+            names(self._output_slots)))
+        if self._state_slots:
+            lines.append('        {}= {}'.format(
+                names(self._state_slots), names(self._next_state_slots)))
+        lines.append('    return ({}), outputs, cycles'.format(
+            names(self._state_slots)))
+        return '\n'.join(lines)
+
+    def _generate_function(self):
+        namespace = {}
+        exec(compile(self.source(), '<cycle simulator>', 'exec'), namespace)
+        return namespace['run']
+
+    def _advance(self, stimulus):
+        """Runs the generated loop and returns the last outputs."""
+        if self.stream is None:
+            self._run_cycles(stimulus)
+            return self.outputs
+        # Run TRACE_CHUNK cycles at a time and write their records.
+        stimulus = iter(stimulus)
+        while self._run_cycles(itertools.islice(stimulus, TRACE_CHUNK)):
+            self.stream.write(_pack_records(self.records, self._record_size))
+            del self.records[:]
+        return self.outputs
+
+    def _run_cycles(self, stimulus):
+        """Runs the generated loop and returns the number of cycles run."""
+        state, outputs, cycles = self._run(stimulus, self.state,
+                                           self.records.append)
+        self.state = list(state)
+        self.cycles += cycles
+        if outputs is not None:
+            self.outputs = outputs
+        return cycles
+
+    def run(self, stimulus):
+        """
+        Simulates one cycle per input vector and returns the outputs of the
+        last cycle, as a tuple of 0s and 1s.
+
+        Variables
+        ---------
+        stimulus, iterable of sequences of int
+            Input values of each cycle, in the order of circuit.inputs.
+        """
+        return self._advance(stimulus)
+
+    def run_constant(self, cycles, values=()):
+        """
+        Simulates a number of cycles with the same input values, e.g. a
+        free running counter, and returns the outputs of the last cycle.
+
+        Variables
+        ---------
+        cycles, int
+        values, sequence of int; default = ()
+            Input values, in the order of circuit.inputs.
+        """
+        values = tuple(values)
+        if len(values) != len(self.circuit.inputs):
+            raise ValueError('Expected {} input values, got {}.'.format(
+                len(self.circuit.inputs), len(values)))
+        return self._advance(itertools.repeat(values, cycles))
+
+    def step(self, values=()):
+        """
+        Simulates a single cycle and returns its outputs.
+
+        Variables
+        ---------
+        values, dict or sequence of int; default = ()
+            Input values, by name or in the order of circuit.inputs.
+        """
+        if isinstance(values, dict):
+            try:
+                values = [values[name] for name in self.circuit.inputs]
+            except KeyError as error:
+                raise KeyError('No value for input {}.'.format(error))
+        return self.run_constant(1, values)
+
+    def reset(self):
+        """
+        Restores the initial state and discards the recorded trace; records
+        already written to a stream stay there.
+        """
+        self.state = list(self.circuit.initial_state)
+        self.outputs = None
+        self.cycles = 0
+        self.records = []
+
+    def waveform(self, name):
+        """
+        Returns the recorded values of one traced signal, one per cycle.
+        Records written to a stream are not kept; read them back with
+        read_trace().
+
+        Variables
+        ---------
+        name, str
+        """
+        if self.stream is not None:
+            raise RuntimeError('The trace is written to a stream.')
+        bit = self.trace_names.index(name)
+        return [(record >> bit) & 1 for record in self.records]
+
+    def write_trace(self, stream):
+        """
+        Writes the waveforms recorded in memory to a binary stream in the
+        trace format, and returns the number of cycles written.
+
+        Variables
+        ---------
+        stream, binary file object
+        """
+        if self.stream is not None:
+            raise RuntimeError('The trace is written to a stream.')
+        return write_trace(stream, self.trace_names, self.records)
+
+
+def _write_trace_header(stream, names):
+    """Writes the header and the signal names of a trace file."""
+    if any('\n' in name for name in names):
+        raise ValueError('Signal names must not contain newlines.')
+    encoded_names = '\n'.join(names).encode('utf-8')
+    stream.write(_TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, len(names),
+                                    len(encoded_names)))
+    stream.write(encoded_names)
+
+
+def _pack_records(records, record_size):
+    """Returns records packed as trace file bytes."""
+    return b''.join(record.to_bytes(record_size, 'little')
+                    for record in records)
+
+
+def write_trace(stream, names, records):
+    """
+    Writes a binary trace file and returns the number of records written.
+
+    Variables
+    ---------
+    stream, binary file object
+    names, list of str
+        Signal names.
+    records, iterable of int
+        One int per cycle; bit i holds the value of signal i.
+    """
+    _write_trace_header(stream, names)
+    record_size = (len(names) + 7) // 8
+    count = 0
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, TRACE_CHUNK))
+        if not chunk:
+            break
+        stream.write(_pack_records(chunk, record_size))
+        count += len(chunk)
+    return count
+
+
+def read_trace(stream):
+    """
+    Returns the signal names and the records, one int per cycle, of a
+    binary trace file written by write_trace().
+
+    Variables
+    ---------
+    stream, binary file object
+    """
+    header = stream.read(_TRACE_HEADER.size)
+    if len(header) != _TRACE_HEADER.size:
+        raise ValueError('Truncated trace data.')
+    magic, version, number_of_signals, names_length = _TRACE_HEADER.unpack(
+        header)
+    if magic != TRACE_MAGIC:
+        raise ValueError('Not a trace file.')
+    if version != TRACE_VERSION:
+        raise ValueError('Unsupported trace version {}.'.format(version))
+    encoded_names = stream.read(names_length)
+    if len(encoded_names) != names_length:
+        raise ValueError('Truncated trace data.')
+    names = (encoded_names.decode('utf-8').split('\n')
+             if number_of_signals else [])
+    if len(names) != number_of_signals:
+        raise ValueError('Corrupt trace names.')
+
+    record_size = (number_of_signals + 7) // 8
+    data = stream.read()
+    if record_size == 0:
+        return names, []
+    if len(data) % record_size:
+        raise ValueError('Truncated trace data.')
+    return names, [int.from_bytes(data[start:start + record_size], 'little')
+                   for start in range(0, len(data), record_size)]
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Script compares clocking DFlipFlops through LogicGate.get_output() with the
+generated simulation loop of sequential.CycleSimulator, on a binary counter,
+with and without waveform capture to a trace file.
+"""
+import io
+import timeit
+
+from Chapter_1 import logic_circuits as lc
+from Chapter_1 import sequential
+
+
+def counter(width):
+    """
+    Returns the enable InputPin, the Register and the carry out gate of a
+    counter that adds the enable input to the register every cycle.
+    """
+    enable = lc.InputPin("EN", 1)
+    register = lc.Register("COUNT", width)
+    carry = enable
+    next_bits = []
+    for i, flip_flop in enumerate(register.flip_flops):
+        total = lc.XorGate("SUM{}".format(i))
+        lc.Connector(flip_flop, total)
+        lc.Connector(carry, total)
+        carry_out = lc.AndGate("CARRY{}".format(i))
+        lc.Connector(flip_flop, carry_out)
+        lc.Connector(carry, carry_out)
+        next_bits.append(total)
+        carry = carry_out
+    register.connect_inputs(next_bits)
+    return enable, register, carry
+
+
+if __name__ == "__main__":
+    width = 16
+    enable, register, carry = counter(width)
+    circuit = sequential.compile_sequential(carry, flip_flops=[register])
+    print("\n{} bit counter: {} gates, {} logic levels.".format(
+        width, circuit.gate_count, max(circuit.levels())))
+
+    cycles = 10000
+    start = timeit.default_timer()
+    for _ in range(cycles):
+        carry.get_output()
+        lc.clock(register)
+    seconds = timeit.default_timer() - start
+    print("get_output and clock(): {:>12,.0f} cycles per minute.".format(
+        60 * cycles / seconds))
+
+    simulator = sequential.CycleSimulator(circuit)
+    start = timeit.default_timer()
+    for _ in range(cycles):
+        simulator.step([1])
+    seconds = timeit.default_timer() - start
+    print("CycleSimulator.step():  {:>12,.0f} cycles per minute.".format(
+        60 * cycles / seconds))
+
+    cycles = 1000000
+    simulator.reset()
+    start = timeit.default_timer()
+    simulator.run_constant(cycles, [1])
+    seconds = timeit.default_timer() - start
+    assert register.get_value() == 10000 % (1 << width)
+    assert simulator.state == [(cycles >> i) & 1 for i in range(width)]
+    print("CycleSimulator loop:    {:>12,.0f} cycles per minute.".format(
+        60 * cycles / seconds))
+
+    stream = io.BytesIO()
+    traced = sequential.CycleSimulator(
+        circuit, trace=['EN', carry.get_label()] + circuit.states,
+        stream=stream)
+    start = timeit.default_timer()
+    traced.run_constant(cycles, [1])
+    seconds = timeit.default_timer() - start
+    print("Loop with trace file:   {:>12,.0f} cycles per minute, {:,} "
+          "bytes.".format(60 * cycles / seconds, len(stream.getvalue())))
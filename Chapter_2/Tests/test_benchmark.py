@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import contextlib
+import gc
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from Chapter_2 import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    Tests the statistics, the runner and the command line of the benchmark
+    harness.
+    """
+    def test_summarize(self):
+        minimum, median, iqr = benchmark.summarize([4.0, 1.0, 3.0, 2.0, 5.0],
+                                                   10)
+        self.assertAlmostEqual(minimum, 0.1)
+        self.assertAlmostEqual(median, 0.3)
+        self.assertAlmostEqual(iqr, 0.2)
+        self.assertEqual(benchmark.summarize([2.0], 2), (1.0, 1.0, 0.0))
+
+    def test_run_benchmark(self):
+        calls = []
+        timed = benchmark.Benchmark(
+            'test', lambda size: list(range(size)),
+            lambda values: calls.append((len(values), gc.isenabled())),
+            operations=lambda size: 2 * size)
+        result = benchmark.run_benchmark(timed, 50, repeats=3, warmup=2)
+        self.assertEqual(result.name, 'test')
+        self.assertEqual(result.operations, 100)
+        self.assertEqual(len(result.times), 3)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(calls[2:], [(50, False)] * 3)
+        self.assertTrue(gc.isenabled())
+        self.assertLessEqual(result.minimum, result.median)
+        result = benchmark.run_benchmark(timed, 50, repeats=1, warmup=0,
+                                         disable_gc=False)
+        self.assertTrue(calls[-1][1])
+
+    def test_max_size(self):
+        quadratic = benchmark.Benchmark('quadratic', lambda size: size,
+                                        lambda size: None, max_size=100)
+        results = benchmark.run_benchmarks([quadratic], [10, 100, 1000],
+                                           repeats=1)
+        self.assertEqual([result.size for result in results], [10, 100])
+
+    def test_default_benchmarks(self):
+        benchmarks = benchmark.default_benchmarks()
+        names = [timed.name for timed in benchmarks]
+        self.assertEqual(len(names), len(set(names)))
+        for prefix in ('Stack.', 'Queue.', 'TwoStackQueue.', 'Deque.',
+                       'UnorderedList.', 'Map.', 'sorting.', 'search.'):
+            self.assertTrue(any(name.startswith(prefix) for name in names))
+        self.assertIn('radix_sort', names)
+        results = benchmark.run_benchmarks(benchmarks, [20], repeats=1,
+                                           warmup=0)
+        self.assertEqual(len(results), len(benchmarks))
+
+    def test_select(self):
+        benchmarks = benchmark.default_benchmarks()
+        self.assertEqual(
+            [timed.name for timed in benchmark.select(
+                benchmarks, ['Stack.*', 'sorted'])],
+            ['Stack.push', 'Stack.pop', 'sorted'])
+        self.assertEqual(len(benchmark.select(benchmarks, [])),
+                         len(benchmarks))
+
+    def test_main_writes_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                status = benchmark.main(['--sizes', '10', '20', '--repeats',
+                                         '2', '--json', path, 'Deque.*'])
+            self.assertEqual(status, 0)
+            with open(path) as json_file:
+                document = json.load(json_file)
+        self.assertEqual(document['settings']['sizes'], [10, 20])
+        self.assertEqual(len(document['results']), 8)
+        self.assertEqual(len(document['results'][0]['times']), 2)
+        self.assertIn('Deque.pop_left', output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+import array
+import random
+import unittest
+
+from Chapter_2 import kth_smallest_int as ksi
+from Chapter_5.sorting import merge_sort
+
+
+class TestIntroselect(unittest.TestCase):
+    """
+    Tests introselect_kth_smallest against sorting.
+    """
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def test_matches_sorting(self):
+        for size in (1, 2, 5, 16, 17, 100, 2000):
+            values = [self.rng.randint(-1000, 1000) for _ in range(size)]
+            expected = sorted(values)
+            for k in range(1, size + 1, max(1, size // 20)):
+                self.assertEqual(ksi.introselect_kth_smallest(values, k),
+                                 expected[k - 1])
+
+    def test_duplicates(self):
+        values = [self.rng.randint(0, 3) for _ in range(5000)]
+        expected = sorted(values)
+        for k in (1, 1000, 2500, 4999, 5000):
+            self.assertEqual(ksi.introselect_kth_smallest(values, k),
+                             expected[k - 1])
+        self.assertEqual(ksi.introselect_kth_smallest([7] * 100, 50), 7)
+
+    def test_adversarial_inputs(self):
+        size = 3000
+        # Sorted, reversed and organ pipe inputs, which defeat naive pivots.
+        for values in (list(range(size)), list(range(size, 0, -1)),
+                       list(range(size // 2)) + list(range(size // 2, 0, -1))):
+            expected = sorted(values)
+            for k in (1, size // 3, size // 2, size):
+                self.assertEqual(ksi.introselect_kth_smallest(values, k),
+                                 expected[k - 1])
+
+    def test_key_is_stable(self):
+        words = ['pear', 'fig', 'kiwi', 'plum', 'lime', 'date', 'apple',
+                 'cherry', 'banana', 'grape'] * 3
+        expected = sorted(words, key=len)
+        for k in range(1, len(words) + 1):
+            self.assertIs(ksi.introselect_kth_smallest(words, k, key=len),
+                          expected[k - 1])
+
+    def test_input_is_read_only_iterable(self):
+        values = tuple(self.rng.random() for _ in range(500))
+        self.assertEqual(ksi.introselect_kth_smallest(iter(values), 250),
+                         sorted(values)[249])
+        data = list(values)
+        ksi.introselect_kth_smallest(data, 100)
+        self.assertEqual(data, list(values))
+
+    def test_k_out_of_range(self):
+        for k in (0, 4):
+            with self.assertRaises(IndexError):
+                ksi.introselect_kth_smallest([1, 2, 3], k)
+
+    def test_median_of_medians_fallback(self):
+        # Without good pivots every partition must still shrink.
+        values = [self.rng.randint(0, 10 ** 6) for _ in range(10000)]
+        original = ksi.BAD_PARTITIONS
+        ksi.BAD_PARTITIONS = 0
+        try:
+            self.assertEqual(ksi.introselect_kth_smallest(values, 5000),
+                             sorted(values)[4999])
+        finally:
+            ksi.BAD_PARTITIONS = original
+
+
+class TestStreaming(unittest.TestCase):
+    """
+    Tests the single pass stream_ functions against sorting.
+    """
+    def setUp(self):
+        self.rng = random.Random(3)
+
+    def test_nsmallest(self):
+        values = [self.rng.randint(-50, 50) for _ in range(500)]
+        for k in (1, 7, 100, 500, 600):
+            self.assertEqual(ksi.stream_nsmallest(iter(values), k),
+                             sorted(values)[:k])
+
+    def test_kth_smallest(self):
+        values = [self.rng.random() for _ in range(1000)]
+        expected = sorted(values)
+        for k in (1, 2, 500, 1000):
+            self.assertEqual(ksi.stream_kth_smallest(
+                (value for value in values), k), expected[k - 1])
+
+    def test_key_is_stable(self):
+        words = ['pear', 'fig', 'apple', 'kiwi', 'plum', 'date', 'lime']
+        self.assertEqual(ksi.stream_nsmallest(words, 4, key=len),
+                         sorted(words, key=len)[:4])
+        self.assertEqual(ksi.stream_kth_smallest(words, 3, key=len), 'kiwi')
+
+    def test_short_iterables(self):
+        self.assertEqual(ksi.stream_nsmallest([], 3), [])
+        self.assertEqual(ksi.stream_nsmallest([2, 1], 3), [1, 2])
+        with self.assertRaises(IndexError):
+            ksi.stream_kth_smallest([2, 1], 3)
+        with self.assertRaises(ValueError):
+            ksi.stream_nsmallest([2, 1], 0)
+
+    def test_running_checkpoints(self):
+        values = [self.rng.randint(0, 1000) for _ in range(95)]
+        checkpoints = list(ksi.running_kth_smallest(values, 5, 10))
+        self.assertEqual([count for count, _ in checkpoints],
+                         list(range(10, 100, 10)) + [95])
+        for count, value in checkpoints:
+            self.assertEqual(value, sorted(values[:count])[4])
+        self.assertEqual(list(ksi.running_kth_smallest(values[:4], 5, 2)),
+                         [(2, None), (4, None)])
+        self.assertEqual(list(ksi.running_kth_smallest([], 5, 2)),
+                         [(0, None)])
+
+
+class TestMultiSelect(unittest.TestCase):
+    """
+    Tests multi_select against sorting.
+    """
+    def setUp(self):
+        self.rng = random.Random(5)
+
+    def test_matches_sorting(self):
+        for size in (1, 10, 100, 5000):
+            for high in (3, 10 ** 6):
+                values = [self.rng.randint(0, high) for _ in range(size)]
+                ks = [self.rng.randint(1, size) for _ in range(8)]
+                expected = sorted(values)
+                self.assertEqual(ksi.multi_select(values, ks),
+                                 {k: expected[k - 1] for k in ks})
+
+    def test_quantiles(self):
+        values = list(range(100000, 0, -1))
+        ks = [50000, 90000, 99000, 99900]
+        self.assertEqual(ksi.multi_select(iter(values), ks),
+                         {k: k for k in ks})
+
+    def test_every_rank(self):
+        values = [self.rng.random() for _ in range(300)]
+        self.assertEqual(
+            list(ksi.multi_select(values, range(1, 301)).values()),
+            sorted(values))
+
+    def test_empty_and_out_of_range(self):
+        self.assertEqual(ksi.multi_select([1, 2, 3], []), {})
+        for ks in ([0], [1, 4]):
+            with self.assertRaises(IndexError):
+                ksi.multi_select([1, 2, 3], ks)
+
+
+class CountingSequence:
+    """A sequence that counts how many values are read from it."""
+    def __init__(self, values):
+        self.values = values
+        self.reads = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return self.values[index]
+
+
+class TestKthOfSorted(unittest.TestCase):
+    """
+    Tests kth_of_sorted against sorting the union of the sources.
+    """
+    def setUp(self):
+        self.rng = random.Random(9)
+
+    def test_matches_sorting(self):
+        for _ in range(300):
+            sources = [merge_sort([self.rng.randint(0, 50) for _ in range(
+                self.rng.randint(0, 40))])
+                for _ in range(self.rng.randint(1, 6))]
+            union = sorted(value for source in sources for value in source)
+            if not union:
+                continue
+            for k in (1, len(union), self.rng.randint(1, len(union))):
+                self.assertEqual(ksi.kth_of_sorted(sources, k),
+                                 union[k - 1])
+
+    def test_reads_few_values(self):
+        sources = [CountingSequence(sorted(
+            self.rng.random() for _ in range(20000))) for _ in range(8)]
+        union = sorted(value for source in sources
+                       for value in source.values)
+        k = len(union) // 3
+        self.assertEqual(ksi.kth_of_sorted(sources, k), union[k - 1])
+        self.assertLess(sum(source.reads for source in sources), 500)
+
+    def test_arrays_and_uneven_sources(self):
+        sources = [array.array('d', [1.5]), array.array('d', range(1000)),
+                   array.array('d'), array.array('d', [2.5, 3.5])]
+        self.assertEqual(ksi.kth_of_sorted(sources, 5), 2.5)
+        self.assertEqual(ksi.kth_of_sorted(sources, 1003), 999)
+
+    def test_k_out_of_range(self):
+        for k in (0, 4):
+            with self.assertRaises(IndexError):
+                ksi.kth_of_sorted([[1], [], [2, 3]], k)
+
+
+if __name__ == "__main__":
+    unittest.main()
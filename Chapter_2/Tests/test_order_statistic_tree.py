@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import bisect
+import random
+import unittest
+
+from Chapter_2.order_statistic_tree import OrderStatisticTree
+
+
+def check_node(test, node):
+    """Checks the sizes and priorities below node; returns its size."""
+    if node is None:
+        return 0
+    size = 1 + check_node(test, node.left) + check_node(test, node.right)
+    test.assertEqual(node.size, size)
+    for child in (node.left, node.right):
+        if child is not None:
+            test.assertLessEqual(child.priority, node.priority)
+    return size
+
+
+class TestOrderStatisticTree(unittest.TestCase):
+    """
+    Tests OrderStatisticTree against a sorted list.
+    """
+    def setUp(self):
+        self.rng = random.Random(7)
+
+    def test_random_updates(self):
+        tree = OrderStatisticTree()
+        expected = []
+        for step in range(5000):
+            if expected and self.rng.random() < 0.4:
+                value = self.rng.choice(expected)
+                tree.delete(value)
+                expected.remove(value)
+            else:
+                value = self.rng.randint(0, 300)
+                tree.insert(value)
+                bisect.insort(expected, value)
+            if step % 250 == 0:
+                check_node(self, tree.root)
+                self.assertEqual(list(tree), expected)
+                for k in range(1, len(expected) + 1, 5):
+                    self.assertEqual(tree.kth(k), expected[k - 1])
+                for value in range(-1, 302, 7):
+                    self.assertEqual(tree.rank(value),
+                                     bisect.bisect_right(expected, value))
+
+    def test_sorted_insertions_stay_balanced(self):
+        tree = OrderStatisticTree(range(20000))
+
+        def depth(node):
+            if node is None:
+                return 0
+            return 1 + max(depth(node.left), depth(node.right))
+
+        self.assertLess(depth(tree.root), 100)
+        self.assertEqual(tree.kth(12345), 12344)
+        self.assertEqual(tree.rank(12344), 12345)
+
+    def test_container_methods(self):
+        tree = OrderStatisticTree([3, 1, 2, 2])
+        self.assertEqual(len(tree), 4)
+        self.assertTrue(tree)
+        self.assertIn(2, tree)
+        self.assertNotIn(5, tree)
+        self.assertEqual(repr(tree), 'OrderStatisticTree([1, 2, 2, 3])')
+        for value in (2, 1, 3, 2):
+            tree.delete(value)
+        self.assertFalse(tree)
+        self.assertEqual(tree.rank(10), 0)
+
+    def test_errors(self):
+        tree = OrderStatisticTree([1, 2, 3])
+        with self.assertRaises(ValueError):
+            tree.delete(4)
+        self.assertEqual(list(tree), [1, 2, 3])
+        for k in (0, 4):
+            with self.assertRaises(IndexError):
+                tree.kth(k)
+
+
+if __name__ == "__main__":
+    unittest.main()
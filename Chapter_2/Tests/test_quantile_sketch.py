@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+import bisect
+import pickle
+import random
+import unittest
+
+from Chapter_2.kth_smallest_int import nlogn_kth_smallest
+from Chapter_2.quantile_sketch import KLLSketch, merge_sketches
+
+
+def max_rank_error(sketch, values, queries=100):
+    """
+    Returns the largest rank error of sketch.kth_smallest() over evenly
+    spaced k, as a fraction of the number of values, measured against the
+    exact nlogn_kth_smallest() of the same values.
+    """
+    ordered = sorted(values)
+    worst = 0
+    for k in range(1, len(values) + 1, max(1, len(values) // queries)):
+        estimate = sketch.kth_smallest(k)
+        exact = nlogn_kth_smallest(values, k)
+        # The values are distinct, so each has a single rank.
+        error = abs(bisect.bisect_left(ordered, estimate)
+                    - bisect.bisect_left(ordered, exact))
+        worst = max(worst, error)
+    return worst / len(values)
+
+
+class TestKLLSketch(unittest.TestCase):
+    """
+    Tests the rank error, merging and serialization of KLLSketch.
+    """
+    def setUp(self):
+        self.rng = random.Random(11)
+        self.values = [self.rng.random() for _ in range(20000)]
+
+    def test_rank_error(self):
+        for epsilon in (0.05, 0.01):
+            sketch = KLLSketch(epsilon, seed=1)
+            for value in self.values:
+                sketch.update(value)
+            self.assertEqual(sketch.count, len(self.values))
+            self.assertLess(len(sketch), len(self.values) // 10)
+            self.assertLessEqual(max_rank_error(sketch, self.values),
+                                 epsilon)
+
+    def test_small_streams_are_exact(self):
+        values = self.values[:100]
+        sketch = KLLSketch(k=200)
+        sketch.extend(values)
+        self.assertEqual(max_rank_error(sketch, values, queries=100), 0)
+        self.assertEqual(sketch.rank(sorted(values)[9]), 10)
+
+    def test_extremes_and_quantiles(self):
+        sketch = KLLSketch(epsilon=0.02, seed=2)
+        sketch.extend(self.values)
+        self.assertEqual(sketch.minimum, min(self.values))
+        self.assertEqual(sketch.maximum, max(self.values))
+        self.assertEqual(sketch.quantile(0), min(self.values))
+        self.assertEqual(sketch.quantile(1), max(self.values))
+        self.assertAlmostEqual(sketch.quantile(0.9), 0.9, delta=0.02)
+        self.assertAlmostEqual(sketch.rank(0.5) / sketch.count, 0.5,
+                               delta=0.02)
+
+    def test_merge(self):
+        parts = [KLLSketch(epsilon=0.01, seed=seed) for seed in range(4)]
+        for index, part in enumerate(parts):
+            part.extend(self.values[index::4])
+        merged = merge_sketches(parts)
+        self.assertEqual(merged.count, len(self.values))
+        self.assertEqual(parts[0].count, len(self.values) // 4)
+        self.assertLessEqual(max_rank_error(merged, self.values), 0.01)
+        with self.assertRaises(ValueError):
+            parts[0].merge(KLLSketch(k=100))
+
+    def test_serialization(self):
+        sketch = KLLSketch(epsilon=0.01, seed=3)
+        sketch.extend(self.values)
+        data = sketch.to_bytes()
+        self.assertLess(len(data), 10 * len(sketch) + 100)
+        copy = KLLSketch.from_bytes(data)
+        self.assertEqual(copy.count, sketch.count)
+        for k in range(1, sketch.count + 1, 997):
+            self.assertEqual(copy.kth_smallest(k), sketch.kth_smallest(k))
+        copy.extend(self.values)
+        self.assertEqual(copy.count, 2 * len(self.values))
+        pickled = pickle.loads(pickle.dumps(sketch))
+        self.assertEqual(pickled.quantile(0.5), sketch.quantile(0.5))
+
+    def test_serialized_ints(self):
+        sketch = KLLSketch(k=50, seed=4)
+        sketch.extend(range(-10 ** 15, 10 ** 15, 10 ** 11))
+        copy = KLLSketch.from_bytes(sketch.to_bytes())
+        self.assertEqual(copy.quantile(0.3), sketch.quantile(0.3))
+        self.assertIsInstance(copy.quantile(0.3), int)
+
+    def test_corrupt_data(self):
+        data = KLLSketch(k=50).to_bytes()
+        for corrupt in (data[:5], b'XXXX' + data[4:]):
+            with self.assertRaises(ValueError):
+                KLLSketch.from_bytes(corrupt)
+        sketch = KLLSketch(k=50)
+        sketch.extend(range(1000))
+        with self.assertRaises(ValueError):
+            KLLSketch.from_bytes(sketch.to_bytes()[:-8])
+
+    def test_empty_and_invalid(self):
+        sketch = KLLSketch()
+        with self.assertRaises(IndexError):
+            sketch.quantile(0.5)
+        self.assertEqual(KLLSketch.from_bytes(sketch.to_bytes()).count, 0)
+        with self.assertRaises(ValueError):
+            KLLSketch(epsilon=0)
+        with self.assertRaises(ValueError):
+            KLLSketch(k=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the data structures and algorithms of Chapters 2 to 5: Python
+lists and dicts, Stack, both Queues, Deque, UnorderedList, Map, the radix
+sort, and every sort and search.
+
+A Benchmark has a setup function, which builds its input for a size n and is
+not timed, and a run function, which performs a number of operations on that
+input and is timed. Each benchmark is run for every size: first `warmup`
+untimed runs, then `repeats` timed runs, each on a fresh input and, by
+default, with the garbage collector disabled. The minimum, median and
+interquartile range of the timed runs are reported per operation, so sizes
+and benchmarks with different numbers of operations can be compared.
+
+Run all benchmarks, or the ones whose names match patterns, with
+
+    python -m Chapter_2.benchmark [--sizes 100 1000] [--repeats 5]
+                                  [--warmup 1] [--json results.json]
+                                  ['Stack.*' 'sorting.*']
+
+and see `python -m Chapter_2.benchmark --help` for the other options.
+"""
+import argparse
+import collections
+import contextlib
+import fnmatch
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from Chapter_3.Deques.deques import Deque
+from Chapter_3.Linked_Lists.unordered_list import UnorderedList
+from Chapter_3.Queues import constant_time_queue, queues, radix_sort
+from Chapter_3.Stacks.stacks import Stack
+from Chapter_5 import search, sorting
+
+SIZES = (100, 1000, 10000)
+REPEATS = 5
+WARMUP = 1
+
+# Number of lookups timed by the search and contains benchmarks.
+LOOKUPS = 100
+
+# Largest size of the benchmarks that are quadratic in the size.
+QUADRATIC_SIZE = 1000
+
+# Timing of one benchmark at one size. The times are the seconds of every
+# timed run; minimum, median and iqr are per operation.
+Result = collections.namedtuple(
+    'Result', ['name', 'size', 'operations', 'minimum', 'median', 'iqr',
+               'times'])
+
+
+class Benchmark:
+    """
+    A timed operation on an input of a given size.
+
+    Variables
+    ---------
+    name, str
+    setup, function
+        Returns the input of the run function for a size; not timed.
+    run, function
+        Takes the input returned by setup and performs the operations.
+    operations, function; default = None
+        Returns the number of operations of a run for a size; the size by
+        default.
+    max_size, int; default = None
+        Largest size for which the benchmark is run, e.g. to keep quadratic
+        algorithms from running for hours.
+    """
+    def __init__(self, name, setup, run, operations=None, max_size=None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.operations = operations or (lambda size: size)
+        self.max_size = max_size
+
+    def __repr__(self):
+        return "Benchmark({})".format(repr(self.name))
+
+
+@contextlib.contextmanager
+def gc_disabled(disable=True):
+    """Collects garbage and then disables the garbage collector."""
+    enabled = gc.isenabled()
+    if disable:
+        gc.collect()
+        gc.disable()
+    try:
+        yield
+    finally:
+        if disable and enabled:
+            gc.enable()
+
+
+def summarize(times, operations):
+    """
+    Returns the minimum, median and interquartile range of a list of times,
+    divided by the number of operations.
+
+    Variables
+    ---------
+    times, list of float
+    operations, int
+    """
+    if len(times) > 1:
+        first, _, third = statistics.quantiles(times, n=4, method='inclusive')
+    else:
+        first = third = times[0]
+    return (min(times) / operations, statistics.median(times) / operations,
+            (third - first) / operations)
+
+
+def run_benchmark(benchmark, size, repeats=REPEATS, warmup=WARMUP,
+                  disable_gc=True):
+    """
+    Runs a benchmark for one size and returns its Result.
+
+    Variables
+    ---------
+    benchmark, Benchmark
+    size, int
+    repeats, int; default = REPEATS
+    warmup, int; default = WARMUP
+        Number of untimed runs before the timed ones.
+    disable_gc, bool; default = True
+        If True, garbage is collected before every timed run and the
+        collector is disabled during it.
+    """
+    if repeats < 1:
+        raise ValueError('repeats must be at least 1.')
+    for _ in range(warmup):
+        benchmark.run(benchmark.setup(size))
+    times = []
+    for _ in range(repeats):
+        data = benchmark.setup(size)
+        with gc_disabled(disable_gc):
+            start = time.perf_counter()
+            benchmark.run(data)
+            times.append(time.perf_counter() - start)
+    operations = max(1, benchmark.operations(size))
+    return Result(benchmark.name, size, operations,
+                  *summarize(times, operations), times)
+
+
+def run_benchmarks(benchmarks, sizes=SIZES, repeats=REPEATS, warmup=WARMUP,
+                   disable_gc=True, report=None):
+    """
+    Runs every benchmark for every size up to its max_size, and returns the
+    list of Results.
+
+    Variables
+    ---------
+    benchmarks, iterable of Benchmark
+    sizes, iterable of int; default = SIZES
+    repeats, int; default = REPEATS
+    warmup, int; default = WARMUP
+    disable_gc, bool; default = True
+    report, function; default = None
+        Called with every Result as soon as it is measured.
+    """
+    results = []
+    for benchmark in benchmarks:
+        for size in sizes:
+            if benchmark.max_size is not None and size > benchmark.max_size:
+                continue
+            result = run_benchmark(benchmark, size, repeats, warmup,
+                                   disable_gc)
+            results.append(result)
+            if report is not None:
+                report(result)
+    return results
+
+
+def format_time(seconds):
+    """Returns a duration with a unit from ns to s."""
+    for unit, scale in (('ns', 1e-9), ('us', 1e-6), ('ms', 1e-3)):
+        if seconds < 1000 * scale:
+            return '{:.1f} {}'.format(seconds / scale, unit)
+    return '{:.2f} s'.format(seconds)
+
+
+# Column headings of the text report.
+REPORT_HEADER = '{:<32} {:>8} {:>8} {:>11} {:>11} {:>11}'.format(
+    'benchmark', 'n', 'ops', 'min/op', 'median/op', 'iqr/op')
+
+
+def format_result(result):
+    """Returns a Result as a line of the text report."""
+    return '{:<32} {:>8,} {:>8,} {:>11} {:>11} {:>11}'.format(
+        result.name, result.size, result.operations,
+        format_time(result.minimum), format_time(result.median),
+        format_time(result.iqr))
+
+
+def write_json(stream, results, **settings):
+    """
+    Writes results as JSON, with the Python version, the platform and any
+    settings given as keywords.
+
+    Variables
+    ---------
+    stream, text file object
+    results, iterable of Result
+    """
+    document = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'settings': settings,
+        'results': [result._asdict() for result in results],
+    }
+    json.dump(document, stream, indent=2)
+    stream.write('\n')
+
+
+def _random_ints(size):
+    rng = random.Random(size)
+    return [rng.randrange(size) for _ in range(size)]
+
+
+def _lookups(size):
+    """Returns the sorted values 0 to size - 1 and LOOKUPS of them."""
+    rng = random.Random(size)
+    return list(range(size)), [rng.randrange(size) for _ in range(LOOKUPS)]
+
+
+def _filled(factory, add):
+    """Returns a setup function that adds size items to a new container."""
+    def setup(size):
+        container = factory()
+        for item in range(size):
+            add(container, item)
+        return container
+    return setup
+
+
+def _repeat(operation):
+    """Returns a run function that performs operation once per item."""
+    def run(data):
+        container, count = data
+        for _ in range(count):
+            operation(container)
+    return run
+
+
+def _with_count(setup):
+    """Returns a setup function that also passes the size to the run."""
+    return lambda size: (setup(size), size)
+
+
+def _list_benchmarks():
+    def concatenate(size):
+        values = []
+        for item in range(size):
+            values = values + [item]
+
+    def append(size):
+        values = []
+        for item in range(size):
+            values.append(item)
+
+    def lookup(container_type):
+        def setup(size):
+            values, targets = _lookups(size)
+            return container_type(dict.fromkeys(values)
+                                  if container_type is dict else values), \
+                targets
+        return setup
+
+    def contains(data):
+        container, targets = data
+        for target in targets:
+            target in container
+
+    def index(data):
+        values, targets = data
+        for target in targets:
+            values[target]
+
+    def set_item(data):
+        values, targets = data
+        for target in targets:
+            values[target] = None
+
+    def get(data):
+        values, targets = data
+        for target in targets:
+            values.get(target)
+
+    def lookups(size):
+        return LOOKUPS
+
+    return [
+        Benchmark('list.concatenate', lambda size: size, concatenate,
+                  max_size=10 * QUADRATIC_SIZE),
+        Benchmark('list.append', lambda size: size, append),
+        Benchmark('list.comprehension', lambda size: size,
+                  lambda size: [item for item in range(size)]),
+        Benchmark('list.cast', lambda size: size,
+                  lambda size: list(range(size))),
+        Benchmark('list.pop(0)',
+                  _with_count(lambda size: list(range(size))),
+                  _repeat(lambda values: values.pop(0))),
+        Benchmark('list.pop()', _with_count(lambda size: list(range(size))),
+                  _repeat(lambda values: values.pop())),
+        Benchmark('list.index', lookup(list), index, lookups),
+        Benchmark('list.contains', lookup(list), contains, lookups),
+        Benchmark('dict.contains', lookup(dict), contains, lookups),
+        Benchmark('dict.setitem', lookup(dict), set_item, lookups),
+        Benchmark('dict.get', lookup(dict), get, lookups),
+    ]
+
+
+def _container_benchmarks():
+    def make(name, factory, add, remove):
+        return [
+            Benchmark(name + '.' + add, _with_count(lambda size: factory()),
+                      _repeat(lambda container: getattr(container, add)(0))),
+            Benchmark(name + '.' + remove,
+                      _with_count(_filled(factory, lambda container, item:
+                                          getattr(container, add)(item))),
+                      _repeat(lambda container:
+                              getattr(container, remove)())),
+        ]
+
+    benchmarks = (
+        make('Stack', Stack, 'push', 'pop')
+        + make('Queue', queues.Queue, 'enqueue', 'dequeue')
+        + make('TwoStackQueue', constant_time_queue.Queue, 'enqueue',
+               'dequeue')
+        + make('Deque', Deque, 'append_right', 'pop_right')
+        + make('Deque', Deque, 'append_left', 'pop_left'))
+
+    def filled_list(size):
+        return _filled(UnorderedList, UnorderedList.add)(size)
+
+    def lookup_list(size):
+        _, targets = _lookups(size)
+        return filled_list(size), targets
+
+    def contains(data):
+        unordered_list, targets = data
+        for target in targets:
+            target in unordered_list
+
+    def index(data):
+        unordered_list, targets = data
+        for target in targets:
+            unordered_list.index(target)
+
+    def lookups(size):
+        return LOOKUPS
+
+    # UnorderedList.append and pop walk the list, and pop also counts it at
+    # every node, so only a few of them are timed.
+    few = 10
+    benchmarks += [
+        Benchmark('UnorderedList.add',
+                  _with_count(lambda size: UnorderedList()),
+                  _repeat(lambda unordered_list: unordered_list.add(0))),
+        Benchmark('UnorderedList.append',
+                  lambda size: (filled_list(size), few),
+                  _repeat(lambda unordered_list: unordered_list.append(0)),
+                  lambda size: few),
+        Benchmark('UnorderedList.pop', lambda size: (filled_list(size), few),
+                  _repeat(lambda unordered_list: unordered_list.pop()),
+                  lambda size: few, max_size=QUADRATIC_SIZE),
+        Benchmark('UnorderedList.contains', lookup_list, contains, lookups),
+        Benchmark('UnorderedList.index', lookup_list, index, lookups),
+    ]
+
+    # Map has a fixed table of 11 slots and can not hold more keys, so the
+    # size is only the number of operations.
+    def map_keys(size):
+        table = search.Map()
+        return table, [key % table.size for key in _random_ints(size)]
+
+    def put(data):
+        table, keys = data
+        for key in keys:
+            table.put(key, None)
+
+    def get(data):
+        table, keys = data
+        for key in keys:
+            table.get(key)
+
+    def filled_map(size):
+        table, keys = map_keys(size)
+        put((table, keys))
+        return table, keys
+
+    benchmarks += [Benchmark('Map.put', map_keys, put),
+                   Benchmark('Map.get', filled_map, get)]
+    return benchmarks
+
+
+def _sort_benchmarks():
+    benchmarks = []
+    for name in ('bubble_sort', 'selection_sort', 'insertion_sort'):
+        benchmarks.append(Benchmark(
+            'sorting.' + name, _random_ints, getattr(sorting, name),
+            lambda size: 1, max_size=QUADRATIC_SIZE))
+    for name in ('shell_sort', 'merge_sort'):
+        benchmarks.append(Benchmark('sorting.' + name, _random_ints,
+                                    getattr(sorting, name), lambda size: 1))
+    # The bins are Queues, whose enqueue() is O(n).
+    benchmarks.append(Benchmark('radix_sort', _random_ints,
+                                radix_sort.radix_sort, lambda size: 1,
+                                max_size=10 * QUADRATIC_SIZE))
+    benchmarks.append(Benchmark('sorted', _random_ints, sorted,
+                                lambda size: 1))
+    return benchmarks
+
+
+def _search_benchmarks():
+    def searches(function):
+        def run(data):
+            values, targets = data
+            for target in targets:
+                function(target, values)
+        return run
+
+    return [Benchmark('search.' + name, _lookups,
+                      searches(getattr(search, name)),
+                      lambda size: LOOKUPS)
+            for name in ('sequential_search', 'binary_search')]
+
+
+def default_benchmarks():
+    """Returns the benchmarks of every data structure and algorithm."""
+    return (_list_benchmarks() + _container_benchmarks() + _sort_benchmarks()
+            + _search_benchmarks())
+
+
+def select(benchmarks, patterns):
+    """
+    Returns the benchmarks whose names match any of the shell-style
+    patterns, or all of them if there are none.
+
+    Variables
+    ---------
+    benchmarks, iterable of Benchmark
+    patterns, list of str
+    """
+    return [benchmark for benchmark in benchmarks
+            if not patterns or any(fnmatch.fnmatchcase(benchmark.name,
+                                                       pattern)
+                                   for pattern in patterns)]
+
+
+def main(argv=None):
+    """
+    Command line entry point; returns the exit status.
+
+    Variables
+    ---------
+    argv, list of str; default = None
+        Arguments; sys.argv[1:] by default.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m Chapter_2.benchmark',
+        description='Benchmarks the data structures and algorithms of '
+                    'Chapters 2 to 5.')
+    parser.add_argument('patterns', nargs='*', metavar='PATTERN',
+                        help='run only the benchmarks whose names match a '
+                             'shell-style pattern, e.g. "Stack.*"')
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES,
+                        metavar='N', help='input sizes (default: %(default)s)')
+    parser.add_argument('--repeats', type=int, default=REPEATS,
+                        help='timed runs per size (default: %(default)s)')
+    parser.add_argument('--warmup', type=int, default=WARMUP,
+                        help='untimed runs per size (default: %(default)s)')
+    parser.add_argument('--keep-gc', action='store_true',
+                        help='leave the garbage collector enabled while '
+                             'timing')
+    parser.add_argument('--json', metavar='PATH',
+                        help='also write the results as JSON to PATH, or to '
+                             'standard output if PATH is -')
+    parser.add_argument('--list', action='store_true',
+                        help='list the benchmarks and exit')
+    arguments = parser.parse_args(argv)
+
+    benchmarks = select(default_benchmarks(), arguments.patterns)
+    if not benchmarks:
+        parser.error('no benchmark matches {}.'.format(
+            ' '.join(arguments.patterns)))
+    if arguments.list:
+        for benchmark in benchmarks:
+            print(benchmark.name)
+        return 0
+
+    # The text report goes to standard error if the JSON goes to standard
+    # output.
+    output = sys.stderr if arguments.json == '-' else sys.stdout
+    print(REPORT_HEADER, file=output)
+    results = run_benchmarks(
+        benchmarks, arguments.sizes, arguments.repeats, arguments.warmup,
+        not arguments.keep_gc,
+        report=lambda result: print(format_result(result), file=output,
+                                    flush=True))
+    if arguments.json:
+        settings = dict(sizes=list(arguments.sizes),
+                        repeats=arguments.repeats, warmup=arguments.warmup,
+                        gc_disabled=not arguments.keep_gc)
+        if arguments.json == '-':
+            write_json(sys.stdout, results, **settings)
+        else:
+            with open(arguments.json, 'w') as json_file:
+                write_json(json_file, results, **settings)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,36 @@
 #!/usr/bin/env python3
+"""
+Finds the kth smallest value in a list of numbers: by repeated minimum
+search, by sorting, and by selection; and in a stream of numbers, with a
+bounded heap.
+
+introselect_kth_smallest() is quickselect with median-of-three pivots. It
+falls back to median-of-medians pivots once partitions stop shrinking, so it
+is O(n) on average and in the worst case. Values equal to the pivot are set
+aside by a three-way partition, so duplicates cost nothing extra.
+
+multi_select() answers several ranks at once, such as a set of quantiles:
+after each partition it only follows the parts that contain requested ranks,
+so m ranks cost O(n log m) rather than m separate selections.
+
+kth_of_sorted() selects from several sorted sequences without merging them:
+it only reads O(m log k) of the values of m sequences, by index, so the
+sequences may be lists, arrays or memory-mapped files.
+
+The stream_ functions make a single pass over any iterable, keeping only the
+k smallest values seen so far in a max-heap: the largest of them, the
+running kth smallest value, is at the top, and a new value is pushed only if
+it is smaller. Memory is O(k) however long the stream.
+"""
+import heapq
+import itertools
+
+# Subproblems of at most this many values are sorted instead of partitioned.
+SMALL_SELECTION = 16
+
+# Number of partitions that may leave more than three quarters of the values
+# before the pivots switch to the median of medians.
+BAD_PARTITIONS = 4
 
 
 def linear_kth_smallest(iterable, k):
@@ -53,6 +85,359 @@ def nlogn_kth_smallest(iterable, k):
     return sorted(iterable)[k-1]
 
 
+def _median_of_medians(values):
+    """
+    Returns the median of the medians of groups of five values, which is
+    larger than and smaller than at least 3/10 of the values each.
+    """
+    medians = []
+    for start in range(0, len(values), 5):
+        group = sorted(values[start:start + 5])
+        medians.append(group[(len(group) - 1) // 2])
+    return _select(medians, (len(medians) - 1) // 2)
+
+
+def _select(values, index):
+    """
+    Returns the value that would be at index if values were sorted. values
+    is not modified.
+    """
+    bad_partitions = 0
+    while True:
+        size = len(values)
+        if size <= SMALL_SELECTION:
+            return sorted(values)[index]
+        pivot = _pivot(values, bad_partitions)
+
+        # Three-way partition around the pivot.
+        lows = [value for value in values if value < pivot]
+        if index < len(lows):
+            values = lows
+        else:
+            highs = [value for value in values if pivot < value]
+            number_of_lows_and_equals = size - len(highs)
+            if index < number_of_lows_and_equals:
+                return pivot
+            index -= number_of_lows_and_equals
+            values = highs
+        if 4 * len(values) > 3 * size:
+            bad_partitions += 1
+
+
+def introselect_kth_smallest(iterable, k, key=None):
+    """
+    Task: Find the kth smallest value in O(n), even in the worst case and
+    with duplicate values.
+
+    Returns the same value as nlogn_kth_smallest(): with a key, the kth
+    value of the stable sort of iterable by key.
+
+    Assumptions: iterable is read only, and may be any iterable.
+
+    Final algorithm is O(n) on average and in the worst case: every
+    partition with a good pivot leaves at most 3/4 of the values, after
+    BAD_PARTITIONS bad pivots the median of medians guarantees that, and
+    the partition sizes therefore add up to O(n).
+
+    Variables
+    ---------
+    iterable, iterable
+    k, int
+        1 for the smallest value.
+    key, function; default = None
+        Function of one argument used to compare the values.
+    """
+    values = list(iterable)
+    if not 1 <= k <= len(values):
+        raise IndexError('k must be between 1 and the number of values.')
+    if key is None:
+        return _select(values, k - 1)
+
+    keys = [key(value) for value in values]
+    kth_key = _select(keys, k - 1)
+    # The kth value of the stable sort is the (k - lows)th value with a key
+    # equal to kth_key, in the original order.
+    rank = k - 1 - sum(1 for item_key in keys if item_key < kth_key)
+    for value, item_key in zip(values, keys):
+        if not item_key < kth_key and not kth_key < item_key:
+            if rank == 0:
+                return value
+            rank -= 1
+
+
+def _pivot(values, bad_partitions):
+    """
+    Returns the median of three, or the median of medians after
+    BAD_PARTITIONS bad partitions.
+    """
+    if bad_partitions >= BAD_PARTITIONS:
+        return _median_of_medians(values)
+    first, middle, last = values[0], values[len(values) // 2], values[-1]
+    if first > middle:
+        first, middle = middle, first
+    if middle > last:
+        middle = last if first < last else first
+    return middle
+
+
+def _multi_select(values, indices, results, offset=0, bad_partitions=0):
+    """
+    Stores in results the value that would be at each of the sorted indices
+    if values were sorted, by index + offset.
+    """
+    if len(indices) == 1:
+        results[indices[0] + offset] = _select(values, indices[0])
+        return
+    size = len(values)
+    if size <= SMALL_SELECTION:
+        ordered = sorted(values)
+        for index in indices:
+            results[index + offset] = ordered[index]
+        return
+
+    pivot = _pivot(values, bad_partitions)
+    lows = [value for value in values if value < pivot]
+    highs = [value for value in values if pivot < value]
+    number_of_lows_and_equals = size - len(highs)
+    low_indices = []
+    high_indices = []
+    for index in indices:
+        if index < len(lows):
+            low_indices.append(index)
+        elif index < number_of_lows_and_equals:
+            results[index + offset] = pivot
+        else:
+            high_indices.append(index - number_of_lows_and_equals)
+    if low_indices:
+        _multi_select(lows, low_indices, results, offset,
+                      bad_partitions + (4 * len(lows) > 3 * size))
+    if high_indices:
+        _multi_select(highs, high_indices, results,
+                      offset + number_of_lows_and_equals,
+                      bad_partitions + (4 * len(highs) > 3 * size))
+
+
+def multi_select(data, ks):
+    """
+    Task: Find the kth smallest value for several values of k, e.g. the
+    50th, 90th and 99th percentiles, without sorting.
+
+    Returns a dict of the kth smallest value by k, in increasing order of k.
+
+    Assumptions: data is read only, and may be any iterable.
+
+    Final algorithm is O(n log m) for m distinct values of k: every
+    partition splits the requested ranks between its two sides, a side
+    without requested ranks is dropped, and a side with a single rank is
+    finished by introselect in linear time.
+
+    Variables
+    ---------
+    data, iterable
+    ks, iterable of int
+        1 for the smallest value.
+    """
+    values = list(data)
+    ranks = sorted(set(ks))
+    if ranks and not (1 <= ranks[0] and ranks[-1] <= len(values)):
+        raise IndexError('k must be between 1 and the number of values.')
+    results = {}
+    if ranks:
+        _multi_select(values, [k - 1 for k in ranks], results, offset=1)
+    return {k: results[k] for k in ranks}
+
+
+def kth_of_sorted(sources, k):
+    """
+    Task: Find the kth smallest value of the union of several sorted
+    sequences, without merging them.
+
+    Assumptions: every source is sorted in increasing order, and supports
+    len() and indexing.
+
+    Final algorithm reads O(m log k) values of m sources. While k > 2m, a
+    step of s = (k - 1) // 2m values is taken from each source, and the
+    source whose sth remaining value is smallest drops its first s values:
+    each of them is smaller than at most m * s < k values, so none is the
+    kth smallest. A heap of those sth values finds the smallest in
+    O(log m); k shrinks by half about every m drops. Once k <= 2m the
+    fronts of the sources are merged with a heap.
+
+    Variables
+    ---------
+    sources, iterable of sequences
+    k, int
+        1 for the smallest value.
+    """
+    sources = [source for source in sources if len(source)]
+    if not 1 <= k <= sum(len(source) for source in sources):
+        raise IndexError('k must be between 1 and the number of values.')
+    number_of_sources = len(sources)
+    starts = [0] * number_of_sources
+
+    def candidate(index, step):
+        """Returns the heap entry of the step values next in a source."""
+        count = min(step, len(sources[index]) - starts[index])
+        return sources[index][starts[index] + count - 1], index, count
+
+    while k > 2 * number_of_sources:
+        step = (k - 1) // (2 * number_of_sources)
+        heap = [candidate(index, step) for index in range(number_of_sources)
+                if starts[index] < len(sources[index])]
+        heapq.heapify(heap)
+        while k > number_of_sources * step:
+            _, index, count = heap[0]
+            starts[index] += count
+            k -= count
+            if starts[index] < len(sources[index]):
+                heapq.heapreplace(heap, candidate(index, step))
+            else:
+                heapq.heappop(heap)
+
+    heap = [(source[start], index) for index, (source, start)
+            in enumerate(zip(sources, starts)) if start < len(source)]
+    heapq.heapify(heap)
+    for _ in range(k - 1):
+        _, index = heap[0]
+        starts[index] += 1
+        if starts[index] < len(sources[index]):
+            heapq.heapreplace(heap,
+                              (sources[index][starts[index]], index))
+        else:
+            heapq.heappop(heap)
+    return heap[0][0]
+
+
+def _sift_down_max(heap, position):
+    """Moves heap[position] down until it is no smaller than its children."""
+    size = len(heap)
+    item = heap[position]
+    child = 2 * position + 1
+    while child < size:
+        if child + 1 < size and heap[child] < heap[child + 1]:
+            child += 1
+        if not item < heap[child]:
+            break
+        heap[position] = heap[child]
+        position = child
+        child = 2 * position + 1
+    heap[position] = item
+
+
+def _sift_up_max(heap, position):
+    """Moves heap[position] up until it is no larger than its parent."""
+    item = heap[position]
+    while position > 0:
+        parent = (position - 1) // 2
+        if not heap[parent] < item:
+            break
+        heap[position] = heap[parent]
+        position = parent
+    heap[position] = item
+
+
+def _stream_heaps(iterable, k, key, every):
+    """
+    Consumes iterable, keeping the k smallest values in a max-heap, and
+    yields the number of values consumed and the heap after every `every`
+    values, if every is given, and at the end.
+
+    With a key, heap entries are (key, position, value) triples, so equal
+    keys are ordered by position as in a stable sort.
+    """
+    if k < 1:
+        raise ValueError('k must be at least 1.')
+    if every is not None and every < 1:
+        raise ValueError('every must be at least 1.')
+    entries = iter(iterable)
+    if key is not None:
+        entries = ((key(value), position, value)
+                   for position, value in enumerate(entries))
+    heap = []
+    size = count = 0
+    while True:
+        consumed = 0
+        for entry in itertools.islice(entries, every):
+            consumed += 1
+            if size < k:
+                heap.append(entry)
+                _sift_up_max(heap, size)
+                size += 1
+            elif entry < heap[0]:
+                heap[0] = entry
+                _sift_down_max(heap, 0)
+        count += consumed
+        if every is not None and consumed == every:
+            yield count, heap
+        else:
+            # The end of the iterable; it has already been reported if it
+            # fell on a checkpoint.
+            if consumed or not count or every is None:
+                yield count, heap
+            return
+
+
+def _value(entry, key):
+    """Returns the value of a heap entry."""
+    return entry if key is None else entry[2]
+
+
+def stream_nsmallest(iterable, k, key=None):
+    """
+    Returns the k smallest values of an iterable, smallest first, in a
+    single pass with O(k) memory. Fewer values are returned if the iterable
+    is shorter.
+
+    Variables
+    ---------
+    iterable, iterable
+    k, int
+    key, function; default = None
+        Function of one argument used to compare the values.
+    """
+    for _, heap in _stream_heaps(iterable, k, key, None):
+        return [_value(entry, key) for entry in sorted(heap)]
+
+
+def stream_kth_smallest(iterable, k, key=None):
+    """
+    Returns the kth smallest value of an iterable, in a single pass with
+    O(k) memory.
+
+    Variables
+    ---------
+    iterable, iterable
+    k, int
+        1 for the smallest value.
+    key, function; default = None
+        Function of one argument used to compare the values.
+    """
+    for count, heap in _stream_heaps(iterable, k, key, None):
+        if count < k:
+            raise IndexError('The iterable has fewer than k values.')
+        return _value(heap[0], key)
+
+
+def running_kth_smallest(iterable, k, every, key=None):
+    """
+    Consumes an iterable in a single pass with O(k) memory, and yields the
+    number of values consumed so far and the running kth smallest value
+    after every `every` values and at the end. The value is None while fewer
+    than k values have been consumed.
+
+    Variables
+    ---------
+    iterable, iterable
+    k, int
+    every, int
+        Number of values between checkpoints.
+    key, function; default = None
+        Function of one argument used to compare the values.
+    """
+    for count, heap in _stream_heaps(iterable, k, key, every):
+        yield count, _value(heap[0], key) if count >= k else None
+
+
 if __name__ == "__main__":
     import random
 
@@ -60,3 +445,8 @@ if __name__ == "__main__":
     random_ints = [random.randint(0, 100) for _ in range(20)]
     print(random_ints, '\n', linear_kth_smallest(random_ints, k))
     print(nlogn_kth_smallest(random_ints, k))
+    print(introselect_kth_smallest(random_ints, k))
+    print(stream_kth_smallest(iter(random_ints), k))
+    print(multi_select(random_ints, [1, k, len(random_ints)]))
+    print(kth_of_sorted([sorted(random_ints[:10]), sorted(random_ints[10:])],
+                        k))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Script compares the kth smallest functions of kth_smallest_int on lists of
+random ints of 10**4 to 10**7 values, or of the sizes given as arguments.
+
+linear_kth_smallest() is O(kn), so it is timed for a small k only; the other
+functions are also timed for the median. stream_kth_smallest() reads the
+values from a generator, as it would a file, and is timed for small k.
+Finally multi_select() is compared with one introselect per rank for the
+50th, 90th, 99th and 99.9th percentiles, and kth_of_sorted() on 16 sorted
+runs with sorting their concatenation.
+"""
+import random
+import sys
+import timeit
+
+from Chapter_2.kth_smallest_int import (introselect_kth_smallest,
+                                        kth_of_sorted,
+                                        linear_kth_smallest, multi_select,
+                                        nlogn_kth_smallest,
+                                        stream_kth_smallest)
+
+
+def best_time(function, number=3):
+    """Returns the fastest of `number` timings of a single call."""
+    return min(timeit.repeat(function, number=1, repeat=number))
+
+
+if __name__ == "__main__":
+    sizes = [int(argument) for argument in sys.argv[1:]] or [
+        10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+    rng = random.Random(0)
+    small_k = 10
+    print("\n{:>10} {:>12} {:>12} {:>12} {:>12} {:>12}".format(
+        "n", "linear k=10", "nlogn k=10", "intro k=10", "nlogn n/2",
+        "intro n/2"))
+    for size in sizes:
+        values = [rng.randrange(size) for _ in range(size)]
+        median_k = size // 2
+        expected = sorted(values)
+        assert introselect_kth_smallest(values, median_k) == \
+            expected[median_k - 1]
+        number = 3 if size <= 10 ** 6 else 1
+        seconds = [
+            best_time(lambda: linear_kth_smallest(values, small_k), number),
+            best_time(lambda: nlogn_kth_smallest(values, small_k), number),
+            best_time(lambda: introselect_kth_smallest(values, small_k),
+                      number),
+            best_time(lambda: nlogn_kth_smallest(values, median_k), number),
+            best_time(lambda: introselect_kth_smallest(values, median_k),
+                      number)]
+        print("{:>10,} ".format(size) + " ".join(
+            "{:>10.4f} s".format(second) for second in seconds))
+
+    print("\n{:>10} {:>12} {:>12} {:>12}".format(
+        "n", "stream k=1", "stream k=10", "stream k=1000"))
+    for size in sizes:
+        values = [rng.randrange(size) for _ in range(size)]
+        number = 3 if size <= 10 ** 6 else 1
+        seconds = [best_time(lambda: stream_kth_smallest(
+            (value for value in values), k), number) for k in (1, 10, 1000)]
+        print("{:>10,} ".format(size) + " ".join(
+            "{:>10.4f} s".format(second) for second in seconds))
+
+    print("\n{:>10} {:>12} {:>12} {:>12}".format(
+        "n", "sorted", "intro x 4", "multi"))
+    for size in sizes:
+        values = [rng.randrange(size) for _ in range(size)]
+        ks = [max(1, size * permille // 1000)
+              for permille in (500, 900, 990, 999)]
+        number = 3 if size <= 10 ** 6 else 1
+        seconds = [
+            best_time(lambda: sorted(values), number),
+            best_time(lambda: [introselect_kth_smallest(values, k)
+                               for k in ks], number),
+            best_time(lambda: multi_select(values, ks), number)]
+        print("{:>10,} ".format(size) + " ".join(
+            "{:>10.4f} s".format(second) for second in seconds))
+
+    print("\n{:>10} {:>12} {:>12}".format("n", "concatenate", "of sorted"))
+    for size in sizes:
+        runs = [sorted(rng.randrange(size) for _ in range(size // 16))
+                for _ in range(16)]
+        median_k = 16 * (size // 16) // 2
+        number = 3 if size <= 10 ** 6 else 1
+        seconds = [
+            best_time(lambda: nlogn_kth_smallest(
+                [value for run in runs for value in run], median_k), number),
+            best_time(lambda: kth_of_sorted(runs, median_k), number)]
+        print("{:>10,} ".format(size) + " ".join(
+            "{:>10.4f} s".format(second) for second in seconds))
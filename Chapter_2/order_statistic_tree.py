@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+An order statistic tree: a sorted container that finds the kth smallest
+value, and the rank of a value, in O(log n) while values are inserted and
+deleted.
+
+The tree is a treap, a binary search tree in which every node also has a
+random priority and sits above the nodes of lower priority. The random
+priorities keep the expected depth O(log n) whatever the order of updates.
+Every node stores the size of its subtree, so kth() and rank() descend a
+single path, counting the sizes of the subtrees they skip.
+"""
+import random
+
+# Source of node priorities.
+_random = random.Random()
+
+
+class Node:
+    """
+    A node of the tree: a value, its priority, and the number of values in
+    the subtree below and including the node.
+    """
+    __slots__ = ('value', 'priority', 'size', 'left', 'right')
+
+    def __init__(self, value):
+        self.value = value
+        self.priority = _random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+
+    def __repr__(self):
+        return "Node({})".format(repr(self.value))
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+def _split(node, value, or_equal):
+    """
+    Splits the subtree of node into the subtrees of the values less than
+    value, or less than or equal to it if or_equal, and of the rest.
+    """
+    if node is None:
+        return None, None
+    if node.value < value or or_equal and not value < node.value:
+        node.right, right = _split(node.right, value, or_equal)
+        node.size = 1 + _size(node.left) + _size(node.right)
+        return node, right
+    left, node.left = _split(node.left, value, or_equal)
+    node.size = 1 + _size(node.left) + _size(node.right)
+    return left, node
+
+
+def _merge(left, right):
+    """
+    Returns the root of the union of two subtrees, every value of left
+    being no larger than every value of right.
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.size += right.size
+        left.right = _merge(left.right, right)
+        return left
+    right.size += left.size
+    right.left = _merge(left, right.left)
+    return right
+
+
+class OrderStatisticTree:
+    """
+    Sorted container of comparable values, duplicates allowed, with
+    O(log n) expected time insert(), delete(), kth() and rank().
+    """
+    def __init__(self, iterable=()):
+        """
+        Constructor.
+
+        Variables
+        ---------
+        iterable, iterable; default = ()
+            Initial values.
+        """
+        self.root = None
+        for value in iterable:
+            self.insert(value)
+
+    def __len__(self):
+        return _size(self.root)
+
+    def __bool__(self):
+        return self.root is not None
+
+    def __iter__(self):
+        """Yields the values in increasing order."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    def __contains__(self, value):
+        node = self.root
+        while node is not None:
+            if value < node.value:
+                node = node.left
+            elif node.value < value:
+                node = node.right
+            else:
+                return True
+        return False
+
+    def __repr__(self):
+        return "OrderStatisticTree({})".format(list(self))
+
+    def insert(self, value):
+        """
+        Adds a value, after any equal values.
+
+        Variables
+        ---------
+        value, comparable
+        """
+        new_node = Node(value)
+        parent = None
+        node = self.root
+        # Descend to the place of the new node in the heap of priorities.
+        while node is not None and node.priority > new_node.priority:
+            node.size += 1
+            parent = node
+            node = node.left if value < node.value else node.right
+        new_node.size = 1 + _size(node)
+        new_node.left, new_node.right = _split(node, value, True)
+        if parent is None:
+            self.root = new_node
+        elif value < parent.value:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+
+    def delete(self, value):
+        """
+        Removes one occurrence of a value; raises ValueError if there is
+        none.
+
+        Variables
+        ---------
+        value, comparable
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            if value < node.value:
+                path.append(node)
+                node = node.left
+            elif node.value < value:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        else:
+            raise ValueError('{} is not in the tree.'.format(repr(value)))
+        for ancestor in path:
+            ancestor.size -= 1
+        subtree = _merge(node.left, node.right)
+        if not path:
+            self.root = subtree
+        elif path[-1].left is node:
+            path[-1].left = subtree
+        else:
+            path[-1].right = subtree
+
+    def kth(self, k):
+        """
+        Returns the kth smallest value.
+
+        Variables
+        ---------
+        k, int
+            1 for the smallest value.
+        """
+        if not 1 <= k <= len(self):
+            raise IndexError('k must be between 1 and the number of values.')
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if k <= left_size:
+                node = node.left
+            elif k == left_size + 1:
+                return node.value
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def rank(self, value):
+        """
+        Returns the number of values less than or equal to value, so that
+        kth(rank(value)) == value for any value in the tree.
+
+        Variables
+        ---------
+        value, comparable
+        """
+        rank = 0
+        node = self.root
+        while node is not None:
+            if value < node.value:
+                node = node.left
+            else:
+                rank += _size(node.left) + 1
+                node = node.right
+        return rank
+
+
+if __name__ == "__main__":
+    tree = OrderStatisticTree(random.sample(range(100), 20))
+    print(tree)
+    print(tree.kth(5), tree.rank(tree.kth(5)))
+    tree.delete(tree.kth(5))
+    print(tree.kth(5), len(tree))
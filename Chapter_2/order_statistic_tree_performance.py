@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Script times the kth smallest value of a changing list of n random ints, of
+10**3 to 10**6 values or of the sizes given as arguments: every mutation, an
+insert or a delete, is followed by a query of the median.
+
+Without a dynamic structure the list is re-sorted by nlogn_kth_smallest()
+after every mutation. A list kept sorted with bisect.insort() is shown for
+reference: its updates are O(n), but with a fast memmove.
+"""
+import bisect
+import random
+import sys
+import time
+
+from Chapter_2.kth_smallest_int import nlogn_kth_smallest
+from Chapter_2.order_statistic_tree import OrderStatisticTree
+
+# Number of mutations timed per size.
+MUTATIONS = 200
+
+
+def mutations(values, rng):
+    """Returns MUTATIONS alternating (insert, value) and (delete, value)."""
+    present = list(values)
+    operations = []
+    for step in range(MUTATIONS):
+        if step % 2:
+            value = present.pop(rng.randrange(len(present)))
+            operations.append(('delete', value))
+        else:
+            value = rng.randrange(len(values))
+            present.append(value)
+            operations.append(('insert', value))
+    return operations
+
+
+def resort_list(values, operations):
+    medians = []
+    for operation, value in operations:
+        if operation == 'insert':
+            values.append(value)
+        else:
+            values.remove(value)
+        medians.append(nlogn_kth_smallest(values, len(values) // 2))
+    return medians
+
+
+def insort_list(values, operations):
+    medians = []
+    for operation, value in operations:
+        if operation == 'insert':
+            bisect.insort(values, value)
+        else:
+            del values[bisect.bisect_left(values, value)]
+        # The kth smallest of a sorted list is an index lookup, values[k - 1]
+        # for the same k as the other variants.
+        k = len(values) // 2
+        medians.append(values[k - 1])
+    return medians
+
+
+def update_tree(tree, operations):
+    medians = []
+    for operation, value in operations:
+        if operation == 'insert':
+            tree.insert(value)
+        else:
+            tree.delete(value)
+        medians.append(tree.kth(len(tree) // 2))
+    return medians
+
+
+def time_mutations(function, container, operations):
+    """
+    Returns the seconds function takes to apply the operations, and the
+    medians it found.
+    """
+    start = time.perf_counter()
+    medians = function(container, operations)
+    return time.perf_counter() - start, medians
+
+
+if __name__ == "__main__":
+    sizes = [int(argument) for argument in sys.argv[1:]] or [
+        10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+    rng = random.Random(0)
+    print("\nMicroseconds per mutation and median query")
+    print("{:>10} {:>12} {:>12} {:>12} {:>12}".format(
+        "n", "re-sort", "insort", "tree", "tree build"))
+    for size in sizes:
+        values = [rng.randrange(size) for _ in range(size)]
+        operations = mutations(values, rng)
+        start = time.perf_counter()
+        tree = OrderStatisticTree(values)
+        build = time.perf_counter() - start
+        results = [time_mutations(resort_list, list(values), operations),
+                   time_mutations(insort_list, sorted(values), operations),
+                   time_mutations(update_tree, tree, operations)]
+        seconds = [second for second, _ in results]
+        assert all(medians == results[0][1] for _, medians in results)
+        print("{:>10,} ".format(size) + " ".join(
+            "{:>12.1f}".format(1e6 * second / MUTATIONS)
+            for second in seconds) + " {:>10.3f} s".format(build))
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Approximate kth smallest values and quantiles of streams too long to keep in
+memory, with a KLL sketch (Karnin, Lang and Liberty, 2016).
+
+The sketch is a stack of compactors. Values are appended to compactor 0, and
+every item in compactor h stands for 2**h values of the stream. When the
+sketch is full, the lowest compactor over its capacity is sorted and every
+other item, starting at a random offset, is promoted to the compactor above;
+the rest are discarded. The capacities shrink by a factor 2/3 per level
+below the top one, so the sketch holds O(k) items and answers any rank
+query with an error of about EPSILON_K / k of the number of values, with
+high probability.
+
+Updates append to a list and sort a compactor now and then, O(log k)
+amortized. Sketches built with the same k on parts of a stream, e.g. in
+different processes, are combined with merge() into a sketch of the whole
+stream with the same error guarantee, and to_bytes() packs a sketch into a
+few bytes per item for sending or storing it.
+
+Serialized form, all integers little endian: the header MAGIC, a uint16
+format version, a uint8 item type code ('q' for int64 or 'd' for float64),
+the uint32 parameter k, the uint64 number of values and the uint16 number of
+compactors; the uint32 length of every compactor; then the items of every
+compactor followed by the minimum and maximum values, as an array of the
+item type.
+"""
+import array
+import itertools
+import math
+import random
+import struct
+import sys
+
+MAGIC = b'KLLS'
+VERSION = 1
+
+# Ratio of the capacities of neighbouring compactors.
+CAPACITY_RATIO = 2 / 3
+
+# The rank error of a sketch with parameter k is at most EPSILON_K / k of the
+# number of values with high probability; Tests/test_quantile_sketch.py
+# measures it.
+EPSILON_K = 3.3
+
+# Smallest parameter k.
+MIN_K = 8
+
+_HEADER = struct.Struct('<4sHcIQH')
+
+
+class KLLSketch:
+    """
+    Approximate quantiles of a stream of comparable values in O(k) memory.
+
+    Variables
+    ---------
+    epsilon, float; default = 0.01
+        Rank error, as a fraction of the number of values; sets k.
+    k, int; default = None
+        Size parameter of the sketch, overriding epsilon.
+    seed, int; default = None
+        Seed of the random compaction offsets.
+    """
+    def __init__(self, epsilon=0.01, k=None, seed=None):
+        if k is None:
+            if not 0 < epsilon < 1:
+                raise ValueError('epsilon must be between 0 and 1.')
+            k = math.ceil(EPSILON_K / epsilon)
+        if k < MIN_K:
+            raise ValueError('k must be at least {}.'.format(MIN_K))
+        self.k = k
+        self.count = 0
+        self._rng = random.Random(seed)
+        self._compactors = []
+        self._capacities = []
+        self._size = 0
+        self._max_size = 0
+        # Extremes of the values compacted out of compactor 0 so far.
+        self._minimum = None
+        self._maximum = None
+        self._sorted_view = None
+        self._grow()
+
+    @property
+    def epsilon(self):
+        """Expected rank error, as a fraction of the number of values."""
+        return EPSILON_K / self.k
+
+    def _grow(self):
+        """Adds a compactor on top and updates the capacities."""
+        self._compactors.append([])
+        height = len(self._compactors)
+        self._capacities = [
+            max(2, math.ceil(self.k * CAPACITY_RATIO ** (height - level - 1)))
+            for level in range(height)]
+        self._max_size = sum(self._capacities)
+
+    def _compress(self):
+        """
+        Compacts the lowest compactor that is at or over its capacity, and
+        returns the number of items removed.
+        """
+        for level, items in enumerate(self._compactors):
+            if len(items) >= self._capacities[level]:
+                break
+        else:
+            return 0
+        if level + 1 == len(self._compactors):
+            self._grow()
+        items.sort()
+        if level == 0:
+            self._update_extremes(items[0], items[-1])
+        # With an odd number of items the smallest one stays.
+        start = len(items) % 2
+        promoted = items[start + self._rng.getrandbits(1)::2]
+        removed = len(items) - start - len(promoted)
+        del items[start:]
+        self._compactors[level + 1].extend(promoted)
+        self._size -= removed
+        return removed
+
+    def _update_extremes(self, minimum, maximum):
+        if self._minimum is None or minimum < self._minimum:
+            self._minimum = minimum
+        if self._maximum is None or self._maximum < maximum:
+            self._maximum = maximum
+
+    def update(self, value):
+        """
+        Adds one value to the sketch.
+
+        Variables
+        ---------
+        value, comparable
+        """
+        self._compactors[0].append(value)
+        self.count += 1
+        self._size += 1
+        self._sorted_view = None
+        if self._size >= self._max_size:
+            self._compress()
+
+    def extend(self, values):
+        """
+        Adds every value of an iterable to the sketch; faster than calling
+        update() for each one.
+
+        Variables
+        ---------
+        values, iterable
+        """
+        values = iter(values)
+        bottom = self._compactors[0]
+        self._sorted_view = None
+        while True:
+            length = len(bottom)
+            bottom.extend(itertools.islice(values,
+                                           self._max_size - self._size))
+            added = len(bottom) - length
+            self.count += added
+            self._size += added
+            if self._size < self._max_size:
+                return
+            self._compress()
+
+    def merge(self, other):
+        """
+        Adds the values summarized by another sketch with the same k to this
+        sketch, and returns this sketch.
+
+        Variables
+        ---------
+        other, KLLSketch
+        """
+        if other.k != self.k:
+            raise ValueError('Only sketches with the same k can be merged.')
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for items, other_items in zip(self._compactors, other._compactors):
+            items.extend(other_items)
+        self.count += other.count
+        self._size += other._size
+        if other._minimum is not None:
+            self._update_extremes(other._minimum, other._maximum)
+        self._sorted_view = None
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def __len__(self):
+        """Returns the number of items retained, not of values added."""
+        return self._size
+
+    def _extremes(self):
+        """Returns the exact minimum and maximum of the values."""
+        if not self.count:
+            raise IndexError('The sketch is empty.')
+        bottom = self._compactors[0]
+        candidates = [value for value in (self._minimum, self._maximum)
+                      if value is not None]
+        return (min(itertools.chain(bottom, candidates)),
+                max(itertools.chain(bottom, candidates)))
+
+    @property
+    def minimum(self):
+        return self._extremes()[0]
+
+    @property
+    def maximum(self):
+        return self._extremes()[1]
+
+    def _view(self):
+        """
+        Returns the retained items in order and the cumulative weight up to
+        and including each of them.
+        """
+        if self._sorted_view is None:
+            weighted = sorted(
+                (item, 1 << level)
+                for level, items in enumerate(self._compactors)
+                for item in items)
+            items = [item for item, _ in weighted]
+            weights = list(itertools.accumulate(
+                weight for _, weight in weighted))
+            self._sorted_view = (items, weights)
+        return self._sorted_view
+
+    def rank(self, value):
+        """
+        Returns the approximate number of values less than or equal to
+        value.
+
+        Variables
+        ---------
+        value, comparable
+        """
+        items, weights = self._view()
+        low, high = 0, len(items)
+        while low < high:
+            middle = (low + high) // 2
+            if value < items[middle]:
+                high = middle
+            else:
+                low = middle + 1
+        return weights[low - 1] if low else 0
+
+    def kth_smallest(self, k):
+        """
+        Returns an approximation of the kth smallest value: a value whose
+        rank differs from k by about epsilon * count at most.
+
+        Variables
+        ---------
+        k, int
+            1 for the smallest value.
+        """
+        if not 1 <= k <= self.count:
+            raise IndexError('k must be between 1 and the number of values.')
+        if k == 1:
+            return self.minimum
+        if k == self.count:
+            return self.maximum
+        items, weights = self._view()
+        # First item whose cumulative weight reaches k.
+        low, high = 0, len(items) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if weights[middle] < k:
+                low = middle + 1
+            else:
+                high = middle
+        return items[low]
+
+    def quantile(self, fraction):
+        """
+        Returns an approximation of the value below which a fraction of the
+        values lie; 0.5 for the median.
+
+        Variables
+        ---------
+        fraction, float
+            Between 0 and 1.
+        """
+        if not 0 <= fraction <= 1:
+            raise ValueError('fraction must be between 0 and 1.')
+        return self.kth_smallest(max(1, math.ceil(fraction * self.count)))
+
+    def to_bytes(self):
+        """
+        Returns the serialized form of the sketch. The values must be ints
+        or floats; ints are stored exactly if they all fit in 64 bits.
+        """
+        values = [item for items in self._compactors for item in items]
+        if self.count:
+            values.extend(self._extremes())
+        typecode = 'q'
+        if not all(type(value) is int for value in values):
+            typecode = 'd'
+        try:
+            values = array.array(typecode, values)
+        except OverflowError:
+            values = array.array('d', values)
+        except TypeError:
+            raise ValueError('Only sketches of ints and floats can be '
+                             'serialized.')
+        lengths = array.array('I', [len(items) for items in self._compactors])
+        if sys.byteorder == 'big':
+            lengths.byteswap()
+            values.byteswap()
+        return b''.join((
+            _HEADER.pack(MAGIC, VERSION, values.typecode.encode('ascii'),
+                         self.k, self.count, len(self._compactors)),
+            lengths.tobytes(), values.tobytes()))
+
+    @classmethod
+    def from_bytes(cls, data, seed=None):
+        """
+        Returns the sketch serialized in data by to_bytes().
+
+        Variables
+        ---------
+        data, bytes-like
+        seed, int; default = None
+            Seed of the random compaction offsets of the new sketch.
+        """
+        data = memoryview(data)
+        if len(data) < _HEADER.size:
+            raise ValueError('Truncated sketch data.')
+        magic, version, typecode, k, count, height = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('Not a serialized sketch.')
+        if version != VERSION:
+            raise ValueError('Unsupported sketch version {}.'.format(version))
+        if typecode not in (b'q', b'd') or k < MIN_K or height < 1:
+            raise ValueError('Corrupt sketch header.')
+        lengths = array.array('I')
+        values = array.array(typecode.decode('ascii'))
+        offset = _HEADER.size + 4 * height
+        lengths.frombytes(data[_HEADER.size:offset])
+        if sys.byteorder == 'big':
+            lengths.byteswap()
+        size = sum(lengths)
+        extremes = 2 if count else 0
+        if len(data) != offset + (size + extremes) * values.itemsize:
+            raise ValueError('Truncated sketch data.')
+        values.frombytes(data[offset:])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        values = values.tolist()
+
+        sketch = cls(k=k, seed=seed)
+        while len(sketch._compactors) < height:
+            sketch._grow()
+        start = 0
+        for items, length in zip(sketch._compactors, lengths):
+            items.extend(values[start:start + length])
+            start += length
+        if sum(length << level for level, length in enumerate(lengths)) \
+                != count:
+            raise ValueError('Corrupt sketch weights.')
+        sketch.count = count
+        sketch._size = size
+        if count:
+            sketch._minimum, sketch._maximum = values[-2:]
+        return sketch
+
+
+def merge_sketches(sketches):
+    """
+    Returns a new sketch of the values summarized by several sketches with
+    the same k, which are not modified.
+
+    Variables
+    ---------
+    sketches, iterable of KLLSketch
+    """
+    sketches = list(sketches)
+    if not sketches:
+        raise ValueError('Expected at least one sketch.')
+    merged = KLLSketch(k=sketches[0].k)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    sketch = KLLSketch(epsilon=0.01, seed=0)
+    sketch.extend(rng.random() for _ in range(10 ** 6))
+    print(len(sketch), 'items retained of', sketch.count, 'values,',
+          len(sketch.to_bytes()), 'bytes serialized')
+    for fraction in (0.5, 0.9, 0.99, 0.999):
+        print(fraction, sketch.quantile(fraction))
@@ -9,7 +9,7 @@ Module to solve the following problem:
 import re
 
 
-from Chapter_1.fraction import gcd
+from Chapter_1.intmath import gcd
 
 DIGITS = re.compile(r'\d+')
 